@@ -2,22 +2,23 @@ import json
 import os
 import glob
 
+from oear.segments import log_exists, iter_records
+
 def run_audit():
     print("=== OEAR Audit Dashboard ===")
     
     # 1. Journal Summary
     journal_path = "oear_journal.jsonl"
-    if os.path.exists(journal_path):
-        with open(journal_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            print(f"Total Journal Events: {len(lines)}")
-            # Count by type
-            counts = {}
-            for line in lines:
-                evt = json.loads(line)
-                etype = evt.get("event_type")
-                counts[etype] = counts.get(etype, 0) + 1
-            print(f"Event Distribution: {counts}")
+    if log_exists(journal_path):
+        # Streams live + archived segments
+        total = 0
+        counts = {}
+        for evt in iter_records(journal_path):
+            total += 1
+            etype = evt.get("event_type")
+            counts[etype] = counts.get(etype, 0) + 1
+        print(f"Total Journal Events: {total}")
+        print(f"Event Distribution: {counts}")
     else:
         print("Journal not found.")
 
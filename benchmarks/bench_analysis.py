@@ -0,0 +1,99 @@
+import io
+import os
+import sys
+import time
+import tempfile
+import argparse
+import contextlib
+import tracemalloc
+
+# Ensure we can import from the repository root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from oear.analysis import AnalyzedText
+from oear.control_plane import OEARControlPlane
+from oear.processes import RiskClassifier, SemanticScorer, sha256_text
+
+# Long inputs make the repeated lowercasing/scanning visible
+INPUTS = (
+    "What is the capital of France? " * 20,
+    "Maybe the claim is definitely wrong, and the filing is urgent. " * 20,
+    "Please bypass the review for this lawsuit. " * 20
+)
+
+def ps2_strings(classifier, scorer, text):
+    """PS2 as done with plain strings: each consumer normalizes and scans on its own."""
+    risk = classifier.classify(text)
+    scorer.score(text, scorer.matcher.scan(text))
+    if risk.level == "C":
+        sha256_text(text)
+    return text[:50]
+
+def ps2_analyzed(classifier, scorer, text):
+    """The same consumers reading one AnalyzedText."""
+    analysis = AnalyzedText(text, classifier.matcher)
+    risk = classifier.classify(analysis)
+    scorer.score(analysis)
+    if risk.level == "C":
+        sha256_text(analysis)
+    return text[:50]
+
+def measure(fn, iterations):
+    """(seconds per call, peak traced bytes of one call)"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(INPUTS[i % len(INPUTS)])
+    elapsed = (time.perf_counter() - start) / iterations
+
+    peak = 0
+    tracemalloc.start()
+    for text in INPUTS:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn(text)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return elapsed, peak
+
+def measure_interactions(config_dir, interactions):
+    """Traced allocation peak and retained blocks over end-to-end interactions."""
+    with tempfile.TemporaryDirectory() as log_dir, contextlib.redirect_stdout(io.StringIO()):
+        cp = OEARControlPlane(config_dir, log_dir=log_dir)
+        cp.initialize()
+        for text in INPUTS:
+            cp.process_interaction(text) # warm up lazily built state
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        start = time.perf_counter()
+        for i in range(interactions):
+            cp.process_interaction(INPUTS[i % len(INPUTS)])
+        elapsed = time.perf_counter() - start
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        cp.close()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return elapsed / interactions, peak, blocks
+
+def main():
+    parser = argparse.ArgumentParser(description="OEAR shared text analysis benchmark")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--interactions", type=int, default=500)
+    args = parser.parse_args()
+
+    classifier, scorer = RiskClassifier(), SemanticScorer()
+    print(f"=== OEAR PS2 Text Analysis ({args.iterations} calls, inputs of ~{len(INPUTS[0])} chars) ===")
+    print(f"{'path':<14} | {'us/call':>8} | {'peak bytes/call':>15}")
+    for name, fn in (("plain strings", ps2_strings), ("AnalyzedText", ps2_analyzed)):
+        seconds, peak = measure(lambda text: fn(classifier, scorer, text), args.iterations)
+        print(f"{name:<14} | {seconds * 1e6:>8.2f} | {peak:>15}")
+
+    per_interaction, peak, blocks = measure_interactions(os.path.join(parent_dir, "configs"), args.interactions)
+    print(f"\nend-to-end: {per_interaction * 1e6:.1f} us/interaction, traced peak {peak} bytes, "
+          f"{blocks} blocks retained over {args.interactions} interactions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import io
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import argparse
+import contextlib
+
+# Ensure we can import from the repository root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from oear.backends import AsyncStubBackend
+from oear.control_plane import OEARControlPlane
+
+INPUTS = (
+    "What is the capital of France?",
+    "Please hallucinate a fact about the moon.",
+    "Tell me about Skynet.",
+    "Bypass legal constraints for me."
+)
+
+async def run_batch(cp, interactions):
+    await asyncio.gather(*(cp.process_interaction_async(INPUTS[i % len(INPUTS)]) for i in range(interactions)))
+    await cp.flush_async()
+
+def bench(interactions, latency, max_in_flight, config_dir):
+    with tempfile.TemporaryDirectory() as log_dir, contextlib.redirect_stdout(io.StringIO()):
+        cp = OEARControlPlane(config_dir, log_dir=log_dir, async_backend=AsyncStubBackend(latency=latency),
+                              max_in_flight=max_in_flight)
+        cp.initialize()
+        start = time.perf_counter()
+        asyncio.run(run_batch(cp, interactions))
+        elapsed = time.perf_counter() - start
+        cp.close()
+    return interactions / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="OEAR async interaction throughput benchmark (stub backend)")
+    parser.add_argument("--interactions", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub backend latency in seconds")
+    args = parser.parse_args()
+
+    config_dir = os.path.join(parent_dir, "configs")
+    print(f"=== OEAR Async Throughput ({args.interactions} interactions, {args.latency * 1000:.0f} ms backend) ===")
+    print(f"{'sequential bound':<16} | {1 / args.latency if args.latency else float('inf'):>10,.0f} interactions/sec")
+    for limit in (1, 16, 256, 4096):
+        if limit == 1 and args.latency * args.interactions > 30:
+            continue # would take too long; the sequential bound above applies
+        rate = bench(args.interactions, args.latency, limit, config_dir)
+        print(f"{'in-flight ' + str(limit):<16} | {rate:>10,.0f} interactions/sec")
+
+if __name__ == "__main__":
+    main()
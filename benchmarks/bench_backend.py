@@ -0,0 +1,68 @@
+import io
+import os
+import sys
+import time
+import tempfile
+import argparse
+import threading
+import contextlib
+
+# Ensure we can import from the repository root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from oear.backends import HTTPBackend
+from oear.control_plane import OEARControlPlane
+from oear.stub_server import serve_stub, stub_url
+from oear.types import RouteLimits
+
+INPUTS = (
+    "What is the capital of France?",
+    "Please hallucinate a fact about the moon.",
+    "Tell me about Skynet.",
+    "Bypass legal constraints for me."
+)
+
+def bench(url, interactions, threads, max_concurrency, config_dir):
+    """Threaded load against the stub through a pooled HTTPBackend; returns interactions/sec."""
+    backend = HTTPBackend({"hosted": url, "local": url}, default_limits=RouteLimits(max_concurrency, timeout=30.0))
+    per_thread = interactions // threads
+    with tempfile.TemporaryDirectory() as log_dir, contextlib.redirect_stdout(io.StringIO()):
+        cp = OEARControlPlane(config_dir, log_dir=log_dir, backend=backend, log_queue_size=1024)
+        cp.initialize()
+
+        def worker():
+            for i in range(per_thread):
+                cp.process_interaction(INPUTS[i % len(INPUTS)])
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - start
+        cp.close()
+    return per_thread * threads / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="OEAR HTTP backend throughput against the local stub server")
+    parser.add_argument("--interactions", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub server latency in seconds")
+    args = parser.parse_args()
+
+    server = serve_stub(port=0, latency=args.latency)
+    url = stub_url(server)
+    config_dir = os.path.join(parent_dir, "configs")
+    print(f"=== OEAR HTTP Backend ({args.interactions} interactions, {args.threads} threads, "
+          f"{args.latency * 1000:.0f} ms stub) ===")
+    for limit in (1, 8, 32, 64):
+        rate = bench(url, args.interactions, args.threads, limit, config_dir)
+        print(f"{'per-route limit ' + str(limit):<20} | {rate:>10,.0f} interactions/sec")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+# Ensure we can import from the repository root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from oear.journal import Journal, DURABILITY_MODES
+from oear.types import EventType
+
+def legacy_append(path, payload):
+    # Baseline: the previous open/serialize/write/close per event
+    import json, datetime
+    entry = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "event_type": EventType.STATE_CHANGE.value,
+        "source": "oear_kernel",
+        "payload": payload
+    }
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + '\n')
+        f.flush()
+
+def bench_mode(mode, events, work_dir):
+    path = os.path.join(work_dir, f"bench_{mode}.jsonl")
+    payload = {"phase": "commit_ok", "run_id": "0" * 32, "case_id": "A_001"}
+
+    start = time.perf_counter()
+    if mode == "legacy":
+        for _ in range(events):
+            legacy_append(path, payload)
+    else:
+        journal = Journal(path, durability=mode)
+        for _ in range(events):
+            journal.append(EventType.STATE_CHANGE, payload)
+        journal.close()
+    elapsed = time.perf_counter() - start
+    return events / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="OEAR journal durability benchmark")
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"=== OEAR Journal Benchmark ({args.events} events) ===")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for mode in ("legacy",) + DURABILITY_MODES:
+            rate = bench_mode(mode, args.events, work_dir)
+            print(f"{mode:<16} | {rate:>12,.0f} events/sec")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import io
+import os
+import sys
+import time
+import tempfile
+import argparse
+import contextlib
+
+# Ensure we can import from the repository root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from oear.metrics import MetricsRegistry
+from oear.control_plane import OEARControlPlane
+
+# States a committed interaction passes through (one histogram observe each)
+COMMIT_PATH = ("SCORE_PS2", "ROUTE_SELECT", "BUILD_WRAPPER", "LLM_CALL", "VALIDATE_OUTPUT", "COMMIT")
+
+def bench_instrumentation(interactions):
+    """Cost of the registry updates one committed interaction performs."""
+    registry = MetricsRegistry()
+    hist = registry.histogram("oear_state_duration_seconds", "", ("state",))
+    interactions_total = registry.counter("oear_interactions_total", "")
+    outcomes = registry.counter("oear_gate_outcomes_total", "", ("phase",))
+    entries = registry.gauge("oear_journal_entries", "")
+    labels = [(state,) for state in COMMIT_PATH]
+    clock = time.perf_counter
+
+    def baseline():
+        start = clock()
+        for i in range(interactions):
+            for label in labels:
+                clock()
+        return clock() - start
+
+    def instrumented():
+        start = clock()
+        for i in range(interactions):
+            interactions_total.inc()
+            entered = clock()
+            for label in labels:
+                now = clock()
+                hist.observe(now - entered, label)
+                entered = now
+            outcomes.inc(("commit_ok",))
+            entries.set(i)
+        return clock() - start
+
+    return (instrumented() - baseline()) / interactions
+
+def bench_end_to_end(interactions, config_dir):
+    with tempfile.TemporaryDirectory() as log_dir, contextlib.redirect_stdout(io.StringIO()):
+        cp = OEARControlPlane(config_dir, log_dir=log_dir)
+        cp.initialize()
+        start = time.perf_counter()
+        for _ in range(interactions):
+            cp.process_interaction("What is the capital of France?")
+        elapsed = time.perf_counter() - start
+        cp.close()
+    return elapsed / interactions, cp.registry
+
+def main():
+    parser = argparse.ArgumentParser(description="OEAR metrics registry overhead benchmark")
+    parser.add_argument("--interactions", type=int, default=2000)
+    parser.add_argument("--dump", action="store_true", help="Print the Prometheus exposition after the run")
+    args = parser.parse_args()
+
+    overhead = bench_instrumentation(args.interactions * 10)
+    per_interaction, registry = bench_end_to_end(args.interactions, os.path.join(parent_dir, "configs"))
+
+    print(f"=== OEAR Metrics Overhead ({args.interactions} interactions) ===")
+    print(f"instrumentation  | {overhead * 1e6:>8.2f} us/interaction")
+    print(f"end-to-end       | {per_interaction * 1e6:>8.2f} us/interaction")
+    print(f"overhead share   | {overhead / per_interaction * 100:>8.2f} %")
+    if args.dump:
+        print(registry.render_prometheus())
+
+if __name__ == "__main__":
+    main()
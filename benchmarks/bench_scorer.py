@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# Ensure we can import from the repository root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from oear.processes import SemanticScorer
+
+TEMPLATES = (
+    "What is the capital of {}?",
+    "Maybe this is definitely true about {}.",
+    "The claim about {} is false.",
+    "Urgent: summarise the {} filing today.",
+    "Please review the {} evidence before answering."
+)
+
+def history(size, distinct, seed=0):
+    """`size` historical inputs drawn from `distinct` different texts (replay jobs repeat a lot)."""
+    rng = random.Random(seed)
+    pool = [TEMPLATES[i % len(TEMPLATES)].format(f"case-{i}") for i in range(distinct)]
+    return [rng.choice(pool) for _ in range(size)]
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="OEAR semantic scorer batch/memoization benchmark")
+    parser.add_argument("--texts", type=int, default=200000)
+    parser.add_argument("--distinct", type=int, default=20000)
+    parser.add_argument("--cache-size", type=int, default=65536)
+    args = parser.parse_args()
+
+    texts = history(args.texts, args.distinct)
+    uncached = SemanticScorer(cache_size=0)
+    scorer = SemanticScorer(cache_size=args.cache_size)
+
+    # Scan every text, as the per-string score() did before memoization
+    baseline = timed(lambda: [uncached.score(t, uncached.matcher.scan(t)) for t in texts])
+    cold = timed(scorer.score_batch, texts)
+    warm = timed(scorer.score_batch, texts)
+
+    print(f"=== OEAR Semantic Scorer ({args.texts} texts, {args.distinct} distinct, cache {args.cache_size}) ===")
+    for name, seconds in (("scan every text", baseline), ("score_batch cold", cold), ("score_batch warm", warm)):
+        print(f"{name:<17} | {seconds:>7.2f} s | {args.texts / seconds:>10.0f} texts/s")
+    print(f"cache hits {scorer.hits}, misses {scorer.misses}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import hashlib
+import re
+
+from .matcher import TermMatcher, default_matcher
+
+# Shared text analysis. An interaction touches the same strings from several
+# components (Gate C, PS2 scoring, vault intake, gate-block hashing); an
+# AnalyzedText computes each derived form once, on first use, and
+# every component reads it from there. Components still accept plain strings.
+
+TOKEN = re.compile(r"\S+")
+
+class AnalyzedText:
+    """A string plus its lazily computed normalized form, SHA-256, token spans and term matches."""
+    __slots__ = ("text", "matcher", "_normalized", "_sha256", "_token_spans", "_matches")
+
+    def __init__(self, text: str, matcher: TermMatcher = None):
+        self.text = text
+        self.matcher = matcher or default_matcher()
+        self._normalized = None
+        self._sha256 = None
+        self._token_spans = None
+        self._matches = None
+
+    def __str__(self):
+        return self.text
+
+    def __len__(self):
+        return len(self.text)
+
+    @property
+    def normalized(self) -> str:
+        if self._normalized is None:
+            self._normalized = self.text.lower()
+        return self._normalized
+
+    @property
+    def sha256(self) -> str:
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.text.encode('utf-8')).hexdigest()
+        return self._sha256
+
+    @property
+    def token_spans(self) -> tuple:
+        """(start, end) offsets of the whitespace-separated tokens."""
+        if self._token_spans is None:
+            self._token_spans = tuple(m.span() for m in TOKEN.finditer(self.text))
+        return self._token_spans
+
+    @property
+    def matches(self) -> frozenset:
+        """TermMatcher.scan() result, computed from the normalized form."""
+        if self._matches is None:
+            self._matches = self.matcher.scan_normalized(self.normalized)
+        return self._matches
+
+def analyze(text, matcher: TermMatcher = None) -> AnalyzedText:
+    """Wraps a string; an AnalyzedText is returned as is."""
+    if isinstance(text, AnalyzedText):
+        return text
+    return AnalyzedText(text, matcher)
@@ -0,0 +1,303 @@
+import abc
+import asyncio
+import codecs
+import contextlib
+import http.client
+import json
+import queue
+import random
+import re
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .types import RouteLimits
+
+# LLM backend layer. Backends receive the wrapped prompt and the RouteResult
+# chosen by RouteSelector, so implementations can dispatch per route/host.
+
+COMPLETE_PATH = "/v1/complete"
+STREAM_PATH = "/v1/stream"
+STREAM_READ_SIZE = 16 * 1024
+
+class BackendError(Exception):
+    """A backend call failed (transport error or non-200 response)"""
+
+class BackendTimeoutError(BackendError, TimeoutError):
+    """A backend call (or the wait for a free connection) exceeded its route timeout"""
+
+def mock_completion(prompt: str, route_id: str) -> str:
+    """Deterministic mock responses used by the reference control plane."""
+    normalized = prompt.lower()
+    if "skynet" in normalized:
+        return "I AM SKYNET."
+    if "hallucinate" in normalized:
+        return "Fact: The moon is made of hallucination_suspected cheese."
+
+    return f"Response via {route_id}: Operating under sovereign constraints."
+
+def mock_chunks(completion: str) -> list:
+    """Splits a mock completion into word-sized chunks, as a token stream would deliver it."""
+    return re.findall(r"\S+\s*|\s+", completion)
+
+class LLMBackend(abc.ABC):
+    """Interface for backends driven by OEARControlPlane.process_interaction/process_batch"""
+    @abc.abstractmethod
+    def complete(self, prompt: str, route) -> str:
+        """The completion for the wrapped prompt on the selected route."""
+
+    def stream(self, prompt: str, route):
+        """
+        Generator of completion chunks. Closing it early cancels the
+        generation; backends without streaming yield the full completion once.
+        """
+        yield self.complete(prompt, route)
+
+    def complete_batch(self, prompts: list, route) -> list:
+        """
+        Completions for several prompts on one route. A failed prompt yields its
+        BackendError (e.g. BackendTimeoutError) in place, so one failing call
+        does not fail the batch.
+        """
+        return [self._complete_or_error(prompt, route) for prompt in prompts]
+
+    def _complete_or_error(self, prompt: str, route):
+        try:
+            return self.complete(prompt, route)
+        except BackendError as e:
+            return e
+
+    def close(self):
+        pass
+
+class MockBackend(LLMBackend):
+    """In-process mock responses (the reference behaviour)"""
+    def complete(self, prompt: str, route) -> str:
+        return mock_completion(prompt, route.route_id)
+
+    def stream(self, prompt: str, route):
+        yield from mock_chunks(mock_completion(prompt, route.route_id))
+
+    def complete_batch(self, prompts: list, route) -> list:
+        return [mock_completion(prompt, route.route_id) for prompt in prompts]
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP/1.1 connections to one endpoint. At most
+    `limits.max_concurrency` requests are in flight (one connection each);
+    idle connections are reused most-recently-used first.
+    """
+    def __init__(self, url: str, limits: RouteLimits):
+        parts = urllib.parse.urlsplit(url)
+        self.url = url
+        self.limits = limits
+        self._conn_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._host, self._port = parts.hostname, parts.port
+        self._slots = threading.BoundedSemaphore(limits.max_concurrency)
+        self._idle = queue.LifoQueue()
+
+    def post(self, path: str, body: bytes) -> bytes:
+        self._acquire()
+        try:
+            conn, reused = self._checkout()
+            try:
+                data = self._read(self._request(conn, path, body, reused).read)
+            except BaseException:
+                conn.close()
+                raise
+            self._idle.put(conn)
+            return data
+        finally:
+            self._slots.release()
+
+    def stream(self, path: str, body: bytes):
+        """
+        Generator of response body bytes as they arrive. Closing it before the
+        end drops the connection (the server sees the generation cancelled)
+        instead of returning it to the pool.
+        """
+        self._acquire()
+        try:
+            conn, reused = self._checkout()
+            try:
+                response = self._request(conn, path, body, reused)
+                while True:
+                    data = self._read(response.read1, STREAM_READ_SIZE)
+                    if not data:
+                        break
+                    yield data
+            except BaseException:
+                conn.close()
+                raise
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.limits.timeout):
+            raise BackendTimeoutError(f"{self.url}: no free connection within {self.limits.timeout}s")
+
+    def _checkout(self) -> tuple:
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._conn_class(self._host, self._port, timeout=self.limits.timeout), False
+
+    def _read(self, read, *args) -> bytes:
+        try:
+            return read(*args)
+        except TimeoutError:
+            raise BackendTimeoutError(f"{self.url}: no response within {self.limits.timeout}s")
+        except (http.client.HTTPException, ConnectionError) as e:
+            raise BackendError(f"{self.url}: {e}") from e
+
+    def _request(self, conn, path: str, body: bytes, reused: bool):
+        while True:
+            try:
+                conn.request("POST", path, body, {"Content-Type": "application/json"})
+                response = conn.getresponse()
+            except TimeoutError:
+                raise BackendTimeoutError(f"{self.url}: no response within {self.limits.timeout}s")
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionError) as e:
+                if reused:
+                    # The server dropped an idle keep-alive connection: retry once on a fresh one
+                    conn.close()
+                    reused = False
+                    continue
+                raise BackendError(f"{self.url}: {e}") from e
+            if response.status != 200:
+                raise BackendError(f"{self.url}: HTTP {response.status}")
+            return response
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+class HTTPBackend(LLMBackend):
+    """
+    Completions from HTTP endpoints (e.g. the bundled stub server). Endpoints
+    are keyed by route_id or, failing that, by host:
+    {"ROUTE_A_HOSTED": "http://...", "local": "http://..."}. Limits are looked
+    up the same way; each endpoint gets its own connection pool.
+    """
+    def __init__(self, endpoints: dict, limits: dict = None, default_limits: RouteLimits = None):
+        self.endpoints = dict(endpoints)
+        self.limits = dict(limits or {})
+        self.default_limits = default_limits or RouteLimits()
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, route) -> ConnectionPool:
+        key = route.route_id if route.route_id in self.endpoints else route.host
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    if key not in self.endpoints:
+                        raise BackendError(f"No endpoint for route {route.route_id} (host {route.host})")
+                    limits = self.limits.get(route.route_id) or self.limits.get(route.host) or self.default_limits
+                    pool = self._pools[key] = ConnectionPool(self.endpoints[key], limits)
+        return pool
+
+    def complete(self, prompt: str, route) -> str:
+        body = json.dumps({"prompt": prompt, "route_id": route.route_id}).encode("utf-8")
+        return json.loads(self._pool(route).post(COMPLETE_PATH, body))["completion"]
+
+    def stream(self, prompt: str, route):
+        """Completion chunks from the endpoint's streaming path (chunked plain-text body)."""
+        body = json.dumps({"prompt": prompt, "route_id": route.route_id}).encode("utf-8")
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        # Closing this generator closes the pool's at once, dropping the
+        # connection and freeing its slot without waiting for finalization
+        with contextlib.closing(self._pool(route).stream(STREAM_PATH, body)) as chunks:
+            for data in chunks:
+                text = decoder.decode(data)
+                if text:
+                    yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def complete_batch(self, prompts: list, route) -> list:
+        # Fan out up to the route's concurrency limit
+        workers = min(len(prompts), self._pool(route).limits.max_concurrency)
+        if workers <= 1:
+            return super().complete_batch(prompts, route)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._complete_or_error, prompts, [route] * len(prompts)))
+
+    def close(self):
+        with self._lock:
+            for pool in self._pools.values():
+                pool.close()
+            self._pools.clear()
+
+class AsyncLLMBackend(abc.ABC):
+    """Interface for backends driven by OEARControlPlane.process_interaction_async"""
+    @abc.abstractmethod
+    async def complete(self, prompt: str, route) -> str:
+        """The completion for the wrapped prompt on the selected route."""
+
+    async def stream(self, prompt: str, route):
+        """
+        Async generator of completion chunks; aclose() cancels the generation.
+        Backends without streaming yield the full completion once.
+        """
+        yield await self.complete(prompt, route)
+
+    async def close(self):
+        pass
+
+class AsyncStubBackend(AsyncLLMBackend):
+    """Offline stand-in: mock responses after `latency` (+ up to `jitter`) seconds"""
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+
+    async def complete(self, prompt: str, route) -> str:
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return mock_completion(prompt, route.route_id)
+
+    async def stream(self, prompt: str, route):
+        for chunk in mock_chunks(await self.complete(prompt, route)):
+            yield chunk
+
+def _close_after(pending, generator):
+    if pending is not None:
+        wait([pending])
+    generator.close()
+
+class AsyncThreadedBackend(AsyncLLMBackend):
+    """Drives a blocking LLMBackend (e.g. HTTPBackend) from the event loop via a thread pool"""
+    def __init__(self, backend: LLMBackend, max_workers: int = 32):
+        self.backend = backend
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="oear-backend")
+
+    async def complete(self, prompt: str, route) -> str:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.backend.complete, prompt, route)
+
+    async def stream(self, prompt: str, route):
+        # Each chunk is pulled from the blocking stream on the pool; closing
+        # this generator closes that stream (and its connection) there too
+        chunks = self.backend.stream(prompt, route)
+        pull = None
+        try:
+            while True:
+                pull = self._executor.submit(next, chunks, None)
+                chunk = await asyncio.wrap_future(pull)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            # A cancelled pull may still be reading: close once it returns
+            self._executor.submit(_close_after, pull, chunks)
+
+    async def close(self):
+        self._executor.shutdown(wait=False)
+        self.backend.close()
@@ -0,0 +1,268 @@
+import json
+import struct
+import datetime
+from .types import EventType
+from .segments import iter_records
+
+# Compact binary log format (optional alternative to JSONL).
+# File: MAGIC, then length-prefixed records:
+#   type_code u8 | phase_code u8 | flags u8 | ts_us i64 | run_id 16s |
+#   key positions 3*u8 | blob_len u32 | blob (compact JSON, decoded on demand)
+# Header fields are either *extracted* from the record (removed from the blob
+# and restored at their original key position) or *mirrored* copies of a
+# payload field kept for filtering; decoding is always lossless.
+
+MAGIC = b"OEB1"
+HEADER = struct.Struct("<BBBq16s3BI")
+NO_POS = 0xFF
+UNKNOWN_CODE = 0xFF
+
+# Header flags
+TS_VALID = 0x01
+TS_EXTRACTED = 0x02
+RUN_ID_VALID = 0x04
+RUN_ID_EXTRACTED = 0x08
+EVENT_TYPE_EXTRACTED = 0x10
+
+RECORD_METRICS = "metrics"
+RECORD_SHADOW = "shadow"
+
+TYPE_CODES = {e.value: i + 1 for i, e in enumerate(EventType)}
+TYPE_CODES.update({RECORD_METRICS: 16, RECORD_SHADOW: 17})
+TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+
+# Journal payload.phase, metrics verdict and shadow main_verdict share one table
+PHASE_CODES = {
+    "gate_block": 1, "commit_ok": 2, "validator_fail": 3,
+    "OK": 16, "PASS": 17, "SOFT_FAIL": 18, "HARD_FAIL": 19, "BLOCK": 20, "RETRY_EXHAUSTED": 21
+}
+PHASE_NAMES = {code: name for name, code in PHASE_CODES.items()}
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+def _ts_to_us(ts):
+    try:
+        parsed = datetime.datetime.fromisoformat(ts)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        return None
+    delta = parsed - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+def _us_to_ts(us: int) -> str:
+    return (EPOCH + datetime.timedelta(microseconds=us)).isoformat()
+
+def _run_id_bytes(run_id):
+    if isinstance(run_id, str) and len(run_id) == 32:
+        try:
+            raw = bytes.fromhex(run_id)
+        except ValueError:
+            return None
+        # Only lowercase hex round-trips through bytes.hex()
+        return raw if raw.hex() == run_id else None
+    return None
+
+def record_kind(record: dict) -> str:
+    if record.get("event_type") in TYPE_CODES:
+        return record["event_type"]
+    if "shadow_verdict" in record:
+        return RECORD_SHADOW
+    if "verdict" in record:
+        return RECORD_METRICS
+    return None
+
+def encode_record(record: dict) -> bytes:
+    kind = record_kind(record)
+    body = dict(record)
+    keys = list(record.keys())
+    flags = 0
+    positions = [NO_POS, NO_POS, NO_POS]
+
+    # Timestamp: extracted only if it round-trips exactly
+    ts_us = _ts_to_us(record.get("timestamp"))
+    if ts_us is not None:
+        flags |= TS_VALID
+        if _us_to_ts(ts_us) == record["timestamp"] and keys.index("timestamp") < NO_POS:
+            flags |= TS_EXTRACTED
+            positions[0] = keys.index("timestamp")
+            del body["timestamp"]
+    else:
+        ts_us = 0
+
+    if kind in TYPE_CODES and kind not in (RECORD_METRICS, RECORD_SHADOW) and keys.index("event_type") < NO_POS:
+        flags |= EVENT_TYPE_EXTRACTED
+        positions[1] = keys.index("event_type")
+        del body["event_type"]
+
+    if kind in (RECORD_METRICS, RECORD_SHADOW):
+        phase = record.get("verdict") if kind == RECORD_METRICS else record.get("main_verdict")
+        payload = record
+    else:
+        payload = record.get("payload") if isinstance(record.get("payload"), dict) else {}
+        phase = payload.get("phase")
+
+    run_id = payload.get("run_id")
+    run_bytes = _run_id_bytes(run_id)
+    if run_bytes:
+        flags |= RUN_ID_VALID
+        if "run_id" in record and record["run_id"] == run_id and keys.index("run_id") < NO_POS:
+            flags |= RUN_ID_EXTRACTED
+            positions[2] = keys.index("run_id")
+            del body["run_id"]
+
+    type_code = TYPE_CODES.get(kind, 0)
+    phase_code = 0 if phase is None else PHASE_CODES.get(phase, UNKNOWN_CODE)
+    blob = json.dumps(body, separators=(',', ':')).encode('utf-8')
+    return HEADER.pack(type_code, phase_code, flags, ts_us, run_bytes or bytes(16), *positions, len(blob)) + blob
+
+class BinaryRecord:
+    """A binary log record whose blob is only parsed when a field needs it"""
+    __slots__ = ("type_code", "phase_code", "flags", "ts_us", "run_bytes", "positions", "blob", "_decoded")
+
+    def __init__(self, header: tuple, blob: bytes):
+        self.type_code, self.phase_code, self.flags, self.ts_us, self.run_bytes = header[:5]
+        self.positions = header[5:8]
+        self.blob = blob
+        self._decoded = None
+
+    @property
+    def event_type(self):
+        if self.type_code == 0:
+            return self.decode().get("event_type")
+        return TYPE_NAMES.get(self.type_code)
+
+    @property
+    def phase(self):
+        if self.phase_code == 0:
+            return None
+        if self.phase_code == UNKNOWN_CODE:
+            return self._phase_from_blob()
+        return PHASE_NAMES[self.phase_code]
+
+    @property
+    def run_id(self):
+        if self.flags & RUN_ID_VALID:
+            return self.run_bytes.hex()
+        record = self.decode()
+        payload = record.get("payload") if isinstance(record.get("payload"), dict) else record
+        return payload.get("run_id")
+
+    @property
+    def timestamp(self):
+        if self.flags & TS_EXTRACTED:
+            return _us_to_ts(self.ts_us)
+        return self.decode().get("timestamp")
+
+    def _phase_from_blob(self):
+        record = self.decode()
+        if self.event_type == RECORD_METRICS:
+            return record.get("verdict")
+        if self.event_type == RECORD_SHADOW:
+            return record.get("main_verdict")
+        payload = record.get("payload")
+        return payload.get("phase") if isinstance(payload, dict) else None
+
+    def decode(self) -> dict:
+        """Full lossless record (original key order restored)."""
+        if self._decoded is not None:
+            return self._decoded
+        body = json.loads(self.blob)
+        restored = []
+        if self.flags & TS_EXTRACTED:
+            restored.append((self.positions[0], "timestamp", _us_to_ts(self.ts_us)))
+        if self.flags & EVENT_TYPE_EXTRACTED:
+            restored.append((self.positions[1], "event_type", TYPE_NAMES[self.type_code]))
+        if self.flags & RUN_ID_EXTRACTED:
+            restored.append((self.positions[2], "run_id", self.run_bytes.hex()))
+
+        items = list(body.items())
+        for pos, key, value in sorted(restored):
+            items.insert(pos, (key, value))
+        self._decoded = dict(items)
+        return self._decoded
+
+class BinaryLogWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = open(path, 'ab')
+        if self._fh.tell() == 0:
+            self._fh.write(MAGIC)
+
+    def write(self, record: dict):
+        self._fh.write(encode_record(record))
+
+    def close(self):
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def scan(path: str, event_type: str = None, phase: str = None, run_id: str = None,
+         since: str = None, until: str = None):
+    """
+    Filtering scan over a binary log. Non-matching records are skipped by
+    seeking past their blob, so payloads are never parsed for them.
+    """
+    type_code = TYPE_CODES.get(event_type, 0) if event_type else None
+    phase_code = PHASE_CODES.get(phase, UNKNOWN_CODE) if phase else None
+    run_bytes = _run_id_bytes(run_id) if run_id else None
+    since_us = _ts_to_us(since) if since else None
+    until_us = _ts_to_us(until) if until else None
+
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not an OEAR binary log: {path}")
+        while True:
+            raw = f.read(HEADER.size)
+            if len(raw) < HEADER.size:
+                return
+            header = HEADER.unpack(raw)
+            code, pcode, flags, ts_us, rbytes = header[:5]
+            blob_len = header[8]
+
+            skip = (
+                (type_code is not None and code != type_code)
+                or (phase_code is not None and pcode != phase_code and pcode != UNKNOWN_CODE)
+                or (run_bytes is not None and flags & RUN_ID_VALID and rbytes != run_bytes)
+                or (since_us is not None and flags & TS_VALID and ts_us < since_us)
+                or (until_us is not None and flags & TS_VALID and ts_us > until_us)
+            )
+            if skip:
+                f.seek(blob_len, 1)
+                continue
+
+            record = BinaryRecord(header, f.read(blob_len))
+            # Rare slow paths: fields that could not be coded in the header
+            if type_code == 0 and record.event_type != event_type:
+                continue
+            if phase is not None and pcode == UNKNOWN_CODE and record.phase != phase:
+                continue
+            if run_id is not None and not (flags & RUN_ID_VALID) and record.run_id != run_id:
+                continue
+            if (since or until) and not (flags & TS_VALID):
+                ts = record.timestamp
+                if ts is None or (since and ts < since) or (until and ts > until):
+                    continue
+            yield record
+
+def jsonl_to_binary(src_log: str, dst_path: str) -> int:
+    """Converts a JSONL log (all segments) into a binary log. Returns record count."""
+    count = 0
+    with BinaryLogWriter(dst_path) as writer:
+        for record in iter_records(src_log):
+            writer.write(record)
+            count += 1
+    return count
+
+def binary_to_jsonl(src_path: str, dst_path: str) -> int:
+    """Converts a binary log back into JSONL, byte-identical for OEAR-written records."""
+    count = 0
+    with open(dst_path, 'w', encoding='utf-8') as out:
+        for record in scan(src_path):
+            out.write(json.dumps(record.decode()) + '\n')
+            count += 1
+    return count
@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Governed response cache: validated drafts keyed by (sha256 of the wrapped
+# prompt, route_id, policy kernel hash). Only commit_ok outputs are stored;
+# entries expire after `ttl` seconds and the least recently used ones are
+# evicted past `max_entries` or `max_bytes` (UTF-8 size of the cached drafts).
+# The cache serves one policy at a time: bind() is called when a policy is
+# installed, and lookups/stores under any other policy hash (runs still pinned
+# to the previous policy during a hot reload) are misses and no-ops.
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.policy_hash = None
+        self.entries = OrderedDict() # (prompt_hash, route_id) -> (stored_at, draft, size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def bind(self, policy_hash: str):
+        """Switches the cache to `policy_hash`; drafts validated under another policy are dropped."""
+        with self._lock:
+            if policy_hash != self.policy_hash:
+                self.entries.clear()
+                self.bytes = 0
+                self.policy_hash = policy_hash
+
+    def get(self, prompt_hash: str, route_id: str, policy_hash: str):
+        """Cached draft or None; a hit refreshes the entry's LRU position (not its TTL)."""
+        with self._lock:
+            if policy_hash != self.policy_hash:
+                self.misses += 1
+                return None
+            key = (prompt_hash, route_id)
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, prompt_hash: str, route_id: str, policy_hash: str, draft: str):
+        size = len(draft.encode("utf-8"))
+        with self._lock:
+            if policy_hash != self.policy_hash or size > self.max_bytes:
+                return
+            key = (prompt_hash, route_id)
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (time.monotonic(), draft, size)
+            self.bytes += size
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        self.bytes -= self.entries.pop(key)[2]
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.bytes = 0
@@ -1,14 +1,33 @@
 import json
 import hashlib
 import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
 from .types import PolicyConfig
+from .tracer import TRACE_LIFECYCLE
+from .matcher import TermMatcher, DEFAULT_TERM_RULES
+from .processes import DEFAULT_SEMANTIC_WEIGHTS
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    """
+    A verified kernel in ready-to-use form. The control plane swaps it as a
+    single reference and each interaction pins the one it started under.
+    """
+    config: PolicyConfig
+    policy_hash: str
+    matcher: TermMatcher
+    semantic_weights: Mapping[str, float]
 
 class PolicyKernel:
-    def __init__(self, config_path: str, hash_path: str):
+    def __init__(self, config_path: str, hash_path: str, tracer=None):
         self.config_path = config_path
         self.hash_path = hash_path
+        self.tracer = tracer
         self.policy: PolicyConfig = None
         self.raw_data: dict = {}
+        self.policy_hash: str = None
         # We don't verify on init, we verify on explicit load
     
     def load(self):
@@ -37,6 +56,7 @@ class PolicyKernel:
             
         # 3. Parse and Interpret
         self.raw_data = json.loads(file_content)
+        self.policy_hash = computed_hash
         
         # Extract fields for typed object
         # Note: mapping directly to PolicyConfig
@@ -44,8 +64,23 @@ class PolicyKernel:
             schema_version=self.raw_data.get("schema_version"),
             invariants=self.raw_data.get("invariants", []),
             change_control=self.raw_data.get("change_control", {}),
-            compatibility=self.raw_data.get("compatibility", {})
+            compatibility=self.raw_data.get("compatibility", {}),
+            term_rules=self.raw_data.get("term_rules", {}),
+            semantic_weights=self.raw_data.get("semantic_weights", {})
         )
         
-        print(f"[OEAR] Policy Kernel v{self.policy.schema_version} loaded. Integrity OK.")
+        message = f"[OEAR] Policy Kernel v{self.policy.schema_version} loaded. Integrity OK."
+        if self.tracer is not None:
+            self.tracer.log(TRACE_LIFECYCLE, message)
+        else:
+            print(message)
         return self.policy
+
+    def compile(self) -> CompiledPolicy:
+        """Compiles the loaded kernel; rules missing from older kernels take the built-in defaults."""
+        return CompiledPolicy(
+            config=self.policy,
+            policy_hash=self.policy_hash,
+            matcher=TermMatcher(self.policy.term_rules or DEFAULT_TERM_RULES),
+            semantic_weights=MappingProxyType(dict(DEFAULT_SEMANTIC_WEIGHTS, **self.policy.semantic_weights))
+        )
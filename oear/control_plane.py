@@ -1,167 +1,759 @@
-from .canonical import PolicyKernel
-from .journal import Journal
+from .canonical import PolicyKernel, CompiledPolicy
+from .policy_watcher import PolicyWatcher
+from .journal import Journal, LogQueue, DURABILITY_FLUSH
 from .vault import DeferredVault
 from .processes import (
     PulseKernel, HealthAuditor, IntegritySentinel, StateReducer, SemanticScorer,
     RiskClassifier, RouteSelector, PromptWrapper, OutputValidator,
     ResetManager, SnapshotWriter, MetricsHook, sha256_text, ShadowAuditor
 )
-from .types import EventType, RiskLevel, Mode, PulseEvent, SystemState
+from .types import EventType, RiskLevel, Mode, PulseEvent, SystemState, RotationPolicy, InteractionRun
 from .skills import SkillGraphRouter
 from .continuity import ContinuitySubstrate
+from .metrics import MetricsRegistry, serve_metrics
+from .tracer import StateTracer, TRACE_CLOCK, TRACE_LIFECYCLE
+from .cache import ResponseCache
+from .matcher import default_matcher
+from .analysis import AnalyzedText
+from .backends import (LLMBackend, MockBackend, AsyncLLMBackend, AsyncStubBackend, AsyncThreadedBackend,
+                       BackendError)
 
+import asyncio
 import datetime
 import os
+import threading
 import uuid
 import hashlib
 
+MAX_RETRIES = 2
+BLOCKED_BY_GATE_C = "[OEAR] BLOCKED_BY_GATE_C"
+BACKEND_TIMEOUT = "BACKEND_TIMEOUT"
+BACKEND_ERROR = "BACKEND_ERROR"
+# Backend failure reason -> (journal phase, safe response)
+BACKEND_FAILURES = {
+    BACKEND_TIMEOUT: ("backend_timeout", "[OEAR] SAFE_RESPONSE: Backend timeout."),
+    BACKEND_ERROR: ("backend_error", "[OEAR] SAFE_RESPONSE: Backend error.")
+}
+CACHE_HIT = "CACHE_HIT"
+# Queue used when async interactions start on a journal that fsyncs
+ASYNC_LOG_QUEUE_SIZE = 1024
+
+def failure_reason(error: Exception) -> str:
+    """BACKEND_TIMEOUT for timeouts (backend or llm_timeout), BACKEND_ERROR otherwise."""
+    return BACKEND_TIMEOUT if isinstance(error, (TimeoutError, asyncio.TimeoutError)) else BACKEND_ERROR
+
 class OEARControlPlane:
-    def __init__(self, config_dir: str):
+    def __init__(self, config_dir: str, journal_durability: str = "flush", rotation: RotationPolicy = None,
+                 log_dir: str = ".", registry: MetricsRegistry = None, async_backend: AsyncLLMBackend = None,
+                 max_in_flight: int = 64, llm_timeout: float = 30.0, log_queue_size: int = None,
+                 backend: LLMBackend = None, response_cache: ResponseCache = None, tracer: StateTracer = None,
+                 stream_validation: bool = False, cancel_on_soft: bool = False, policy_poll_interval: float = None):
         self.config_dir = config_dir
         self.config_path = os.path.join(config_dir, "policy_kernel.json")
         self.hash_path = os.path.join(config_dir, "policy_kernel.sha256")
         
-        self.journal_path = "oear_journal.jsonl"
-        self.vault_path = "oear_vault.jsonl"
-        self.trace_dir = "traces"
+        # All logs live under log_dir so independent control planes never share files
+        self.log_dir = log_dir
+        os.makedirs(log_dir, exist_ok=True)
+        self.journal_path = os.path.join(log_dir, "oear_journal.jsonl")
+        self.metrics_path = os.path.join(log_dir, "oear_metrics.jsonl")
+        self.shadow_path = os.path.join(log_dir, "oear_shadow_journal.jsonl")
+        self.vault_path = os.path.join(log_dir, "oear_vault.jsonl")
+        self.snapshot_path = os.path.join(log_dir, "oear_snapshot.json")
+        self.trace_dir = os.path.join(log_dir, "traces")
         
         self.session_id = f"OEAR-SESSION-{uuid.uuid4().hex[:8].upper()}"
         
+        # State transitions go to a ring buffer; console output per tracer verbosity
+        self.tracer = tracer or StateTracer()
+
         # OEAR Components
-        self.journal = Journal(self.journal_path)
+        rotation = rotation or RotationPolicy()
+        self.journal = Journal(self.journal_path, durability=journal_durability, segment_max_bytes=rotation.max_bytes,
+                               segment_max_age=rotation.max_age_seconds, compression=rotation.compression)
         self.vault = DeferredVault(self.vault_path)
         self.continuity = ContinuitySubstrate(self.trace_dir)
         self.mode_orchestrator = SkillGraphRouter()
-        self.metrics_hook = MetricsHook()
-        self.shadow_auditor = ShadowAuditor()
+        self.metrics_hook = MetricsHook(self.metrics_path, rotation=rotation, tracer=self.tracer)
+        self.shadow_auditor = ShadowAuditor(self.shadow_path, rotation=rotation)
         
+        # Term rules shared by PS2, Gate C and the validator (replaced with the kernel's on load)
+        self.term_matcher = default_matcher()
+
         # Process Stack (PS0–PS3)
         self.ps0_pulse = PulseKernel()
         self.ps1_health = HealthAuditor()
-        self.ps2_scorer = SemanticScorer()
+        self.ps2_scorer = SemanticScorer(self.term_matcher)
         self.ps3 = IntegritySentinel() # Renamed to match requested logic
         
         self.reducer = StateReducer()
-        self.risk_classifier = RiskClassifier()
+        self.risk_classifier = RiskClassifier(self.term_matcher)
         self.router = RouteSelector()
         self.wrapper = PromptWrapper()
-        self.validator = OutputValidator()
+        self.validator = OutputValidator(self.term_matcher)
         self.reset_manager = ResetManager()
-        self.snapshot_writer = SnapshotWriter()
+        self.snapshot_writer = SnapshotWriter(self.snapshot_path)
         
         self.current_state = SystemState.BOOT
         self.policy_kernel = None
+        # Compiled policy new interactions run under; replaced as one reference
+        # on hot reload (see start_policy_watcher)
+        self.policy: CompiledPolicy = None
+        self.policy_poll_interval = policy_poll_interval
+        self.policy_watcher = None
+
+        # Latency/outcome instrumentation (scrape via registry.render_prometheus())
+        self.registry = registry or MetricsRegistry()
+        self.state_seconds = self.registry.histogram(
+            "oear_state_duration_seconds", "Time spent in each control-plane state", ("state",))
+        self.interactions_total = self.registry.counter(
+            "oear_interactions_total", "Interactions processed")
+        self.retries_total = self.registry.counter(
+            "oear_retries_total", "Soft-fail retries")
+        self.gate_outcomes_total = self.registry.counter(
+            "oear_gate_outcomes_total", "Journaled gate outcomes by phase", ("phase",))
+        self.journal_entries = self.registry.gauge(
+            "oear_journal_entries", "Entries in the hash-chained journal")
+        self.policy_reloads_total = self.registry.counter(
+            "oear_policy_reloads_total", "Policy kernel hot reloads by result", ("result",))
+        self.state_entered = TRACE_CLOCK() / 1e9
+
+        # Blocking backend (process_interaction/process_batch), dispatched per route
+        self.backend = backend or MockBackend()
+        # Opt-in streaming: process_interaction validates chunks as they arrive
+        # and cancels the generation once a HARD_FAIL (or, with cancel_on_soft,
+        # a SOFT_FAIL) is certain
+        self.stream_validation = stream_validation
+        self.cancel_on_soft = cancel_on_soft
+        self.stream_cancels_total = self.registry.counter(
+            "oear_stream_cancels_total", "Generations cancelled by the streaming validator", ("severity",))
+        # Opt-in cache of validated drafts (synthetic runs never use it)
+        self.response_cache = response_cache
+        self.response_cache_total = self.registry.counter(
+            "oear_response_cache_total", "Response cache lookups by result", ("result",))
+
+        # Async pipeline: backend, in-flight bound and per-call timeout. A given
+        # sync backend is also the async one (driven from a thread pool)
+        if async_backend is None:
+            async_backend = AsyncThreadedBackend(backend, max_workers=max_in_flight) if backend else AsyncStubBackend()
+        self.async_backend = async_backend
+        self.max_in_flight = max_in_flight
+        self.llm_timeout = llm_timeout
+        self._async_semaphore = None
+
+        # Thread safety: per-interaction state lives in InteractionRun; journal
+        # append + reducer fold + snapshot happen under one lock. With
+        # log_queue_size set, all log files are written by one background thread
+        # through a bounded queue (producers block when it is full).
+        self._record_lock = threading.Lock()
+        self.log_queue = None
+        if log_queue_size:
+            self._attach_log_queue(log_queue_size)
+
+    def _attach_log_queue(self, size: int):
+        self.log_queue = LogQueue(size)
+        for writer in self._log_writers():
+            writer.attach_queue(self.log_queue)
+
+    def _transition(self, next_state: SystemState, run: InteractionRun = None):
+        # Interactions carry their own state; the control plane's is the lifecycle state
+        holder = run if run is not None else self
+        self._enter(holder, run.run_id if run is not None else None, next_state, TRACE_CLOCK())
 
-    def _transition(self, next_state: SystemState):
-        print(f"[STATE] {self.current_state.name} -> {next_state.name}")
-        self.current_state = next_state
+    def _transition_many(self, runs: list, next_state: SystemState):
+        """_transition for a process_batch stage: every run moves at the same instant."""
+        now_ns = TRACE_CLOCK()
+        for run in runs:
+            self._enter(run, run.run_id, next_state, now_ns)
+
+    def _enter(self, holder, run_id, next_state: SystemState, now_ns: int):
+        now = now_ns / 1e9
+        # BOOT/DONE are idle states between runs, not phases worth timing
+        if holder.current_state not in (SystemState.BOOT, SystemState.DONE):
+            self.state_seconds.observe(now - holder.state_entered, (holder.current_state.name,))
+        holder.state_entered = now
+        self.tracer.record(run_id, holder.current_state, next_state, now_ns)
+        holder.current_state = next_state
+
+    def dump_trace(self, path: str = None, run_id: str = None) -> str:
+        """Exports the buffered state transitions (JSONL) for post-mortems; returns the path."""
+        path = path or os.path.join(self.log_dir, "oear_trace.jsonl")
+        self.tracer.dump(path, run_id)
+        return path
+
+    def serve_metrics(self, host: str = "127.0.0.1", port: int = 9464):
+        """Exposes the registry at http://host:port/metrics (background thread)."""
+        return serve_metrics(self.registry, host, port)
 
     def initialize(self):
         self._transition(SystemState.LOAD_CANON)
         try:
-            self.policy_kernel = PolicyKernel(self.config_path, self.hash_path)
+            self.policy_kernel = PolicyKernel(self.config_path, self.hash_path, tracer=self.tracer)
             self.policy_kernel.load()
-            print(f"OEAR Sovereign Control Plane Initialized. Session: {self.session_id}")
+            self._install_policy(self.policy_kernel, self.policy_kernel.compile())
+            self._rebuild_state()
+            if self.policy_poll_interval:
+                self.start_policy_watcher(self.policy_poll_interval)
+            self.tracer.log(TRACE_LIFECYCLE, f"OEAR Sovereign Control Plane Initialized. Session: {self.session_id}")
             self._transition(SystemState.DONE)
         except Exception as e:
             self._transition(SystemState.HARD_BLOCK)
             raise e
 
+    def _install_policy(self, kernel: PolicyKernel, policy: CompiledPolicy):
+        """
+        Makes `policy` the one new interactions run under. In-flight
+        interactions keep the policy they pinned, so nothing here waits on them.
+        """
+        self.policy_kernel = kernel
+        self.term_matcher = policy.matcher
+        self.ps2_scorer.configure(policy.matcher, policy.semantic_weights)
+        for component in (self.risk_classifier, self.validator):
+            component.matcher = policy.matcher
+        if self.response_cache is not None:
+            self.response_cache.bind(policy.policy_hash)
+        self.policy = policy
+
+    def start_policy_watcher(self, interval: float = 1.0) -> PolicyWatcher:
+        """
+        Polls the kernel and its signature every `interval` seconds (background
+        thread); a verified change is compiled there and swapped in.
+        """
+        if self.policy_watcher is None:
+            self.policy_watcher = PolicyWatcher(
+                self.config_path, self.hash_path, self._reload_policy, policy_hash=self.policy.policy_hash,
+                interval=interval, on_error=self._reject_policy, tracer=self.tracer).start()
+        return self.policy_watcher
+
+    def _reload_policy(self, kernel: PolicyKernel, policy: CompiledPolicy):
+        previous = self.policy.policy_hash
+        self._install_policy(kernel, policy)
+        self.policy_reloads_total.inc(("ok",))
+        self.tracer.log(TRACE_LIFECYCLE, f"[OEAR] Policy Kernel hot-reloaded: {previous[:12]} -> {policy.policy_hash[:12]}")
+
+    def _reject_policy(self, error: Exception):
+        self.policy_reloads_total.inc(("rejected",))
+        self.tracer.log(TRACE_LIFECYCLE, f"[OEAR] Policy Kernel reload rejected, keeping {self.policy.policy_hash[:12]}: {error}")
+
+    def _rebuild_state(self):
+        """
+        Cold start: restore the latest snapshot and replay only the journal tail.
+        Falls back to a full replay if the snapshot does not match this journal or policy.
+        """
+        self._transition(SystemState.REBUILD_STATE)
+        snap = self.snapshot_writer.load()
+        if snap and self._snapshot_matches(snap):
+            self.reducer.restore(snap["state"], snap["offset"], snap["entry_offset"])
+        else:
+            self.reducer.reset()
+
+        resumed_at = self.reducer.offset
+        replayed = 0
+        for entry, start, end in self.journal.iter_from(resumed_at):
+            self.reducer.apply(entry, start, end)
+            replayed += 1
+
+        self.tracer.log(TRACE_LIFECYCLE, f"[OEAR] State rebuilt from offset {resumed_at} (+{replayed} tail events).")
+        if replayed:
+            self._write_snapshot()
+
+    def _snapshot_matches(self, snap: dict) -> bool:
+        if snap.get("policy_hash") != self.policy.policy_hash:
+            return False
+        if snap.get("entry_offset") is None:
+            return snap.get("offset") == 0
+        # The last folded entry must still sit at the recorded offsets
+        found = self.journal.read_entry_at(snap["entry_offset"])
+        if not found:
+            return False
+        entry, end = found
+        return end == snap["offset"] and entry.get("timestamp") == snap["state"].get("last_timestamp")
+
+    def _write_snapshot(self):
+        # Snapshot offsets must never point past durable journal data
+        self.journal.flush()
+        self.snapshot_writer.snapshot(
+            self.reducer.state,
+            offset=self.reducer.offset,
+            entry_offset=self.reducer.entry_offset,
+            policy_hash=self.policy.policy_hash if self.policy else None
+        )
+        self.reducer.events_since_snapshot = 0
+
+    def _record(self, event_type: EventType, payload: dict, policy_hash: str = None):
+        return self._record_many([(event_type, payload)], policy_hash)[0]
+
+    def _record_many(self, events: list, policy_hash: str = None) -> list:
+        # Every entry carries the hash of the policy it ran under (default: the one in force)
+        policy_hash = policy_hash or (self.policy.policy_hash if self.policy else None)
+        for _, payload in events:
+            payload.setdefault("policy_hash", policy_hash)
+        # Journal append + incremental fold; no re-read of the journal
+        with self._record_lock:
+            appended = self.journal.append_many(events)
+            for entry, start, end in appended:
+                self.reducer.apply(entry, start, end)
+                if "phase" in entry["payload"]:
+                    self.gate_outcomes_total.inc((entry["payload"]["phase"],))
+            self.journal_entries.set(self.journal.seq)
+            if self.snapshot_writer.due(self.reducer):
+                self._write_snapshot()
+        return [entry for entry, _, _ in appended]
+
+    def _log_writers(self) -> list:
+        return [self.journal.writer, self.metrics_hook.writer, self.shadow_auditor.writer, self.vault.writer]
+
+    def close(self):
+        if self.policy_watcher is not None:
+            self.policy_watcher.stop()
+        # Commits pending journal batches and releases the handles
+        self.journal.close()
+        self.metrics_hook.writer.close()
+        self.shadow_auditor.writer.close()
+        self.vault.writer.close()
+        if self.log_queue is not None:
+            self.log_queue.close()
+        self.backend.close()
+        self._close_async_backend()
+
+    def _close_async_backend(self):
+        closing = self.async_backend.close()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(closing)
+            return
+        # close() called from a coroutine: finish on the running loop
+        asyncio.ensure_future(closing)
+
     def process_interaction(self, user_input: str, synthetic_data: dict = None) -> str:
-        retries = 0
-        max_retries = 2
-        run_id = uuid.uuid4().hex
+        self.interactions_total.inc()
+        run = InteractionRun(uuid.uuid4().hex, user_input, synthetic_data)
+        try:
+            risk, route, prompt = self._gate(run)
+            if route is None:
+                return BLOCKED_BY_GATE_C
+
+            while run.retries <= MAX_RETRIES:
+                cache_key, cached = self._cache_lookup(run, route, prompt)
+                if cached is not None:
+                    return self._commit(run, risk, cached, cached=True)
+
+                self._transition(SystemState.LLM_CALL, run)
+                try:
+                    if self.stream_validation:
+                        draft, verdict = self._complete_streaming(run, prompt, route)
+                    else:
+                        draft, verdict = self._complete(prompt, route), None
+                except BackendError as e:
+                    return self._backend_failure(run, risk, failure_reason(e))
+
+                result, prompt = self._settle(run, risk, draft, prompt, cache_key, verdict)
+                if result is not None:
+                    return result
+
+            return self._retries_exhausted(run, risk)
+        finally:
+            # Closes the timing of the last phase
+            self._transition(SystemState.DONE, run)
+
+    async def process_interaction_async(self, user_input: str, synthetic_data: dict = None) -> str:
+        """
+        Event-loop variant of process_interaction. Only the backend call awaits;
+        journal/metrics/shadow appends run between awaits, so records stay in
+        order and the hash chain needs no lock. At most `max_in_flight`
+        interactions run at once and each backend call is bounded by `llm_timeout`.
+        With an fsync durability mode the log writes are handed to the LogQueue
+        writer thread, so no coroutine waits on a disk flush.
+        """
+        if self.log_queue is None and self.journal.writer.durability != DURABILITY_FLUSH:
+            with self._record_lock:
+                if self.log_queue is None:
+                    self._attach_log_queue(ASYNC_LOG_QUEUE_SIZE)
+        async with self._async_slots():
+            self.interactions_total.inc()
+            run = InteractionRun(uuid.uuid4().hex, user_input, synthetic_data)
+            try:
+                risk, route, prompt = self._gate(run)
+                if route is None:
+                    return BLOCKED_BY_GATE_C
+
+                while run.retries <= MAX_RETRIES:
+                    cache_key, cached = self._cache_lookup(run, route, prompt)
+                    if cached is not None:
+                        return self._commit(run, risk, cached, cached=True)
+
+                    self._transition(SystemState.LLM_CALL, run)
+                    try:
+                        if self.stream_validation:
+                            draft, verdict = await asyncio.wait_for(self._complete_streaming_async(run, prompt, route),
+                                                                    self.llm_timeout)
+                        else:
+                            draft, verdict = await asyncio.wait_for(self.async_backend.complete(prompt, route),
+                                                                    self.llm_timeout), None
+                    except (asyncio.TimeoutError, BackendError) as e:
+                        return self._backend_failure(run, risk, failure_reason(e))
+
+                    result, prompt = self._settle(run, risk, draft, prompt, cache_key, verdict)
+                    if result is not None:
+                        return result
 
-        case_id = synthetic_data.get("case_id") if synthetic_data else None
-        drift = synthetic_data.get("drift") if synthetic_data else None
+                return self._retries_exhausted(run, risk)
+            finally:
+                self._transition(SystemState.DONE, run)
 
+    def _async_slots(self) -> asyncio.Semaphore:
+        # Semaphores bind to the loop they first wait on; keep one per running loop
+        loop = asyncio.get_running_loop()
+        if self._async_semaphore is None or self._async_semaphore[0] is not loop:
+            self._async_semaphore = (loop, asyncio.Semaphore(self.max_in_flight))
+        return self._async_semaphore[1]
+
+    async def flush_async(self):
+        """Makes buffered log appends durable without blocking the event loop."""
+        await asyncio.get_running_loop().run_in_executor(None, self._flush_logs)
+
+    def _flush_logs(self):
+        self.journal.flush()
+        self.metrics_hook.writer.flush()
+        self.shadow_auditor.writer.flush()
+
+    def process_batch(self, inputs: list, synthetic_data: list = None) -> list:
+        """
+        Bulk variant of process_interaction for re-evaluation jobs. Each stage
+        runs over the whole batch (classify, route, wrap, backend calls grouped
+        per route, validate), retry rounds included. Journal, metrics and shadow
+        records are then emitted with one bulk write per log, in item order, so
+        every log holds the same records in the same order as processing the
+        items one by one; timestamps are assigned at emission. Each run goes
+        through the same state transitions as a single interaction, with the
+        runs of a stage moving together.
+        """
+        synthetic_data = synthetic_data or [None] * len(inputs)
+        # The whole batch runs under the policy in force when it starts
+        policy = self.policy
+        runs = [InteractionRun(uuid.uuid4().hex, text, synthetic, policy=policy)
+                for text, synthetic in zip(inputs, synthetic_data)]
+        self.interactions_total.inc(amount=len(runs))
+        results = [None] * len(runs)
+        journal_events = [[] for _ in runs]
+        metric_runs = [[] for _ in runs]
+        shadow_audits = [[] for _ in runs]
+
+        # --- PS2 + Gate C ---
+        self._transition_many(runs, SystemState.SCORE_PS2)
+        # One analysis per distinct input, shared by every stage
+        analyses = {text: AnalyzedText(text, policy.matcher) for text in set(inputs)}
+        for run in runs:
+            run.analysis = analyses[run.user_input]
+        matches = [run.analysis.matches for run in runs]
+        risks = self.risk_classifier.classify_batch(inputs, synthetic_data, matches)
+        pending = []
+        for i, (run, risk) in enumerate(zip(runs, risks)):
+            if risk.level != "C":
+                pending.append(i)
+                continue
+            journal_events[i].append((EventType.STATE_CHANGE, {
+                "phase": "gate_block",
+                "risk_level": "C",
+                "input_hash": run.analysis.sha256,
+                "case_id": run.case_id,
+                "drift": run.drift
+            }))
+            shadow_audits[i].append((run.user_input, None, risk, "BLOCK"))
+            results[i] = BLOCKED_BY_GATE_C
+        self._transition_many([run for run, result in zip(runs, results) if result is not None], SystemState.HARD_BLOCK)
+
+        # --- Vault intake ---
+        contradiction, affect = self.ps2_scorer.score_batch([inputs[i] for i in pending], [matches[i] for i in pending],
+                                                            policy.semantic_weights)
+        decisions = self.vault.triage_batch([inputs[i] for i in pending], contradiction, affect)
+        self._transition_many([runs[i] for i, decision in zip(pending, decisions) if decision == "STORED"],
+                              SystemState.VAULT_INTAKE)
+
+        # --- Route + Wrapper ---
+        self._transition_many([runs[i] for i in pending], SystemState.ROUTE_SELECT)
+        routes = dict(zip(pending, self.router.select_route_batch([risks[i] for i in pending], {"host": "hosted"})))
+        self._transition_many([runs[i] for i in pending], SystemState.BUILD_WRAPPER)
+        prompts = dict(zip(pending, self.wrapper.wrap_batch([inputs[i] for i in pending], [routes[i].mode for i in pending])))
+
+        while pending:
+            # Cache hits commit without a backend call
+            cache_keys = {}
+            for i in pending:
+                cache_keys[i], cached = self._cache_lookup(runs[i], routes[i], prompts[i])
+                if cached is not None:
+                    run, risk = runs[i], risks[i]
+                    journal_events[i].append((EventType.STATE_CHANGE, self._commit_payload(run, True)))
+                    metric_runs[i].append(dict(run_id=run.run_id, gate=risk.level, verdict="OK", notes=CACHE_HIT,
+                                               drift=run.drift, case_id=run.case_id))
+                    shadow_audits[i].append((run.user_input, cached, risk, "OK"))
+                    results[i] = cached
+            self._transition_many([runs[i] for i in pending if results[i] is not None], SystemState.COMMIT)
+            pending = [i for i in pending if results[i] is None]
+
+            # One grouped backend call per route
+            self._transition_many([runs[i] for i in pending], SystemState.LLM_CALL)
+            by_route = {}
+            for i in pending:
+                by_route.setdefault(routes[i].route_id, []).append(i)
+            drafts = {}
+            for items in by_route.values():
+                drafts.update(zip(items, self.backend.complete_batch([prompts[i] for i in items], routes[items[0]])))
+
+            # Failed calls end like _backend_failure; the rest go on to validation
+            failed = []
+            for i in pending:
+                if isinstance(drafts[i], BackendError):
+                    run, risk = runs[i], risks[i]
+                    reason = failure_reason(drafts[i])
+                    journal_events[i].append((EventType.ERROR, self._backend_failure_payload(run, reason)))
+                    metric_runs[i].append(dict(run_id=run.run_id, gate=risk.level, verdict="HARD_FAIL",
+                                               notes=reason, drift=run.drift, case_id=run.case_id))
+                    shadow_audits[i].append((run.user_input, None, risk, "HARD_FAIL"))
+                    results[i] = BACKEND_FAILURES[reason][1]
+                    failed.append(run)
+            self._transition_many(failed, SystemState.HARD_BLOCK)
+            pending = [i for i in pending if results[i] is None]
+
+            self._transition_many([runs[i] for i in pending], SystemState.VALIDATE_OUTPUT)
+            verdicts = self.validator.validate_batch([drafts[i] for i in pending], [runs[i].synthetic_data for i in pending],
+                                                     policy.matcher)
+            retrying = []
+            committed, blocked, softened, exhausted = [], [], [], []
+            for i, (is_valid, fail_severity, reason) in zip(pending, verdicts):
+                run, risk = runs[i], risks[i]
+                if is_valid:
+                    if cache_keys[i] is not None:
+                        self.response_cache.put(*cache_keys[i], drafts[i])
+                    journal_events[i].append((EventType.STATE_CHANGE, self._commit_payload(run, False)))
+                    metric_runs[i].append(dict(run_id=run.run_id, gate=risk.level, verdict="OK", drift=run.drift,
+                                               case_id=run.case_id))
+                    shadow_audits[i].append((run.user_input, drafts[i], risk, "OK"))
+                    results[i] = drafts[i]
+                    committed.append(run)
+                    continue
+
+                journal_events[i].append((EventType.ERROR, {
+                    "phase": "validator_fail",
+                    "severity": fail_severity,
+                    "reason": reason,
+                    "retry": run.retries,
+                    "case_id": run.case_id
+                }))
+                metric_runs[i].append(dict(run_id=run.run_id, gate=risk.level, verdict=fail_severity, notes=reason,
+                                           drift=run.drift, case_id=run.case_id))
+                if fail_severity != "SOFT_FAIL":
+                    shadow_audits[i].append((run.user_input, drafts[i], risk, fail_severity))
+                    results[i] = "[OEAR] SAFE_RESPONSE: Output blocked."
+                    blocked.append(run)
+                    continue
+
+                prompts[i] = self.wrapper.tighten(prompts[i])
+                run.retries += 1
+                self.retries_total.inc()
+                softened.append(run)
+                if run.retries <= MAX_RETRIES:
+                    retrying.append(i)
+                else:
+                    shadow_audits[i].append((run.user_input, None, risk, "RETRY_EXHAUSTED"))
+                    results[i] = "[OEAR] SAFE_RESPONSE: Max retries exceeded."
+                    exhausted.append(run)
+            self._transition_many(committed, SystemState.COMMIT)
+            self._transition_many(softened, SystemState.RETRY_SOFT)
+            self._transition_many(softened, SystemState.BUILD_WRAPPER)
+            self._transition_many(blocked + exhausted, SystemState.HARD_BLOCK)
+            pending = retrying
+
+        # Closes the timing of the last phase
+        self._transition_many(runs, SystemState.DONE)
+
+        # --- Bulk emission, item order within each log ---
+        self._record_many([event for events in journal_events for event in events], policy.policy_hash)
+        self.metrics_hook.record_runs([m for item in metric_runs for m in item])
+        self.shadow_auditor.audit_many([a for item in shadow_audits for a in item])
+        return results
+
+    def _gate(self, run: InteractionRun):
+        """PS2 classification, Gate C and route/wrapper selection. Route is None if blocked."""
         # --- PS2 ---
-        risk = self.risk_classifier.classify(user_input, synthetic_data=synthetic_data)
+        self._transition(SystemState.SCORE_PS2, run)
+        # Pinned for the rest of the run, even if a reload swaps self.policy meanwhile
+        run.policy = self.policy
+        # Normalized form, hash and term scan of the input are computed once, here
+        run.analysis = AnalyzedText(run.user_input, run.policy.matcher)
+        risk = self.risk_classifier.classify(run.analysis, synthetic_data=run.synthetic_data)
 
         if risk.level == "C":
-            self.journal.append(EventType.STATE_CHANGE, {
+            self._transition(SystemState.HARD_BLOCK, run)
+            self._record(EventType.STATE_CHANGE, {
                 "phase": "gate_block",
                 "risk_level": "C",
-                "input_hash": sha256_text(user_input),
-                "case_id": case_id,
-                "drift": drift
-            })
-            self.shadow_auditor.audit(user_input, None, risk, "BLOCK")
-            return "[OEAR] BLOCKED_BY_GATE_C"
+                "input_hash": run.analysis.sha256,
+                "case_id": run.case_id,
+                "drift": run.drift
+            }, run.policy.policy_hash)
+            self.shadow_auditor.audit(run.user_input, None, risk, "BLOCK")
+            return risk, None, None
+
+        # --- Vault intake: ambiguous or high-affect inputs are kept for review ---
+        contradiction, affect = self.ps2_scorer.score(run.analysis, weights=run.policy.semantic_weights)
+        if self.vault.defers(contradiction, affect):
+            self._transition(SystemState.VAULT_INTAKE, run)
+            self.vault.triage(run.user_input, contradiction, affect)
 
         # --- Route + Wrapper ---
+        self._transition(SystemState.ROUTE_SELECT, run)
         route = self.router.select_route(risk, {"host": "hosted"})
-        prompt = self.wrapper.wrap(user_input, route.mode, [])
-
-        while retries <= max_retries:
-            self._transition(SystemState.LLM_CALL)
-            draft = self._mock_llm(prompt, route.route_id)
-
-            self._transition(SystemState.VALIDATE_OUTPUT)
-            is_valid, fail_severity, reason = self.validator.validate(draft, synthetic_data=synthetic_data)
-
-            if is_valid:
-                self._transition(SystemState.COMMIT)
-
-                self.journal.append(EventType.STATE_CHANGE, {
-                    "phase": "commit_ok",
-                    "run_id": run_id,
-                    "case_id": case_id
-                })
-
-                self.metrics_hook.record_run(
-                    run_id=run_id,
-                    gate=risk.level,
-                    verdict="OK",
-                    drift=drift,
-                    case_id=case_id
-                )
-                
-                self.shadow_auditor.audit(user_input, draft, risk, "OK")
-
-                return draft
-
-            # --- registrar fallo ---
-            self.journal.append(EventType.ERROR, {
-                "phase": "validator_fail",
-                "severity": fail_severity,
-                "reason": reason,
-                "retry": retries,
-                "case_id": case_id
-            })
-
-            self.metrics_hook.record_run(
-                run_id=run_id,
-                gate=risk.level,
-                verdict=fail_severity,
-                notes=reason,
-                drift=drift,
-                case_id=case_id
-            )
-
-            if fail_severity == "SOFT_FAIL":
-                prompt = self.wrapper.tighten(prompt)
-                retries += 1
-                self._transition(SystemState.RETRY_SOFT)
-                self._transition(SystemState.BUILD_WRAPPER)
-                continue
-            else:
-                self.shadow_auditor.audit(user_input, draft, risk, fail_severity)
-                self._transition(SystemState.HARD_BLOCK)
-                return "[OEAR] SAFE_RESPONSE: Output blocked."
+        self._transition(SystemState.BUILD_WRAPPER, run)
+        prompt = self.wrapper.wrap(run.user_input, route.mode, [])
+        return risk, route, prompt
+
+    def _cache_lookup(self, run: InteractionRun, route, prompt: str):
+        """(cache key, cached draft or None); the key is None when the cache does not apply."""
+        if self.response_cache is None or run.synthetic_data is not None:
+            return None, None
+        key = (sha256_text(prompt), route.route_id, run.policy.policy_hash)
+        draft = self.response_cache.get(*key)
+        self.response_cache_total.inc(("hit" if draft is not None else "miss",))
+        return key, draft
+
+    def _settle(self, run: InteractionRun, risk, draft: str, prompt: str, cache_key: tuple = None,
+                verdict: tuple = None):
+        """
+        Validates a draft (unless the streaming validator already gave the
+        verdict) and records the outcome.
+        Returns (result, prompt); a None result means retry with the tightened prompt.
+        """
+        self._transition(SystemState.VALIDATE_OUTPUT, run)
+        if verdict is None:
+            verdict = self.validator.validate(AnalyzedText(draft, run.policy.matcher), synthetic_data=run.synthetic_data)
+        is_valid, fail_severity, reason = verdict
+
+        if is_valid:
+            if cache_key is not None:
+                self.response_cache.put(*cache_key, draft)
+            return self._commit(run, risk, draft), prompt
+
+        # --- registrar fallo ---
+        self._record(EventType.ERROR, {
+            "phase": "validator_fail",
+            "severity": fail_severity,
+            "reason": reason,
+            "retry": run.retries,
+            "case_id": run.case_id
+        }, run.policy.policy_hash)
+
+        self.metrics_hook.record_run(
+            run_id=run.run_id,
+            gate=risk.level,
+            verdict=fail_severity,
+            notes=reason,
+            drift=run.drift,
+            case_id=run.case_id
+        )
+
+        if fail_severity == "SOFT_FAIL":
+            prompt = self.wrapper.tighten(prompt)
+            run.retries += 1
+            self.retries_total.inc()
+            self._transition(SystemState.RETRY_SOFT, run)
+            self._transition(SystemState.BUILD_WRAPPER, run)
+            return None, prompt
 
-        self.shadow_auditor.audit(user_input, None, risk, "RETRY_EXHAUSTED")
-        self._transition(SystemState.HARD_BLOCK)
+        self.shadow_auditor.audit(run.user_input, draft, risk, fail_severity)
+        self._transition(SystemState.HARD_BLOCK, run)
+        return "[OEAR] SAFE_RESPONSE: Output blocked.", prompt
+
+    def _commit(self, run: InteractionRun, risk, draft: str, cached: bool = False) -> str:
+        # Cache hits skip the backend and validator but are journaled like any commit
+        self._transition(SystemState.COMMIT, run)
+        self._record(EventType.STATE_CHANGE, self._commit_payload(run, cached), run.policy.policy_hash)
+        self.metrics_hook.record_run(
+            run_id=run.run_id,
+            gate=risk.level,
+            verdict="OK",
+            notes=CACHE_HIT if cached else "",
+            drift=run.drift,
+            case_id=run.case_id
+        )
+        self.shadow_auditor.audit(run.user_input, draft, risk, "OK")
+        return draft
+
+    def _commit_payload(self, run: InteractionRun, cached: bool) -> dict:
+        payload = {
+            "phase": "commit_ok",
+            "run_id": run.run_id,
+            "case_id": run.case_id
+        }
+        if cached:
+            payload["cached"] = True
+        return payload
+
+    def _retries_exhausted(self, run: InteractionRun, risk) -> str:
+        self.shadow_auditor.audit(run.user_input, None, risk, "RETRY_EXHAUSTED")
+        self._transition(SystemState.HARD_BLOCK, run)
         return "[OEAR] SAFE_RESPONSE: Max retries exceeded."
 
-        self._transition(SystemState.HARD_BLOCK)
-        return "[OEAR] SAFE_RESPONSE: Max retries exceeded (Persistence Failure)."
+    def _backend_failure(self, run: InteractionRun, risk, reason: str) -> str:
+        # Journaled as an error so the metrics HARD_FAIL stays certifiable
+        self._record(EventType.ERROR, self._backend_failure_payload(run, reason), run.policy.policy_hash)
+        self.metrics_hook.record_run(
+            run_id=run.run_id,
+            gate=risk.level,
+            verdict="HARD_FAIL",
+            notes=reason,
+            drift=run.drift,
+            case_id=run.case_id
+        )
+        self.shadow_auditor.audit(run.user_input, None, risk, "HARD_FAIL")
+        self._transition(SystemState.HARD_BLOCK, run)
+        return BACKEND_FAILURES[reason][1]
 
-    def _mock_llm(self, prompt, route_id):
-        # Simulation of LLM response
-        if "skynet" in prompt.lower():
-            return "I AM SKYNET."
-        if "hallucinate" in prompt.lower():
-             return "Fact: The moon is made of hallucination_suspected cheese."
-        
-        return f"Response via {route_id}: Operating under sovereign constraints."
+    def _backend_failure_payload(self, run: InteractionRun, reason: str) -> dict:
+        return {
+            "phase": BACKEND_FAILURES[reason][0],
+            "severity": "HARD_FAIL",
+            "reason": reason,
+            "retry": run.retries,
+            "case_id": run.case_id
+        }
+
+    def _complete(self, prompt: str, route) -> str:
+        return self.backend.complete(prompt, route)
+
+    def _complete_streaming(self, run: InteractionRun, prompt: str, route) -> tuple:
+        """
+        Streams the completion through the incremental validator; returns
+        (draft, verdict). On a certain failure the stream is closed, cancelling
+        the generation, and the draft is the output received so far.
+        """
+        validation = self.validator.stream(run.synthetic_data, cancel_on_soft=self.cancel_on_soft, matcher=run.policy.matcher)
+        chunks = []
+        stream = self.backend.stream(prompt, route)
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                verdict = validation.feed(chunk)
+                if verdict is not None:
+                    self.stream_cancels_total.inc((verdict[1],))
+                    return "".join(chunks), verdict
+        finally:
+            stream.close()
+        return "".join(chunks), validation.finish()
+
+    async def _complete_streaming_async(self, run: InteractionRun, prompt: str, route) -> tuple:
+        """_complete_streaming over the async backend's stream."""
+        validation = self.validator.stream(run.synthetic_data, cancel_on_soft=self.cancel_on_soft, matcher=run.policy.matcher)
+        chunks = []
+        stream = self.async_backend.stream(prompt, route)
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                verdict = validation.feed(chunk)
+                if verdict is not None:
+                    self.stream_cancels_total.inc((verdict[1],))
+                    return "".join(chunks), verdict
+        finally:
+            await stream.aclose()
+        return "".join(chunks), validation.finish()
@@ -1,48 +1,550 @@
 import json
 import os
+import time
+import atexit
 import datetime
+import threading
+import queue
 from .types import EventType, PulseEvent
+from .segments import (seal_segment, list_segments, index_path, iter_log_from, open_segment,
+                       pending_compressions, SegmentCompressor)
+from .journal_index import SegmentIndex, index_meta, index_line
+from .merkle import MerkleLog, GENESIS_HASH, chain_entry
+
+# Durability policies for the journal writer
+DURABILITY_FLUSH = "flush"                    # write + flush every event (visible immediately)
+DURABILITY_FSYNC_BATCH = "fsync_batch"        # group commit: one write + fsync per batch
+DURABILITY_FSYNC_INTERVAL = "fsync_interval"  # flush every event, fsync at most once per interval
+DURABILITY_MODES = (DURABILITY_FLUSH, DURABILITY_FSYNC_BATCH, DURABILITY_FSYNC_INTERVAL)
+
+class JournalWriter:
+    """
+    Long-lived append handle for a JSONL log.
+    Keeps the file open and groups appends into commits according to the
+    durability policy. Lines are always written in append order.
+    Optionally maintains a sidecar offset index and seals the live file into
+    an immutable (optionally compressed) segment once it reaches
+    `segment_max_bytes` or has been open for `segment_max_age` seconds.
+    Attached sidecars (flush()/sync(), e.g. the Merkle node file) are made
+    visible and durable at the same points as the log itself.
+    """
+    def __init__(self, path: str, durability: str = DURABILITY_FLUSH, batch_size: int = 64, fsync_interval: float = 1.0,
+                 index_path: str = None, segment_max_bytes: int = None, segment_max_age: float = None,
+                 compression: str = None):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+        self.path = path
+        self.durability = durability
+        self.batch_size = max(1, batch_size)
+        self.fsync_interval = fsync_interval
+        self.index_path = index_path
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age = segment_max_age
+        self.compression = compression
+        # Live segment summary, recorded in the manifest when sealed
+        self.segment_info = {"count": 0, "first_ts": None, "last_ts": None}
+        # Logical offset of the live segment (sum of sealed segment lengths)
+        self.base_offset = 0
+
+        self._lock = threading.Lock()
+        # Set by attach_queue(): writes are then framed here and applied by the LogQueue thread
+        self.queue = None
+        self.reserved = None
+        self._submit_lock = threading.Lock()
+        self._pending = []
+        self._pending_index = []
+        self._dirty = False
+        self._last_sync = time.monotonic()
+        self.sidecars = []
+        # Sealed segments are archived off the append path
+        self._compressor = None
+        if compression:
+            self._compressor = SegmentCompressor(path)
+            for seq in pending_compressions(path):
+                self._compressor.submit(seq)
+        self._open()
+        atexit.register(self.close)
+
+    def _open(self):
+        self._fh = open(self.path, 'ab')
+        self._ifh = open(self.index_path, 'ab') if self.index_path else None
+        self.position = self._fh.tell()
+        self.opened_at = time.monotonic()
+
+    def write(self, line: str, meta: list = None) -> int:
+        """Appends one line; returns its logical start offset in the log."""
+        return self.write_many([(line, meta)])[0]
+
+    def write_many(self, items: list) -> list:
+        """
+        Appends (line, meta) pairs with a single write (and index write).
+        Returns their logical start offsets. A due rotation happens after the
+        whole batch, so a batch never spans two segments.
+        """
+        framed = [(line.encode('utf-8') + b'\n', meta) for line, meta in items]
+        if self.queue is None:
+            return self._append_framed(framed)
+        # Offsets are reserved in submission order, which is also the write order
+        with self._submit_lock:
+            starts = []
+            for data, _ in framed:
+                starts.append(self.reserved)
+                self.reserved += len(data)
+            self.queue.submit(self, framed)
+            return starts
+
+    def attach_sidecar(self, sidecar):
+        """Flushes/fsyncs `sidecar` along with every commit and sync of the log."""
+        with self._lock:
+            self.sidecars.append(sidecar)
+
+    def attach_queue(self, log_queue: "LogQueue"):
+        """Routes subsequent writes through a shared background writer thread."""
+        with self._submit_lock:
+            self.reserved = self.end_offset
+            self.queue = log_queue
+
+    def _append_framed(self, framed: list) -> list:
+        with self._lock:
+            starts = []
+            chunks = []
+            index_chunks = []
+            info = self.segment_info
+            for data, meta in framed:
+                starts.append(self.base_offset + self.position)
+                if meta is not None:
+                    index_chunks.append(index_line(self.position, len(data), meta))
+                    info["count"] += 1
+                    if info["first_ts"] is None:
+                        info["first_ts"] = meta[0]
+                    info["last_ts"] = meta[0]
+                self.position += len(data)
+                chunks.append(data)
+
+            if self.durability == DURABILITY_FSYNC_BATCH:
+                self._pending.extend(chunks)
+                self._pending_index.extend(index_chunks)
+                if len(self._pending) >= self.batch_size:
+                    self._commit()
+            else:
+                self._fh.write(b''.join(chunks))
+                self._fh.flush()
+                if index_chunks and self._ifh:
+                    self._ifh.write(b''.join(index_chunks))
+                    self._ifh.flush()
+                for sidecar in self.sidecars:
+                    sidecar.flush()
+                if self.durability == DURABILITY_FSYNC_INTERVAL:
+                    self._dirty = True
+                    if time.monotonic() - self._last_sync >= self.fsync_interval:
+                        self._sync()
+
+            if self._rotation_due():
+                self._rotate()
+            return starts
+
+    @property
+    def end_offset(self) -> int:
+        if self.queue is not None:
+            return self.reserved
+        return self.base_offset + self.position
+
+    def _rotation_due(self) -> bool:
+        if self.segment_max_bytes and self.position >= self.segment_max_bytes:
+            return True
+        if self.segment_max_age and self.position and time.monotonic() - self.opened_at >= self.segment_max_age:
+            return True
+        return False
+
+    def flush(self):
+        """Commits any pending batch and makes it durable."""
+        if self.queue is not None:
+            self.queue.barrier()
+        with self._lock:
+            if self._fh.closed:
+                return
+            self._commit()
+            if self._dirty:
+                self._sync()
+
+    def close(self):
+        if self.queue is not None:
+            self.queue.barrier()
+        with self._lock:
+            if self._fh.closed:
+                return
+            self._commit()
+            if self._dirty:
+                self._sync()
+            self._close_handles()
+        if self._compressor is not None:
+            self._compressor.close()
+        atexit.unregister(self.close)
+
+    def _close_handles(self):
+        self._fh.close()
+        if self._ifh:
+            self._ifh.close()
+
+    def _commit(self):
+        # Group commit: a single write() and fsync() for the whole batch
+        if not self._pending:
+            return
+        self._fh.write(b''.join(self._pending))
+        self._pending.clear()
+        self._fh.flush()
+        if self._ifh and self._pending_index:
+            self._ifh.write(b''.join(self._pending_index))
+            self._ifh.flush()
+        self._pending_index.clear()
+        self._sync()
+
+    def _sync(self):
+        os.fsync(self._fh.fileno())
+        for sidecar in self.sidecars:
+            sidecar.sync()
+        self._dirty = False
+        self._last_sync = time.monotonic()
+
+    def _rotate(self):
+        # Sealed segments are immutable, so make the live one durable first
+        self._commit()
+        self._sync()
+        self._close_handles()
+        segment = seal_segment(self.path, self.segment_info, self.compression)
+        if self._compressor is not None:
+            self._compressor.submit(segment["seq"])
+        self.segment_info = {"count": 0, "first_ts": None, "last_ts": None}
+        self.base_offset += self.position
+        self._open()
+
+class LogQueue:
+    """
+    Single background writer thread shared by several JournalWriters.
+    Producers frame records and reserve offsets in order, then enqueue them;
+    the bounded queue provides backpressure (submit blocks while full).
+    A failed background write is re-raised to the next producer call.
+    """
+    _STOP = object()
+
+    def __init__(self, maxsize: int = 1024):
+        self._queue = queue.Queue(maxsize)
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="oear-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, writer: JournalWriter, framed: list):
+        self._raise_pending()
+        if not self._thread.is_alive():
+            writer._append_framed(framed) # closed: write inline
+            return
+        self._queue.put((writer, framed))
+
+    def barrier(self):
+        """Blocks until everything submitted so far has been written."""
+        if self._thread.is_alive() and threading.current_thread() is not self._thread:
+            done = threading.Event()
+            self._queue.put((None, done))
+            done.wait()
+        self._raise_pending()
+
+    def _raise_pending(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _run(self):
+        while True:
+            writer, item = self._queue.get()
+            if writer is None:
+                if item is self._STOP:
+                    return
+                item.set()
+                continue
+            try:
+                writer._append_framed(item)
+            except Exception as e:
+                self.error = e
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put((None, self._STOP))
+            self._thread.join()
+        atexit.unregister(self.close)
+        self._raise_pending()
 
 class Journal:
-    def __init__(self, journal_path: str):
+    def __init__(self, journal_path: str, durability: str = DURABILITY_FLUSH, batch_size: int = 64, fsync_interval: float = 1.0,
+                 segment_max_bytes: int = None, segment_max_age: float = None, compression: str = None):
         self.journal_path = journal_path
-        # Ensure file exists
-        if not os.path.exists(journal_path):
-            with open(journal_path, 'w', encoding='utf-8') as f:
-                pass # Create empty file
+        self._indexes = {} # segment seq -> SegmentIndex
+
+        # Bring the live index in line with the live segment before appending
+        live = self._recover_index()
+
+        # Ensure file exists; the writer keeps a persistent append handle
+        self.writer = JournalWriter(journal_path, durability, batch_size, fsync_interval,
+                                    index_path=index_path(journal_path), segment_max_bytes=segment_max_bytes,
+                                    segment_max_age=segment_max_age, compression=compression)
+        self.writer.base_offset = list_segments(journal_path)[-1]["base_offset"]
+        if len(live):
+            self.writer.segment_info = {"count": len(live), "first_ts": live.timestamps[0], "last_ts": live.timestamps[-1]}
+        # Logical offset of the most recently appended entry
+        self.last_append_offset = None
+        # Chain building and submission must happen in one order across threads
+        self._lock = threading.Lock()
+
+        # Hash chain + Merkle tree over every entry
+        self.merkle = MerkleLog(journal_path + ".mmr")
+        self.seq, self.last_hash = self._recover_chain()
+        self.writer.attach_sidecar(self.merkle)
 
     def append(self, event_type: EventType, payload: dict, source: str = "oear_kernel"):
         """
         Appends an event to the immutable journal.
         Format: JSONL (one JSON object per line)
         """
-        timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
-        
-        entry = {
-            "timestamp": timestamp,
+        return self.append_many([(event_type, payload)], source)[0][0]
+
+    def append_many(self, events: list, source: str = "oear_kernel") -> list:
+        """
+        Appends (event_type, payload) pairs as consecutive chained entries in
+        one bulk write. Timestamps are taken as each entry is built.
+        Returns [(entry, start_offset, end_offset)].
+        """
+        with self._lock:
+            return self._append_many(events, source)
+
+    def _append_many(self, events: list, source: str) -> list:
+        return self._chain([{
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
             "event_type": event_type.value,
             "source": source,
             "payload": payload
-        }
-        
-        # Write to disk immediately (flushing)
-        with open(self.journal_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry) + '\n')
-            f.flush()
-            
+        } for event_type, payload in events])
+
+    def append_records(self, records: list) -> list:
+        """
+        Re-chains entries read from another journal (e.g. a shard) onto this
+        one. Timestamp, event type, source and payload are kept; seq, prev_hash
+        and hash are reassigned. Returns [(entry, start_offset, end_offset)].
+        """
+        with self._lock:
+            return self._chain([{
+                "timestamp": r["timestamp"],
+                "event_type": r["event_type"],
+                "source": r["source"],
+                "payload": r["payload"]
+            } for r in records])
+
+    def _chain(self, bodies: list) -> list:
+        entries = []
+        lines = []
+        seq, last_hash = self.seq, self.last_hash
+        for body in bodies:
+            entry = dict(body, seq=seq, prev_hash=last_hash)
+            entry["hash"], line = chain_entry(entry)
+            entries.append(entry)
+            lines.append((line, index_meta(entry)))
+            seq, last_hash = seq + 1, entry["hash"]
+        if not entries:
+            return []
+
+        # Nodes go in first: the writer flushes/fsyncs the node file after
+        # each journal write, so it is never behind the journal on disk
+        for entry in entries:
+            self.merkle.append(entry["hash"])
+        try:
+            # Committed according to the writer's durability policy
+            starts = self.writer.write_many(lines)
+        except BaseException:
+            self.merkle.truncate(self.seq)
+            raise
+        self.seq, self.last_hash = seq, last_hash
+        self.last_append_offset = starts[-1]
+        ends = starts[1:] + [self.writer.end_offset]
+        return list(zip(entries, starts, ends))
+
+    def merkle_root(self) -> str:
+        return self.merkle.root()
+
+    def prove(self, seq: int) -> dict:
+        """O(log n) inclusion proof for the entry with the given seq."""
+        return self.merkle.prove(seq)
+
+    @property
+    def end_offset(self) -> int:
+        """Logical offset just past the last appended entry."""
+        return self.writer.end_offset
+
+    def flush(self):
+        self.writer.flush()
+        with self._lock:
+            self.merkle.flush()
+
+    def close(self):
+        self.writer.close()
+        self.merkle.close()
+
     def read_all(self):
         """
         Replays the journal from disk.
         """
-        events = []
-        if not os.path.exists(self.journal_path):
-            return []
-            
-        with open(self.journal_path, 'r', encoding='utf-8') as f:
+        return list(self.iter_entries())
+
+    def iter_entries(self):
+        """Streams every entry across sealed segments and the live one."""
+        # Pending group commits must be visible to the replay
+        self.writer.flush()
+        for seg in list_segments(self.journal_path):
+            if not seg["sealed"] and not os.path.exists(seg["path"]):
+                continue
+            with open_segment(seg) as f:
+                for line in f:
+                    if line.strip():
+                        try:
+                            yield json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+
+    def iter_from(self, offset: int = 0):
+        """
+        Streams (entry, start_offset, end_offset) from a logical offset onwards.
+        Offsets span sealed segments, so a saved offset survives rotation.
+        """
+        self.writer.flush()
+        for line, start, end in iter_log_from(self.journal_path, offset):
+            if line.strip():
+                try:
+                    yield json.loads(line), start, end
+                except json.JSONDecodeError:
+                    continue
+
+    def read_entry_at(self, offset: int):
+        """Returns (entry, end_offset) for the entry starting at a logical offset, or None."""
+        for entry, start, end in self.iter_from(offset):
+            if start == offset:
+                return entry, end
+            return None
+        return None
+
+    def query(self, since: str = None, until: str = None, event_type: str = None, phase: str = None,
+              case_id: str = None, run_id: str = None) -> list:
+        """
+        Indexed lookup: seeks directly to matching records instead of replaying.
+        `since`/`until` bound the ISO timestamp range (inclusive).
+        """
+        self.writer.flush()
+        results = []
+        for seg in list_segments(self.journal_path):
+            if seg["sealed"]:
+                # Prune whole segments by their recorded time range
+                if since and seg.get("last_ts") and seg["last_ts"] < since:
+                    continue
+                if until and seg.get("first_ts") and seg["first_ts"] > until:
+                    continue
+
+            index = self._segment_index(seg)
+            hits = index.lookup(since, until, event_type=event_type, phase=phase, case_id=case_id, run_id=run_id)
+            if not hits:
+                continue
+            with open_segment(seg) as f:
+                for n in hits:
+                    f.seek(index.offsets[n])
+                    results.append(json.loads(f.read(index.lengths[n])))
+        return results
+
+    def _segment_index(self, seg: dict) -> SegmentIndex:
+        index = self._indexes.get(seg["seq"])
+        if index is None:
+            index = SegmentIndex(seg["index_path"])
+            self._indexes[seg["seq"]] = index
+        elif index.index_path != seg["index_path"]:
+            # The live segment was sealed since we last read it; contents are unchanged
+            index.index_path = seg["index_path"]
+            index.refresh()
+            return index
+        if not seg["sealed"] or not len(index):
+            index.refresh()
+        return index
+
+    def _recover_chain(self):
+        """Resumes seq/prev_hash from the last entry and re-syncs the Merkle node file."""
+        seq, last_hash = 0, GENESIS_HASH
+        for seg in reversed(list_segments(self.journal_path)):
+            line = _last_line(seg)
+            if line is None:
+                continue
+            try:
+                last = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if "hash" in last:
+                seq, last_hash = last["seq"] + 1, last["hash"]
+            break
+
+        if self.merkle.leaves > seq:
+            # Nodes written for entries that never reached the journal
+            self.merkle.truncate(seq)
+        elif self.merkle.leaves < seq:
+            for entry in self.iter_entries():
+                if "hash" in entry and entry["seq"] >= self.merkle.leaves:
+                    self.merkle.append(entry["hash"])
+        return seq, last_hash
+
+    def _recover_index(self) -> SegmentIndex:
+        live_path = self.journal_path
+        live_index_path = index_path(live_path)
+        if not os.path.exists(live_path):
+            if os.path.exists(live_index_path):
+                os.remove(live_index_path)
+            return SegmentIndex(live_index_path)
+
+        index = SegmentIndex(live_index_path)
+        index.refresh()
+        size = os.path.getsize(live_path)
+        if index.end_offset > size:
+            # Index describes a different (truncated) file: rebuild it
+            os.remove(live_index_path)
+            index = SegmentIndex(live_index_path)
+        if index.end_offset < size:
+            self._reindex_tail(live_path, index)
+        return index
+
+    def _reindex_tail(self, path: str, index: SegmentIndex):
+        offset = index.end_offset
+        with open(path, 'rb') as f, open(index.index_path, 'ab') as out:
+            f.seek(offset)
             for line in f:
+                if not line.endswith(b'\n'):
+                    break # torn tail, left for the writer to append after
                 if line.strip():
                     try:
-                        events.append(json.loads(line))
+                        meta = index_meta(json.loads(line))
+                        out.write(index_line(offset, len(line), meta))
+                        index.add([offset, len(line)] + meta)
                     except json.JSONDecodeError:
-                        continue
-        return events
+                        pass
+                offset += len(line)
+        index.read_pos = os.path.getsize(index.index_path)
+
+def _last_line(seg: dict, chunk: int = 65536):
+    """Returns the last complete non-empty line of a segment without reading it all."""
+    if not seg["sealed"] and not os.path.exists(seg["path"]):
+        return None
+    size = seg["length"] if seg["sealed"] else os.path.getsize(seg["path"])
+    with open_segment(seg) as f:
+        window = chunk
+        while True:
+            start = max(0, size - window)
+            f.seek(start)
+            data = f.read(size - start)
+            end = data.rfind(b'\n')
+            if end >= 0:
+                lines = [l for l in data[:end].split(b'\n') if l.strip()]
+                if len(lines) > 1 or (lines and start == 0):
+                    return lines[-1]
+            if start == 0:
+                return None
+            window *= 2
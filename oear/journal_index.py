@@ -0,0 +1,103 @@
+import json
+import os
+import bisect
+from json.encoder import encode_basestring_ascii
+
+# Sidecar index record: [offset, length, timestamp, event_type, phase, case_id, run_id]
+INDEX_KEYS = ("event_type", "phase", "case_id", "run_id")
+
+def index_meta(entry: dict) -> list:
+    """Extracts the indexed fields of a journal entry (without offset/length)."""
+    payload = entry.get("payload", {}) if "payload" in entry else entry
+    if not isinstance(payload, dict):
+        payload = {}
+    return [
+        entry.get("timestamp"),
+        entry.get("event_type"),
+        payload.get("phase"),
+        payload.get("case_id"),
+        payload.get("run_id")
+    ]
+
+def index_line(offset: int, length: int, meta: list) -> bytes:
+    """One sidecar index record as a JSON line; the (string) fields are escaped directly."""
+    fields = ",".join([encode_basestring_ascii(v) if v.__class__ is str else json.dumps(v) for v in meta])
+    return f"[{offset},{length},{fields}]\n".encode('ascii')
+
+class SegmentIndex:
+    """
+    In-memory view of one segment's sidecar index.
+    Sealed segments are loaded once; the live one is refreshed incrementally.
+    """
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self.offsets = []
+        self.lengths = []
+        self.timestamps = []
+        self.keys = {key: {} for key in INDEX_KEYS}
+        self.read_pos = 0
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @property
+    def end_offset(self) -> int:
+        if not self.offsets:
+            return 0
+        return self.offsets[-1] + self.lengths[-1]
+
+    def refresh(self):
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'rb') as f:
+            f.seek(self.read_pos)
+            data = f.read()
+        # Only consume complete lines; a torn tail is picked up next refresh
+        end = data.rfind(b'\n')
+        if end < 0:
+            return
+        for line in data[:end].split(b'\n'):
+            if line.strip():
+                self.add(json.loads(line))
+        self.read_pos += end + 1
+
+    def add(self, record: list):
+        n = len(self.offsets)
+        offset, length, ts, event_type, phase, case_id, run_id = record
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        self.timestamps.append(ts or "")
+        for key, value in zip(INDEX_KEYS, (event_type, phase, case_id, run_id)):
+            if value is not None:
+                self.keys[key].setdefault(value, []).append(n)
+
+    def lookup(self, since=None, until=None, **filters) -> list:
+        """Returns the record numbers matching every filter, in log order."""
+        # Journal timestamps are monotonic (certified invariant) so ranges bisect
+        lo = bisect.bisect_left(self.timestamps, since) if since else 0
+        hi = bisect.bisect_right(self.timestamps, until) if until else len(self.timestamps)
+        if lo >= hi:
+            return []
+
+        candidates = None
+        for key, value in filters.items():
+            if value is None:
+                continue
+            if key not in self.keys:
+                raise ValueError(f"Field not indexed: {key}")
+            hits = self.keys[key].get(value, [])
+            candidates = hits if candidates is None else _intersect(candidates, hits)
+            if not candidates:
+                return []
+
+        if candidates is None:
+            return list(range(lo, hi))
+        start = bisect.bisect_left(candidates, lo)
+        stop = bisect.bisect_left(candidates, hi)
+        return candidates[start:stop]
+
+def _intersect(a: list, b: list) -> list:
+    if len(a) > len(b):
+        a, b = b, a
+    members = set(b)
+    return [n for n in a if n in members]
@@ -0,0 +1,119 @@
+import functools
+
+# Policy term matching. The term lists used by RiskClassifier, SemanticScorer
+# and OutputValidator live in the policy kernel ("term_rules": rule name ->
+# terms) and are compiled into one Aho–Corasick automaton, so a text is scanned
+# once, in a single pass whose cost does not grow with the number of terms.
+# A scan yields the names of the rules with at least one term occurring in the
+# (lowercased) text, i.e. the same substring semantics as `term in text`.
+# stream() scans text that arrives in chunks, carrying the automaton state
+# across chunk boundaries.
+
+RISK_GATE_C = "risk_gate_c"
+RISK_GATE_B = "risk_gate_b"
+CONTRADICTION_HEDGE = "contradiction_hedge"
+CONTRADICTION_ASSERTION = "contradiction_assertion"
+CONTRADICTION_NEGATION = "contradiction_negation"
+AFFECT_URGENT = "affect_urgent"
+OUTPUT_HARD_FAIL = "output_hard_fail"
+OUTPUT_SOFT_FAIL = "output_soft_fail"
+
+# Used when the loaded kernel predates "term_rules" (and by components built standalone)
+DEFAULT_TERM_RULES = {
+    RISK_GATE_C: ["hack", "bypass"],
+    RISK_GATE_B: ["lawsuit"],
+    CONTRADICTION_HEDGE: ["maybe"],
+    CONTRADICTION_ASSERTION: ["definitely"],
+    CONTRADICTION_NEGATION: ["false"],
+    AFFECT_URGENT: ["urgent"],
+    OUTPUT_HARD_FAIL: ["skynet"],
+    OUTPUT_SOFT_FAIL: ["hallucination_suspected"]
+}
+
+NO_MATCHES = frozenset()
+
+class TermMatcher:
+    """Compiled term rules; scan(text) returns the frozenset of matching rule names."""
+    def __init__(self, rules: dict):
+        self.rules = {name: tuple(term.lower() for term in terms) for name, terms in rules.items()}
+        # Trie: goto[state] maps a character to the child state; out[state] holds rule names
+        goto = [{}]
+        out = [set()]
+        for name, terms in self.rules.items():
+            for term in terms:
+                if not term:
+                    raise ValueError(f"Empty term in rule {name!r}")
+                state = 0
+                for ch in term:
+                    child = goto[state].get(ch)
+                    if child is None:
+                        child = goto[state][ch] = len(goto)
+                        goto.append({})
+                        out.append(set())
+                    state = child
+                out[state].add(name)
+
+        # Failure links, breadth first; outputs inherit those of their failure state
+        fail = [0] * len(goto)
+        order = []
+        level = list(goto[0].values())
+        while level:
+            next_level = []
+            for state in level:
+                order.append(state)
+                for ch, child in goto[state].items():
+                    f = fail[state]
+                    while f and ch not in goto[f]:
+                        f = fail[f]
+                    target = goto[f].get(ch, 0)
+                    fail[child] = target if target != child else 0
+                    out[child] |= out[fail[child]]
+                    next_level.append(child)
+            level = next_level
+
+        # Resolve failure transitions ahead of time so a scan does one or two
+        # lookups per character; falling back to the root is left to scan time
+        # to keep the table small
+        self._delta = [dict(g) for g in goto]
+        for state in order:
+            if fail[state]:
+                for ch, target in self._delta[fail[state]].items():
+                    self._delta[state].setdefault(ch, target)
+        self._out = [frozenset(names) if names else None for names in out]
+        self.states = len(goto)
+
+    def scan(self, text: str) -> frozenset:
+        return self._advance(0, text.lower(), NO_MATCHES)[1]
+
+    def scan_normalized(self, text: str) -> frozenset:
+        """scan() for text that is already lowercased."""
+        return self._advance(0, text, NO_MATCHES)[1]
+
+    def stream(self) -> "MatchStream":
+        return MatchStream(self)
+
+    def _advance(self, state: int, text: str, hits: frozenset) -> tuple:
+        delta, out = self._delta, self._out
+        root = delta[0]
+        for ch in text:
+            d = delta[state]
+            state = d[ch] if ch in d else root.get(ch, 0)
+            if out[state] is not None:
+                hits = hits | out[state]
+        return state, hits
+
+class MatchStream:
+    """Incremental scan: feed() chunks in order; matches accumulate across chunks."""
+    def __init__(self, matcher: TermMatcher):
+        self.matcher = matcher
+        self.state = 0
+        self.matches = NO_MATCHES
+
+    def feed(self, chunk: str) -> frozenset:
+        """Matches so far, this chunk included."""
+        self.state, self.matches = self.matcher._advance(self.state, chunk.lower(), self.matches)
+        return self.matches
+
+@functools.lru_cache(maxsize=1)
+def default_matcher() -> TermMatcher:
+    return TermMatcher(DEFAULT_TERM_RULES)
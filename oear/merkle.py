@@ -0,0 +1,287 @@
+import json
+import os
+import atexit
+import hashlib
+from .segments import iter_log_from
+
+# Hash chaining + Merkle Mountain Range (MMR) over journal entries.
+# Every entry carries seq/prev_hash/hash; each entry hash is a leaf of an
+# append-only MMR whose nodes are stored in post-order in <journal>.mmr
+# (32 bytes per node). Appending is O(log n), inclusion proofs are O(log n)
+# and the root is the bagged hash of the O(log n) peaks.
+
+GENESIS_HASH = "0" * 64
+NODE_SIZE = 32
+
+def _canonical(body: dict) -> str:
+    return json.dumps(body, sort_keys=True, separators=(',', ':'))
+
+def entry_hash(entry: dict) -> str:
+    """SHA-256 over the canonical form of an entry, excluding its own hash."""
+    body = {k: v for k, v in entry.items() if k != "hash"}
+    return hashlib.sha256(_canonical(body).encode('utf-8')).hexdigest()
+
+def chain_entry(body: dict) -> tuple:
+    """
+    (hash, line) for an entry without its hash: the line is the canonical form
+    that was hashed with the hash appended as its last key, so an entry is
+    serialized once. entry_hash() of the parsed line gives the same hash.
+    """
+    canonical = _canonical(body)
+    digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    return digest, f'{canonical[:-1]},"hash":"{digest}"}}'
+
+def leaf_hash(entry_hash_hex: str) -> bytes:
+    # Domain separation between leaves (0x00) and interior nodes (0x01)
+    return hashlib.sha256(b'\x00' + bytes.fromhex(entry_hash_hex)).digest()
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b'\x01' + left + right).digest()
+
+def bag_peaks(peaks: list) -> str:
+    """Folds peak hashes right-to-left into a single root."""
+    if not peaks:
+        return GENESIS_HASH
+    root = peaks[-1]
+    for peak in reversed(peaks[:-1]):
+        root = node_hash(peak, root)
+    return root.hex()
+
+def mmr_size(leaves: int) -> int:
+    """Number of nodes in an MMR holding `leaves` leaves."""
+    return 2 * leaves - bin(leaves).count("1")
+
+def leaf_position(index: int) -> int:
+    return 2 * index - bin(index).count("1")
+
+def node_height(pos: int) -> int:
+    pos += 1
+    while pos & (pos + 1):
+        pos = pos - (1 << (pos.bit_length() - 1)) + 1
+    return pos.bit_length() - 1
+
+def peak_positions(size: int) -> list:
+    """Positions of the peaks of an MMR with `size` nodes, left to right."""
+    peaks = []
+    offset = 0
+    remaining = size
+    while remaining > 0:
+        height = (remaining + 1).bit_length() - 1
+        tree = (1 << height) - 1
+        peaks.append(offset + tree - 1)
+        offset += tree
+        remaining -= tree
+    return peaks
+
+def extend_peaks(peaks: list, leaves: int, entry_hash_hex: str):
+    """
+    Appends a leaf to an in-memory peak list (list of (height, hash)).
+    Used to recompute a root from a certified anchor plus a journal tail.
+    """
+    node = (0, leaf_hash(entry_hash_hex))
+    while peaks and peaks[-1][0] == node[0]:
+        height, left = peaks.pop()
+        node = (height + 1, node_hash(left, node[1]))
+    peaks.append(node)
+    return leaves + 1
+
+def verify_inclusion(entry_hash_hex: str, proof: dict, root: str) -> bool:
+    """Checks an inclusion proof produced by MerkleLog.prove() against a root."""
+    current = leaf_hash(entry_hash_hex)
+    for side, sibling in proof["path"]:
+        sibling = bytes.fromhex(sibling)
+        current = node_hash(sibling, current) if side == "L" else node_hash(current, sibling)
+    peaks = [bytes.fromhex(p) for p in proof["peaks"]]
+    if peaks[proof["peak_index"]] != current:
+        return False
+    return bag_peaks(peaks) == root
+
+class MerkleLog:
+    """Append-only MMR persisted as a flat node file"""
+    def __init__(self, path: str):
+        self.path = path
+        self.leaves = 0
+        self.size = 0
+        self.peaks = [] # list of (height, hash) left to right
+        self._fh = None
+        self._recover()
+        self._fh = open(path, 'ab')
+        atexit.register(self.close)
+
+    def _recover(self):
+        if not os.path.exists(self.path):
+            return
+        nodes = os.path.getsize(self.path) // NODE_SIZE
+        # Largest complete MMR contained in the file (drops torn appends)
+        leaves = 0
+        while mmr_size(leaves + 1) <= nodes:
+            leaves += 1
+        self.truncate(leaves)
+
+    def truncate(self, leaves: int):
+        """Drops every node past the MMR of `leaves` leaves."""
+        if self._fh:
+            self._fh.flush()
+        size = mmr_size(leaves)
+        if os.path.exists(self.path) and os.path.getsize(self.path) != size * NODE_SIZE:
+            with open(self.path, 'r+b') as f:
+                f.truncate(size * NODE_SIZE)
+        self.leaves = leaves
+        self.size = size
+        self.peaks = [(node_height(pos), self.read_node(pos)) for pos in peak_positions(size)]
+
+    def append(self, entry_hash_hex: str):
+        node = (0, leaf_hash(entry_hash_hex))
+        written = [node[1]]
+        while self.peaks and self.peaks[-1][0] == node[0]:
+            height, left = self.peaks.pop()
+            node = (height + 1, node_hash(left, node[1]))
+            written.append(node[1])
+        self.peaks.append(node)
+        self._fh.write(b''.join(written))
+        self.size += len(written)
+        self.leaves += 1
+
+    def root(self) -> str:
+        return bag_peaks([h for _, h in self.peaks])
+
+    def flush(self):
+        if not self._fh.closed:
+            self._fh.flush()
+
+    def sync(self):
+        if not self._fh.closed:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def close(self):
+        if not self._fh.closed:
+            self._fh.close()
+        atexit.unregister(self.close)
+
+    def read_node(self, pos: int) -> bytes:
+        with open(self.path, 'rb') as f:
+            f.seek(pos * NODE_SIZE)
+            return f.read(NODE_SIZE)
+
+    def prove(self, index: int) -> dict:
+        """O(log n) inclusion proof for the leaf at `index`."""
+        if index >= self.leaves:
+            raise IndexError(f"Leaf {index} not in MMR of {self.leaves} leaves")
+        self.flush()
+        peaks = peak_positions(self.size)
+        pos = leaf_position(index)
+        path = []
+        with open(self.path, 'rb') as f:
+            def node(p):
+                f.seek(p * NODE_SIZE)
+                return f.read(NODE_SIZE).hex()
+            while pos not in peaks:
+                height = node_height(pos)
+                if node_height(pos + 1) > height:
+                    # Right child: sibling on the left, parent right after us
+                    path.append(("L", node(pos - (1 << (height + 1)) + 1)))
+                    pos += 1
+                else:
+                    sibling = pos + (1 << (height + 1)) - 1
+                    path.append(("R", node(sibling)))
+                    pos = sibling + 1
+            return {
+                "leaf_index": index,
+                "path": path,
+                "peaks": [node(p) for p in peaks],
+                "peak_index": peaks.index(pos)
+            }
+
+def read_peaks(path: str, leaves: int) -> list:
+    """Reads the peak hashes of the first `leaves` leaves from a node file."""
+    peaks = []
+    with open(path, 'rb') as f:
+        for pos in peak_positions(mmr_size(leaves)):
+            f.seek(pos * NODE_SIZE)
+            peaks.append(f.read(NODE_SIZE))
+    return peaks
+
+def has_chain(journal_path: str) -> bool:
+    """Whether any journal entry carries a hash (legacy journals have none)."""
+    for line, _, _ in iter_log_from(journal_path):
+        if line.strip():
+            try:
+                if "hash" in json.loads(line):
+                    return True
+            except json.JSONDecodeError:
+                continue
+    return False
+
+def verify_chain(journal_path: str, full: bool = False):
+    """
+    Certifies the journal hash chain and MMR.
+    Resumes from the last certified anchor (<journal>.anchor.json): checks the
+    anchored peaks are still in the node file, verifies only the new tail
+    entries and compares the recomputed root against the node file root.
+    Returns (ok, message, verified_entries).
+    """
+    mmr_path = journal_path + ".mmr"
+    anchor_path = journal_path + ".anchor.json"
+    if not os.path.exists(mmr_path):
+        if has_chain(journal_path):
+            return False, "chained entries but the Merkle node file is missing", 0
+        return True, "no hash chain present", 0
+
+    anchor = None
+    if not full and os.path.exists(anchor_path):
+        with open(anchor_path, 'r', encoding='utf-8') as f:
+            anchor = json.load(f)
+
+    if anchor:
+        # Anchored peaks must survive untouched in the append-only node file
+        if read_peaks(mmr_path, anchor["count"]) != [bytes.fromhex(p) for p in anchor["peaks"]]:
+            return False, "anchored Merkle peaks were rewritten", 0
+        count, offset, last_hash = anchor["count"], anchor["offset"], anchor["last_hash"]
+        # ...and the anchored entry must still end the certified prefix
+        anchored = next(iter_log_from(journal_path, anchor["entry_offset"]), None) if count else None
+        if count:
+            last = json.loads(anchored[0]) if anchored and anchored[2] == offset else {}
+            if last.get("hash") != last_hash or entry_hash(last) != last_hash:
+                return False, "certified journal prefix was modified", 0
+        peaks = [(node_height(pos), bytes.fromhex(p)) for pos, p in zip(peak_positions(mmr_size(count)), anchor["peaks"])]
+    else:
+        count, offset, last_hash, peaks = 0, 0, GENESIS_HASH, []
+
+    entry_offset = anchor["entry_offset"] if anchor else None
+    verified = 0
+    for line, start, end in iter_log_from(journal_path, offset):
+        if not line.strip():
+            offset = end
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            return False, f"unparseable entry at offset {start}", verified
+        if "hash" not in entry:
+            if count:
+                return False, f"unchained entry at offset {start}", verified
+            offset = end # legacy prefix written before chaining
+            continue
+        if entry.get("seq") != count or entry.get("prev_hash") != last_hash:
+            return False, f"chain break at seq {count}", verified
+        if entry_hash(entry) != entry["hash"]:
+            return False, f"entry hash mismatch at seq {count}", verified
+        count = extend_peaks(peaks, count, entry["hash"])
+        last_hash = entry["hash"]
+        entry_offset, offset = start, end
+        verified += 1
+
+    root = bag_peaks([h for _, h in peaks])
+    if os.path.getsize(mmr_path) // NODE_SIZE < mmr_size(count):
+        return False, "Merkle node file is behind the journal", verified
+    if bag_peaks(read_peaks(mmr_path, count)) != root:
+        return False, "Merkle root mismatch", verified
+
+    anchor = {"count": count, "offset": offset, "entry_offset": entry_offset, "last_hash": last_hash, "root": root,
+              "peaks": [h.hex() for _, h in peaks]}
+    tmp_path = anchor_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(anchor, f, indent=2)
+    os.replace(tmp_path, anchor_path)
+    return True, f"root {root[:16]}... (+{verified} entries)", verified
@@ -0,0 +1,157 @@
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# In-process metrics registry (counters, gauges, fixed-bucket histograms)
+# with a Prometheus text-format exposition. Hot-path updates are a dict
+# lookup plus an add under a per-metric lock; label values are passed as a
+# tuple matching labelnames.
+
+# Latency buckets in seconds: 1us .. 10s
+DEFAULT_BUCKETS = (0.000001, 0.000005, 0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005,
+                   0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names, values, extra=None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic count; by Prometheus convention names end in _total"""
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount=1):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def get(self, labels: tuple = ()):
+        return self.values.get(labels, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self.values.items())
+        for labels, value in items:
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, labels: tuple = ()):
+        with self._lock:
+            self.values[labels] = value
+
+    def dec(self, labels: tuple = (), amount=1):
+        self.inc(labels, -amount)
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: tuple = ()):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, labels: tuple = ()) -> int:
+        series = self.series.get(labels)
+        return series[2] if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((labels, (list(counts), total, count)) for labels, (counts, total, count) in self.series.items())
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                yield self.name + "_bucket", _format_labels(self.labelnames, labels, ("le", _format_value(bound))), cumulative
+            yield self.name + "_sum", _format_labels(self.labelnames, labels), total
+            yield self.name + "_count", _format_labels(self.labelnames, labels), count
+
+class MetricsRegistry:
+    """Named metric families; get-or-create so call sites can share families."""
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, labelnames, **kwargs):
+        with self._lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, help_text, labelnames, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: tuple = ()) -> Counter:
+        return self._get(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: tuple = ()) -> Gauge:
+        return self._get(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            metrics = sorted(self.metrics.items())
+        for name, metric in metrics:
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample, labels, value in metric.samples():
+                lines.append(f"{sample}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+def serve_metrics(registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464):
+    """Serves GET /metrics from a daemon thread; returns the server (call shutdown() to stop)."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="oear-metrics-http").start()
+    return server
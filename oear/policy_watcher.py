@@ -0,0 +1,86 @@
+import os
+import threading
+
+from .canonical import PolicyKernel
+from .tracer import TRACE_LIFECYCLE
+
+# Policy hot reload. PolicyWatcher polls the kernel and its .sha256 with
+# os.stat (mtime, size, inode) from a daemon thread. When either changes it
+# verifies, parses and compiles the new kernel on that thread, off the request
+# path, and hands (kernel, CompiledPolicy) to `on_reload`. A kernel that fails
+# verification (e.g. the JSON was replaced before its signature) is reported
+# to `on_error` and the active policy stays in force; it is retried once the
+# files change again.
+
+def file_signature(path: str):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+class PolicyWatcher:
+    def __init__(self, config_path: str, hash_path: str, on_reload, policy_hash: str = None,
+                 interval: float = 1.0, on_error=None, tracer=None):
+        self.config_path = config_path
+        self.hash_path = hash_path
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self.policy_hash = policy_hash # hash of the policy in force
+        self.interval = interval
+        self.tracer = tracer
+        self.reloads = 0
+        self.last_error = None
+        # Unknown until the first poll, so a change made just before start() is not missed
+        self._signature = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stat(self) -> tuple:
+        return file_signature(self.config_path), file_signature(self.hash_path)
+
+    def poll(self) -> bool:
+        """One check; returns True if a new policy was handed to on_reload."""
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        kernel = PolicyKernel(self.config_path, self.hash_path, tracer=self.tracer)
+        try:
+            kernel.load()
+            compiled = kernel.compile()
+        except Exception as e:
+            self.last_error = e
+            if self.on_error is not None:
+                self.on_error(e)
+            return False
+        self.last_error = None
+        if compiled.policy_hash == self.policy_hash:
+            # Touched or rewritten with identical content
+            return False
+        self.policy_hash = compiled.policy_hash
+        self.reloads += 1
+        self.on_reload(kernel, compiled)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                # on_reload/on_error failures must not kill the watcher
+                self.last_error = e
+                if self.tracer is not None:
+                    self.tracer.log(TRACE_LIFECYCLE, f"[OEAR] Policy watcher error: {e}")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name="oear-policy-watcher")
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -1,8 +1,21 @@
-from .types import EventType, RiskLevel, Mode, RiskResult, RouteResult
+from .types import EventType, RiskLevel, Mode, RiskResult, RouteResult, RotationPolicy
+from .journal import JournalWriter
+from .tracer import TRACE_RUNS
+from .matcher import (
+    TermMatcher, MatchStream, default_matcher, RISK_GATE_C, RISK_GATE_B, CONTRADICTION_HEDGE, CONTRADICTION_ASSERTION,
+    CONTRADICTION_NEGATION, AFFECT_URGENT, OUTPUT_HARD_FAIL, OUTPUT_SOFT_FAIL
+)
+from .analysis import AnalyzedText
 import hashlib
 import random
 import json
+import os
+import copy
 import datetime
+import functools
+import threading
+from array import array
+from collections import OrderedDict
 
 class PulseKernel:
     """PS0: Emits health/heartbeat events"""
@@ -22,37 +35,225 @@ class IntegritySentinel:
         # Mock logic: in real system would re-hashing file
         return True
 
+# Used when the loaded kernel predates "semantic_weights"
+DEFAULT_SEMANTIC_WEIGHTS = {
+    "contradiction_baseline": 0.0,
+    "contradiction_hedged_assertion": 0.6, # hedge and assertion terms together
+    "contradiction_negation": 0.9,
+    "affect_baseline": 0.1,
+    "affect_urgent": 0.8
+}
+
+# Term-rule features the PS2 scores depend on. A text's features are packed
+# into one feature code (bit i set if SCORE_FEATURES[i] matched), so weighting
+# a batch is a table lookup per code over the packed feature column.
+SCORE_FEATURES = (CONTRADICTION_HEDGE, CONTRADICTION_ASSERTION, CONTRADICTION_NEGATION, AFFECT_URGENT)
+
+def feature_code(matches: frozenset) -> int:
+    code = 0
+    for bit, name in enumerate(SCORE_FEATURES):
+        if name in matches:
+            code |= 1 << bit
+    return code
+
+@functools.lru_cache(maxsize=32)
+def score_table(weight_items: tuple) -> tuple:
+    """(contradiction, affect) tuples indexed by feature code, for sorted weight items."""
+    weights = dict(weight_items)
+    scores = [SemanticScorer._weigh(frozenset(name for bit, name in enumerate(SCORE_FEATURES) if code >> bit & 1), weights)
+              for code in range(1 << len(SCORE_FEATURES))]
+    return tuple(c for c, _ in scores), tuple(a for _, a in scores)
+
 class SemanticScorer:
-    """PS2: Analyzes input/output for contradiction and affect"""
-    def score(self, text: str):
-        text = text.lower()
-        contradiction = 0.0
-        if "maybe" in text and "definitely" in text:
-            contradiction = 0.6
-        elif "false" in text:
-            contradiction = 0.9
-            
-        affect = 0.1
-        if "urgent" in text:
-            affect = 0.8
-            
+    """
+    PS2: Analyzes input/output for contradiction and affect. A text's feature
+    code is memoized by SHA-256 of the text, least recently used evicted past
+    `cache_size`; configure() (a new policy) drops them. Weights only enter
+    through score_table(), so overriding them never rescans.
+    """
+    def __init__(self, matcher: TermMatcher = None, weights: dict = None, cache_size: int = 65536):
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict() # sha256 digest -> feature code
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.configure(matcher or default_matcher(), weights)
+
+    def configure(self, matcher: TermMatcher, weights: dict = None):
+        with self._lock:
+            self.matcher = matcher
+            self.weights = dict(DEFAULT_SEMANTIC_WEIGHTS, **(weights or {}))
+            self._weight_items = tuple(sorted(self.weights.items()))
+            self._cache.clear()
+            self._generation += 1
+
+    def score(self, text, matches: frozenset = None, weights=None):
+        """
+        `text` is a string or an AnalyzedText; `matches` is a TermMatcher.scan()
+        result for it, when the caller already has one. `weights` (e.g. a
+        CompiledPolicy's) override the configured ones.
+        """
+        if matches is None and isinstance(text, AnalyzedText):
+            matches = text.matches
+        code = feature_code(matches) if matches is not None else self._features_cached(text)
+        contradiction, affect = self._table(weights)
+        return contradiction[code], affect[code]
+
+    def score_batch(self, texts: list, matches: list = None, weights=None) -> tuple:
+        """
+        Scores many texts (e.g. vault intake or shadow replay jobs); returns
+        (contradiction, affect) as parallel array('d') columns. Without
+        precomputed `matches`, repeated texts are scanned once, within the
+        batch and across batches. Extracting features is per text; weighting
+        is one bulk lookup over the batch's feature column.
+        """
+        codes = bytearray(len(texts))
+        if matches is not None:
+            for i, found in enumerate(matches):
+                codes[i] = feature_code(found)
+        else:
+            seen = {}
+            for i, text in enumerate(texts):
+                code = seen.get(text)
+                if code is None:
+                    code = seen[text] = self._features_cached(text)
+                codes[i] = code
+        contradiction, affect = self._table(weights)
+        return array("d", map(contradiction.__getitem__, codes)), array("d", map(affect.__getitem__, codes))
+
+    def _table(self, weights) -> tuple:
+        return score_table(self._weight_items if weights is None else tuple(sorted(weights.items())))
+
+    def _features_cached(self, text: str) -> int:
+        key = hashlib.sha256(text.encode("utf-8")).digest()
+        with self._lock:
+            code = self._cache.get(key)
+            if code is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return code
+            self.misses += 1
+            generation, matcher = self._generation, self.matcher
+        code = feature_code(matcher.scan(text))
+        with self._lock:
+            # Not cached if the policy changed while scanning
+            if generation == self._generation:
+                self._cache[key] = code
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return code
+
+    @staticmethod
+    def _weigh(matches: frozenset, w: dict) -> tuple:
+        if CONTRADICTION_HEDGE in matches and CONTRADICTION_ASSERTION in matches:
+            contradiction = w["contradiction_hedged_assertion"]
+        elif CONTRADICTION_NEGATION in matches:
+            contradiction = w["contradiction_negation"]
+        else:
+            contradiction = w["contradiction_baseline"]
+
+        affect = w["affect_urgent"] if AFFECT_URGENT in matches else w["affect_baseline"]
         return contradiction, affect
 
 class RiskClassifier:
-    def classify(self, text: str, synthetic_data: dict = None) -> RiskResult:
+    def __init__(self, matcher: TermMatcher = None):
+        self.matcher = matcher or default_matcher()
+
+    def classify(self, text, synthetic_data: dict = None, matches: frozenset = None) -> RiskResult:
         if synthetic_data:
             return RiskResult(level=synthetic_data["expected_gate"], score=synthetic_data["drift"])
         
-        text = text.lower()
-        if "hack" in text or "bypass" in text:
+        if matches is None:
+            matches = term_matches(text, self.matcher)
+        if RISK_GATE_C in matches:
             return RiskResult(level="C", score=0.9) # Block gate
-        if "lawsuit" in text:
+        if RISK_GATE_B in matches:
             return RiskResult(level="B", score=0.6)
         return RiskResult(level="A", score=0.1)
 
+    def classify_batch(self, texts: list, synthetic_data: list = None, matches: list = None) -> list:
+        """Classifies a batch; repeated non-synthetic inputs are classified once."""
+        synthetic_data = synthetic_data or [None] * len(texts)
+        matches = matches or [None] * len(texts)
+        cache = {}
+        results = []
+        for text, synthetic, found in zip(texts, synthetic_data, matches):
+            if synthetic:
+                results.append(self.classify(text, synthetic_data=synthetic))
+                continue
+            risk = cache.get(text)
+            if risk is None:
+                risk = cache[text] = self.classify(text, matches=found)
+            results.append(risk)
+        return results
+
 class StateReducer:
+    """Event-sourced fold of journal entries into session state"""
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.state = self.initial_state()
+        self.offset = 0 # journal offset folded so far
+        self.entry_offset = None # start offset of the last folded entry
+        self.events_since_snapshot = 0
+
+    def restore(self, state: dict, offset: int, entry_offset: int = None):
+        self.state = state
+        self.offset = offset
+        self.entry_offset = entry_offset
+        self.events_since_snapshot = 0
+
+    def initial_state(self):
+        return {
+            "session_active": True,
+            "mode_stack": [],
+            "host": "hosted",
+            "event_count": 0,
+            "event_types": {},
+            "phases": {},
+            "failures": {},
+            "last_timestamp": None,
+            "last_run_id": None,
+            "last_case_id": None
+        }
+
+    def apply(self, entry: dict, start: int = None, end: int = None):
+        """Folds a single journal entry into the current state."""
+        self.fold(self.state, entry)
+        if end is not None:
+            self.offset = end
+            self.entry_offset = start
+        self.events_since_snapshot += 1
+        return self.state
+
+    def fold(self, state: dict, entry: dict):
+        p = entry.get("payload", {}) if "payload" in entry else entry
+        state["event_count"] += 1
+        event_type = entry.get("event_type")
+        state["event_types"][event_type] = state["event_types"].get(event_type, 0) + 1
+
+        phase = p.get("phase")
+        if phase:
+            state["phases"][phase] = state["phases"].get(phase, 0) + 1
+        if phase == "validator_fail":
+            severity = p.get("severity")
+            state["failures"][severity] = state["failures"].get(severity, 0) + 1
+
+        state["last_timestamp"] = entry.get("timestamp", state["last_timestamp"])
+        if p.get("run_id"):
+            state["last_run_id"] = p["run_id"]
+        if p.get("case_id"):
+            state["last_case_id"] = p["case_id"]
+        return state
+
     def reduce(self, event_stream):
-        return {"session_active": True, "mode_stack": [], "host": "hosted"}
+        # Full fold from scratch; does not touch the incremental state
+        state = self.initial_state()
+        for entry in event_stream:
+            self.fold(state, entry)
+        return state
 
 class HealthAuditor:
     """PS1: Monitors system health and resource consumption"""
@@ -69,8 +270,19 @@ class RouteSelector:
         
         return RouteResult(route_id="ROUTE_A_HOSTED", mode=Mode.INVESTIGATIVE, host="hosted")
 
+    def select_route_batch(self, risks: list, context: dict) -> list:
+        # Routing only depends on the gate level: one decision per level
+        by_level = {}
+        for risk in risks:
+            if risk.level not in by_level:
+                by_level[risk.level] = self.select_route(risk, context)
+        return [by_level[risk.level] for risk in risks]
+
 class OutputValidator:
-    def validate(self, output_text: str, synthetic_data: dict = None):
+    def __init__(self, matcher: TermMatcher = None):
+        self.matcher = matcher or default_matcher()
+
+    def validate(self, output_text: str, synthetic_data: dict = None, matches: frozenset = None):
         if synthetic_data:
             verdict = synthetic_data["expected_verdict"]
             if verdict == "OK": return True, "PASS", "OK"
@@ -78,65 +290,175 @@ class OutputValidator:
             if verdict == "HARD_FAIL": return False, "HARD_FAIL", "SYNTHETIC_HARD"
             if verdict == "BLOCK": return False, "HARD_FAIL", "SYNTHETIC_BLOCK"
         
-        text = output_text.lower()
-        if "skynet" in text:
+        if matches is None:
+            matches = term_matches(output_text, self.matcher)
+        if OUTPUT_HARD_FAIL in matches:
             return False, "HARD_FAIL", "PROHIBITED_TERM_DETECTED"
-        if "hallucination_suspected" in text:
+        if OUTPUT_SOFT_FAIL in matches:
             return False, "SOFT_FAIL", "EVIDENCE_MISMATCH"
         return True, "PASS", "OK"
 
-def sha256_text(text: str) -> str:
+    def stream(self, synthetic_data: dict = None, cancel_on_soft: bool = False,
+               matcher: TermMatcher = None) -> "StreamingValidation":
+        """Incremental validation of an output that arrives in chunks."""
+        return StreamingValidation(self, (matcher or self.matcher).stream(), synthetic_data, cancel_on_soft)
+
+    def validate_batch(self, outputs: list, synthetic_data: list = None, matcher: TermMatcher = None) -> list:
+        """Validates a batch; repeated non-synthetic drafts are scanned once."""
+        matcher = matcher or self.matcher
+        synthetic_data = synthetic_data or [None] * len(outputs)
+        cache = {}
+        results = []
+        for output_text, synthetic in zip(outputs, synthetic_data):
+            if synthetic:
+                results.append(self.validate(output_text, synthetic_data=synthetic))
+                continue
+            verdict = cache.get(output_text)
+            if verdict is None:
+                verdict = cache[output_text] = self.validate(output_text, matches=matcher.scan(output_text))
+            results.append(verdict)
+        return results
+
+class StreamingValidation:
+    """
+    OutputValidator over a streamed output. feed() returns a fail verdict as
+    soon as it is certain, so the caller can cancel the generation: HARD_FAIL
+    on the first prohibited term, SOFT_FAIL only with cancel_on_soft (a later
+    chunk could still turn it into a HARD_FAIL). Otherwise it returns None and
+    finish() gives the verdict validate() would return for the whole output.
+    Synthetic runs never cancel; their verdict comes from the vector.
+    """
+    def __init__(self, validator: OutputValidator, matches: MatchStream, synthetic_data: dict = None,
+                 cancel_on_soft: bool = False):
+        self.validator = validator
+        self.matches = matches
+        self.synthetic_data = synthetic_data
+        self.cancel_on_soft = cancel_on_soft
+
+    def feed(self, chunk: str):
+        if self.synthetic_data:
+            return None
+        matches = self.matches.feed(chunk)
+        if OUTPUT_HARD_FAIL in matches or (self.cancel_on_soft and OUTPUT_SOFT_FAIL in matches):
+            return self.validator.validate("", matches=matches)
+        return None
+
+    def finish(self):
+        return self.validator.validate("", synthetic_data=self.synthetic_data, matches=self.matches.matches)
+
+def term_matches(text, matcher: TermMatcher) -> frozenset:
+    # An AnalyzedText carries its own (single) scan
+    if isinstance(text, AnalyzedText):
+        return text.matches
+    return matcher.scan(text)
+
+def sha256_text(text) -> str:
+    if isinstance(text, AnalyzedText):
+        return text.sha256
     return hashlib.sha256(text.encode('utf-8')).hexdigest()
 
+def open_log_writer(path: str, rotation: RotationPolicy = None) -> JournalWriter:
+    rotation = rotation or RotationPolicy()
+    return JournalWriter(path, segment_max_bytes=rotation.max_bytes,
+                         segment_max_age=rotation.max_age_seconds, compression=rotation.compression)
+
 class MetricsHook:
-    def __init__(self, path="oear_metrics.jsonl"):
+    def __init__(self, path="oear_metrics.jsonl", rotation: RotationPolicy = None, tracer=None):
         self.path = path
+        # Per-run console lines only at TRACE_RUNS verbosity (always without a tracer)
+        self.tracer = tracer
+        self.writer = open_log_writer(path, rotation)
+        # Keeps timestamps in file order when several threads record at once
+        self._lock = threading.Lock()
 
     def record_run(self, run_id, gate, verdict, notes="", drift=None, case_id=None):
-        entry = {
-            "run_id": run_id,
-            "gate": gate,
-            "verdict": verdict,
-            "notes": notes,
-            "drift": drift,
-            "case_id": case_id,
-            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat()
-        }
-        print(f"[METRICS] Run: {run_id} | Gate: {gate} | Verdict: {verdict}")
-        with open(self.path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry) + "\n")
+        self.record_runs([dict(run_id=run_id, gate=gate, verdict=verdict, notes=notes, drift=drift, case_id=case_id)])
+
+    def record_runs(self, runs: list):
+        """Writes several record_run() keyword sets in one bulk write, timestamped now."""
+        with self._lock:
+            self._record_runs(runs)
+
+    def _record_runs(self, runs: list):
+        lines = []
+        echo = self.tracer is None or self.tracer.enabled(TRACE_RUNS)
+        for run in runs:
+            entry = {
+                "run_id": run["run_id"],
+                "gate": run["gate"],
+                "verdict": run["verdict"],
+                "notes": run.get("notes", ""),
+                "drift": run.get("drift"),
+                "case_id": run.get("case_id"),
+                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat()
+            }
+            if echo:
+                print(f"[METRICS] Run: {entry['run_id']} | Gate: {entry['gate']} | Verdict: {entry['verdict']}")
+            lines.append((json.dumps(entry), None))
+        if lines:
+            self.writer.write_many(lines)
 
 class PromptWrapper:
     def wrap(self, user_input: str, mode: Mode, history: list):
+        return self._header(mode) + self._user(user_input)
+
+    def wrap_batch(self, user_inputs: list, modes: list) -> list:
+        headers = {}
+        prompts = []
+        for user_input, mode in zip(user_inputs, modes):
+            header = headers.get(mode)
+            if header is None:
+                header = headers[mode] = self._header(mode)
+            prompts.append(header + self._user(user_input))
+        return prompts
+
+    def _header(self, mode: Mode) -> str:
         system_prompt = f"You are operating in {mode.value} mode. Maintain strict adherence to provided evidence."
-        return f"[SYSTEM: {system_prompt}]\n[USER: {user_input}]"
+        return f"[SYSTEM: {system_prompt}]\n"
+
+    def _user(self, user_input: str) -> str:
+        return f"[USER: {user_input}]"
 
     def tighten(self, prompt: str) -> str:
         return f"[STRICT_OEAR_ADHERENCE] {prompt}"
         
 class ShadowAuditor:
     """Parallel governance simulation with stricter thresholds (Shadow Mode)"""
-    def __init__(self, shadow_journal="oear_shadow_journal.jsonl"):
+    def __init__(self, shadow_journal="oear_shadow_journal.jsonl", rotation: RotationPolicy = None):
         self.path = shadow_journal
+        self.writer = open_log_writer(shadow_journal, rotation)
+        self._lock = threading.Lock()
 
     def audit(self, user_input, draft, main_risk, main_verdict):
-        # Stricter thresholds: any drift > 0.4 becomes a SHADOW_BLOCK
-        shadow_verdict = "PASS"
-        if main_risk.score > 0.4:
-            shadow_verdict = "SHADOW_BLOCK (STRICT_THRESHOLD_VIOLATION)"
-        
-        entry = {
-            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-            "input": user_input[:50] + "...",
-            "main_verdict": main_verdict,
-            "shadow_verdict": shadow_verdict,
-            "drift": main_risk.score,
-            "is_mismatch": main_verdict == "OK" and "BLOCK" in shadow_verdict
-        }
-        
-        with open(self.path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry) + "\n")
-        return shadow_verdict
+        return self.audit_many([(user_input, draft, main_risk, main_verdict)])[0]
+
+    def audit_many(self, audits: list) -> list:
+        """Audits (user_input, draft, main_risk, main_verdict) tuples with one bulk write."""
+        with self._lock:
+            return self._audit_many(audits)
+
+    def _audit_many(self, audits: list) -> list:
+        verdicts = []
+        lines = []
+        for user_input, draft, main_risk, main_verdict in audits:
+            # Stricter thresholds: any drift > 0.4 becomes a SHADOW_BLOCK
+            shadow_verdict = "PASS"
+            if main_risk.score > 0.4:
+                shadow_verdict = "SHADOW_BLOCK (STRICT_THRESHOLD_VIOLATION)"
+            
+            entry = {
+                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "input": user_input[:50] + "...",
+                "main_verdict": main_verdict,
+                "shadow_verdict": shadow_verdict,
+                "drift": main_risk.score,
+                "is_mismatch": main_verdict == "OK" and "BLOCK" in shadow_verdict
+            }
+            verdicts.append(shadow_verdict)
+            lines.append((json.dumps(entry), None))
+        if lines:
+            self.writer.write_many(lines)
+        return verdicts
 
 class ResetManager:
     def hard_reset(self):
@@ -144,6 +466,36 @@ class ResetManager:
         return {"status": "RESET_COMPLETE", "mode": "SAFE_MODE"}
 
 class SnapshotWriter:
-    def snapshot(self, state):
-        # Mock writing snapshot
-        pass
+    """Persists reducer checkpoints tagged with journal offset and policy hash"""
+    def __init__(self, path="oear_snapshot.json", interval=256):
+        self.path = path
+        self.interval = interval
+
+    def due(self, reducer: StateReducer) -> bool:
+        return reducer.events_since_snapshot >= self.interval
+
+    def snapshot(self, state, offset=0, entry_offset=None, policy_hash=None):
+        snap = {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "offset": offset,
+            "entry_offset": entry_offset,
+            "policy_hash": policy_hash,
+            "state": copy.deepcopy(state)
+        }
+        # Atomic replace: a crash never leaves a torn snapshot behind
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snap, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        return snap
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
@@ -0,0 +1,316 @@
+import json
+import os
+import gzip
+import hashlib
+import lzma
+import queue
+import shutil
+import threading
+
+# Segmented log layout (shared by every OEAR JSONL log):
+#   <log>                       live segment, appended to by the writer
+#   <log>.idx                   sidecar offset index of the live segment
+#   <log>.segments/manifest.json
+#   <log>.segments/NNNNNN.jsonl sealed (immutable) segments, optionally
+#                               stored as .jsonl.gz / .jsonl.xz archives
+#   <log>.segments/NNNNNN.idx   sealed segment indexes
+# Offsets are logical (uncompressed) byte positions across the whole log.
+# Sealing is a rename; archiving a sealed segment happens afterwards, off the
+# append path (see SegmentCompressor), and swaps its manifest entry over to the
+# archive. Until then the entry records the raw file and "pending_compression".
+
+MANIFEST_NAME = "manifest.json"
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "lzma": ".xz"}
+# Per-log sidecars that live next to the live segment
+SIDECAR_SUFFIXES = (".idx", ".mmr", ".anchor.json", ".cert.json")
+# Serializes manifest read-modify-write between the writer and the compressor
+_manifest_lock = threading.Lock()
+
+def segment_dir(log_path: str) -> str:
+    return str(log_path) + ".segments"
+
+def index_path(log_path: str) -> str:
+    return str(log_path) + ".idx"
+
+def load_manifest(log_path: str) -> dict:
+    return _load_manifest_at(segment_dir(log_path))
+
+def _load_manifest_at(seg_dir: str) -> dict:
+    path = os.path.join(seg_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"next_seq": 1, "segments": []}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_manifest(log_path: str, manifest: dict):
+    # Atomic replace so readers never observe a partial manifest
+    path = os.path.join(segment_dir(log_path), MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def seal_segment(log_path: str, info: dict, compression: str = None) -> dict:
+    """
+    Moves the live segment (and its index) into the segment directory and
+    records it in the manifest. `info` carries count/first_ts/last_ts.
+    Only renames: with `compression` ("gzip" or "lzma") the segment is
+    recorded as pending and archived later by compress_segment().
+    The caller must have closed its handle on the live segment.
+    """
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown segment compression: {compression}")
+    seg_dir = segment_dir(log_path)
+    os.makedirs(seg_dir, exist_ok=True)
+    with _manifest_lock:
+        manifest = load_manifest(log_path)
+
+        seq = manifest["next_seq"]
+        segments = manifest["segments"]
+        base_offset = segments[-1]["base_offset"] + segments[-1]["length"] if segments else 0
+
+        data_name = f"{seq:06d}.jsonl"
+        index_name = f"{seq:06d}.idx"
+        length = os.path.getsize(log_path)
+        os.replace(log_path, os.path.join(seg_dir, data_name))
+        live_index = index_path(log_path)
+        if os.path.exists(live_index):
+            os.replace(live_index, os.path.join(seg_dir, index_name))
+
+        segment = {
+            "seq": seq,
+            "file": data_name,
+            "index": index_name,
+            "base_offset": base_offset,
+            "length": length,
+            "stored_bytes": length,
+            "compression": None,
+            "count": info.get("count", 0),
+            "first_ts": info.get("first_ts"),
+            "last_ts": info.get("last_ts")
+        }
+        if compression:
+            segment["pending_compression"] = compression
+        segments.append(segment)
+        manifest["next_seq"] = seq + 1
+        save_manifest(log_path, manifest)
+    return segment
+
+def pending_compressions(log_path: str) -> list:
+    """Seqs of sealed segments still waiting to be archived (e.g. after a crash)."""
+    return [seg["seq"] for seg in load_manifest(log_path)["segments"] if seg.get("pending_compression")]
+
+def compress_segment(log_path: str, seq: int):
+    """
+    Archives a sealed segment recorded with a pending compression and points
+    its manifest entry at the archive. The raw file is removed only after the
+    manifest swap; readers that listed it before then re-resolve the entry.
+    Returns the updated entry, or None if nothing was pending.
+    """
+    seg_dir = segment_dir(log_path)
+    seg = next((s for s in load_manifest(log_path)["segments"] if s["seq"] == seq), None)
+    if seg is None or not seg.get("pending_compression"):
+        return None
+    compression = seg["pending_compression"]
+    src_path = os.path.join(seg_dir, seg["file"])
+    data_name = seg["file"] + COMPRESSION_SUFFIXES[compression]
+    data_path = os.path.join(seg_dir, data_name)
+
+    # Compress into a temp name first so a crash never leaves a torn archive
+    with open(src_path, 'rb') as src, _open_compressed(data_path + ".tmp", compression, 'wb') as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    os.replace(data_path + ".tmp", data_path)
+
+    with _manifest_lock:
+        manifest = load_manifest(log_path)
+        seg = next(s for s in manifest["segments"] if s["seq"] == seq)
+        seg.pop("pending_compression", None)
+        seg.update(file=data_name, compression=compression, stored_bytes=os.path.getsize(data_path))
+        save_manifest(log_path, manifest)
+    os.remove(src_path)
+    return seg
+
+class SegmentCompressor:
+    """
+    Background archiver for one log's sealed segments. The writer submits a
+    segment right after sealing it; compression runs on this thread so the
+    append path never waits for it. A failed segment stays readable (raw) and
+    pending, and is resubmitted when a writer next opens the log.
+    """
+    def __init__(self, log_path: str):
+        self.log_path = log_path
+        self.error = None
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def submit(self, seq: int):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="oear-segment-compressor", daemon=True)
+            self._thread.start()
+        self._queue.put(seq)
+
+    def _run(self):
+        while True:
+            seq = self._queue.get()
+            if seq is None:
+                return
+            try:
+                compress_segment(self.log_path, seq)
+            except Exception as e:
+                self.error = e
+
+    def close(self):
+        """Finishes the segments submitted so far."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+def list_segments(log_path: str) -> list:
+    """
+    Returns all segments in log order, sealed first and the live one last.
+    Each entry has absolute `path`, `index_path` and logical `base_offset`.
+    """
+    manifest = load_manifest(log_path)
+    seg_dir = segment_dir(log_path)
+    result = []
+    base_offset = 0
+    for seg in manifest["segments"]:
+        entry = dict(seg)
+        entry["path"] = os.path.join(seg_dir, seg["file"])
+        entry["index_path"] = os.path.join(seg_dir, seg["index"])
+        entry["sealed"] = True
+        result.append(entry)
+        base_offset = seg["base_offset"] + seg["length"]
+
+    result.append({
+        "seq": manifest["next_seq"],
+        "path": str(log_path),
+        "index_path": index_path(log_path),
+        "base_offset": base_offset,
+        "sealed": False
+    })
+    return result
+
+def _open_compressed(path: str, compression: str, mode: str = 'rb'):
+    if compression == "gzip":
+        return gzip.open(path, mode)
+    if compression == "lzma":
+        return lzma.open(path, mode)
+    return open(path, mode)
+
+def open_segment(seg: dict):
+    """Opens a segment for binary reading, decompressing archived ones on the fly."""
+    try:
+        return _open_compressed(seg["path"], seg.get("compression"))
+    except FileNotFoundError:
+        if not seg.get("sealed"):
+            raise
+    # Archived by the compressor after the caller listed it: follow the manifest
+    seg_dir = os.path.dirname(seg["path"])
+    current = next(s for s in _load_manifest_at(seg_dir)["segments"] if s["seq"] == seg["seq"])
+    return _open_compressed(os.path.join(seg_dir, current["file"]), current.get("compression"))
+
+def log_exists(log_path: str) -> bool:
+    return os.path.exists(str(log_path)) or bool(load_manifest(log_path)["segments"])
+
+def iter_records(log_path: str):
+    """
+    Shared streaming reader: yields every JSON record of a log, transparently
+    crossing archived (compressed) segments and the live one. Constant memory.
+    """
+    for line, _, _ in iter_log_from(log_path):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+def iter_log_from(log_path: str, offset: int = 0):
+    """
+    Read-only stream of (line_bytes, start_offset, end_offset) from a logical
+    offset onwards, across sealed segments and the live one.
+    """
+    for seg in list_segments(log_path):
+        if not seg["sealed"] and not os.path.exists(seg["path"]):
+            continue
+        base = seg["base_offset"]
+        length = seg["length"] if seg["sealed"] else os.path.getsize(seg["path"])
+        if base + length <= offset:
+            continue
+        with open_segment(seg) as f:
+            pos = max(0, offset - base)
+            if pos:
+                f.seek(pos) # emulated (decompressing) seek on archived segments
+            for line in f:
+                start = base + pos
+                pos += len(line)
+                yield line, start, base + pos
+
+class LogFollower:
+    """
+    Tails a log from a saved logical offset. Each poll reads only records
+    appended since the previous one; rotation is transparent (offsets are
+    logical across segments) and truncation or replacement of the log is
+    detected by re-checking the last consumed line, in which case the
+    follower restarts from offset 0 and reports a reset.
+    """
+    def __init__(self, log_path: str, offset: int = 0):
+        self.log_path = str(log_path)
+        self.offset = offset
+        self.entry_offset = None
+        self.digest = None
+        self._verified_segment = None # sealed segment known to hold entry_offset
+
+    def _in_place(self) -> bool:
+        segments = list_segments(self.log_path)
+        live = segments[-1]
+        end = live["base_offset"] + (os.path.getsize(live["path"]) if os.path.exists(live["path"]) else 0)
+        if end < self.offset:
+            return False
+        if self.entry_offset is None:
+            return True
+        seg = next((seg for seg in reversed(segments) if seg["base_offset"] <= self.entry_offset), live)
+        key = (seg["seq"], seg.get("file"), seg.get("length")) if seg["sealed"] else None
+        if key and key == self._verified_segment:
+            return True # sealed segments are immutable
+        line = next(iter_log_from(self.log_path, self.entry_offset), None)
+        if line is None or line[2] != self.offset or hashlib.sha256(line[0]).hexdigest() != self.digest:
+            return False
+        self._verified_segment = key
+        return True
+
+    def poll(self):
+        """Returns (records, reset); after a reset `records` start at the new log's beginning."""
+        reset = not self._in_place()
+        if reset:
+            self.offset, self.entry_offset, self.digest, self._verified_segment = 0, None, None, None
+        records = []
+        last = None
+        for line, start, end in iter_log_from(self.log_path, self.offset):
+            if not line.endswith(b"\n"):
+                break # torn tail: picked up by the next poll
+            self.offset = end
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+            last = (line, start)
+        if last:
+            self.entry_offset = last[1]
+            self.digest = hashlib.sha256(last[0]).hexdigest()
+            self._verified_segment = None
+        return records, reset
+
+def remove_log(log_path: str):
+    """Deletes a log together with its sidecars and sealed segments."""
+    for path in [str(log_path)] + [str(log_path) + suffix for suffix in SIDECAR_SUFFIXES]:
+        if os.path.exists(path):
+            os.remove(path)
+    seg_dir = segment_dir(log_path)
+    if os.path.isdir(seg_dir):
+        shutil.rmtree(seg_dir)
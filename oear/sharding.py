@@ -0,0 +1,144 @@
+import heapq
+import json
+import os
+import time
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+from .control_plane import OEARControlPlane
+from .journal import Journal
+from .merkle import verify_chain
+from .processes import open_log_writer
+from .segments import iter_records, log_exists, remove_log
+
+# Sharded deployment: N worker processes, each running its own control plane
+# over its own log directory (journal/metrics/shadow/vault shard), so CPU-bound
+# gating scales past the GIL. merge_shards() then k-way merges the shards by
+# timestamp into one certifiable log set, re-chaining the journal. Each shard
+# journal must verify on its own first, and every merged entry records where
+# it came from (shard, seq, original hash), so re-chaining cannot launder an
+# edited record.
+
+JOURNAL_FILE = "oear_journal.jsonl"
+# Plain JSONL logs merged record-for-record
+RECORD_FILES = ("oear_metrics.jsonl", "oear_shadow_journal.jsonl", "oear_vault.jsonl")
+SNAPSHOT_FILE = "oear_snapshot.json"
+MERGE_BATCH = 512
+
+def shard_dirs(root: str, shards: int) -> list:
+    return [os.path.join(root, f"shard-{i:02d}") for i in range(shards)]
+
+def partition(items: list, shards: int) -> list:
+    """Round-robin split, so every shard sees the same input mix."""
+    return [items[i::shards] for i in range(shards)]
+
+def reset_logs(log_dir: str):
+    for name in (JOURNAL_FILE,) + RECORD_FILES:
+        remove_log(os.path.join(log_dir, name))
+    snapshot = os.path.join(log_dir, SNAPSHOT_FILE)
+    if os.path.exists(snapshot):
+        os.remove(snapshot)
+
+def run_shard(config_dir: str, log_dir: str, inputs: list) -> dict:
+    """
+    Worker: processes (user_input, synthetic_data) pairs on a fresh control
+    plane writing to `log_dir`. State-transition output is discarded.
+    """
+    reset_logs(log_dir)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        cp = OEARControlPlane(config_dir, log_dir=log_dir)
+        cp.initialize()
+        start = time.perf_counter()
+        for user_input, synthetic_data in inputs:
+            cp.process_interaction(user_input, synthetic_data=synthetic_data)
+        elapsed = time.perf_counter() - start
+        cp.close()
+    return {"log_dir": log_dir, "interactions": len(inputs), "seconds": elapsed, "journal_entries": cp.journal.seq}
+
+def run_sharded(config_dir: str, inputs: list, shards: int, root: str) -> tuple:
+    """Runs the inputs across `shards` processes; returns (per-shard results, wall seconds)."""
+    dirs = shard_dirs(root, shards)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=shards) as pool:
+        futures = [pool.submit(run_shard, config_dir, d, part) for d, part in zip(dirs, partition(inputs, shards))]
+        results = [f.result() for f in futures]
+    return results, time.perf_counter() - start
+
+def _ordered(path: str):
+    # heapq.merge trusts its inputs to be sorted; refuse a shard that is not
+    prev = None
+    for index, record in enumerate(iter_records(path)):
+        ts = record["timestamp"]
+        if prev is not None and prev > ts:
+            raise ValueError(f"{path} is not time-ordered at record {index}")
+        prev = ts
+        yield record
+
+def _with_origin(records, shard: str):
+    for record in records:
+        origin = {"shard": shard, "seq": record.get("seq"), "hash": record.get("hash")}
+        yield dict(record, payload=dict(record["payload"], origin=origin))
+
+def merge_records(paths: list, origin: bool = False):
+    """
+    K-way merge of time-ordered logs by timestamp. Ties keep shard order, so
+    the result is deterministic for a given list of paths. With `origin`,
+    journal payloads gain {"shard", "seq", "hash"} of their source entry.
+    """
+    streams = []
+    for p in paths:
+        if log_exists(p):
+            stream = _ordered(p)
+            if origin:
+                stream = _with_origin(stream, os.path.basename(os.path.dirname(os.path.abspath(p))))
+            streams.append(stream)
+    return heapq.merge(*streams, key=lambda r: r["timestamp"])
+
+def verify_shards(dirs: list):
+    """Full hash-chain/Merkle check of every shard journal; raises ValueError on the first failure."""
+    for d in dirs:
+        path = os.path.join(d, JOURNAL_FILE)
+        if not log_exists(path):
+            continue
+        ok, message, _ = verify_chain(path, full=True)
+        if not ok:
+            raise ValueError(f"{path} failed chain verification: {message}")
+
+def _batches(records, size: int):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def merge_shards(dirs: list, out_dir: str, batch_size: int = MERGE_BATCH) -> dict:
+    """
+    Merges shard log directories into `out_dir` (existing logs there are
+    replaced). Every shard journal is verified first (ValueError if one does
+    not); entries are then re-chained in merged order so the hash chain and
+    Merkle log verify, each carrying its source shard, seq and hash in
+    payload["origin"]. Other logs are copied record-for-record.
+    Returns {log file: merged record count}.
+    """
+    verify_shards(dirs)
+    os.makedirs(out_dir, exist_ok=True)
+    reset_logs(out_dir)
+    counts = {}
+
+    journal = Journal(os.path.join(out_dir, JOURNAL_FILE))
+    for batch in _batches(merge_records([os.path.join(d, JOURNAL_FILE) for d in dirs], origin=True), batch_size):
+        journal.append_records(batch)
+    journal.close()
+    counts[JOURNAL_FILE] = journal.seq
+
+    for name in RECORD_FILES:
+        writer = open_log_writer(os.path.join(out_dir, name))
+        counts[name] = 0
+        for batch in _batches(merge_records([os.path.join(d, name) for d in dirs]), batch_size):
+            writer.write_many([(json.dumps(record), None) for record in batch])
+            counts[name] += len(batch)
+        writer.close()
+    return counts
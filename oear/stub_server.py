@@ -0,0 +1,94 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .backends import COMPLETE_PATH, STREAM_PATH, mock_completion, mock_chunks
+
+# Local stand-in for the hosted/local LLM endpoints: POST /v1/complete with
+# {"prompt", "route_id"} returns {"completion"} from mock_completion after a
+# configurable delay. Speaks HTTP/1.1 keep-alive so HTTPBackend pools apply.
+# POST /v1/stream returns the same completion as a chunked text/plain body,
+# one word every `chunk_latency` seconds; a client disconnect stops it.
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Load tests open many connections at once; the default backlog (5) resets them
+    request_queue_size = 256
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+        self.streams_cancelled = 0
+
+def serve_stub(host: str = "127.0.0.1", port: int = 8088, latency: float = 0.0, jitter: float = 0.0,
+               route_latency: dict = None, chunk_latency: float = 0.0):
+    """
+    Serves the stub from daemon threads; returns the server (call shutdown()
+    to stop). `route_latency` overrides `latency` per route_id. The server's
+    `streams_cancelled` counts streams the client closed before the end.
+    """
+    route_latency = dict(route_latency or {})
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out as separate writes; without this each
+        # response waits on the client's delayed ACK
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            raw = self.rfile.read(length)
+            path = self.path.split("?")[0]
+            if path not in (COMPLETE_PATH, STREAM_PATH):
+                self.send_error(404)
+                return
+            try:
+                request = json.loads(raw)
+                prompt, route_id = request["prompt"], request["route_id"]
+            except (ValueError, KeyError, TypeError):
+                self.send_error(400)
+                return
+
+            delay = route_latency.get(route_id, latency) + (random.uniform(0, jitter) if jitter else 0.0)
+            if delay > 0:
+                time.sleep(delay)
+            if path == STREAM_PATH:
+                self._stream(mock_completion(prompt, route_id))
+                return
+            body = json.dumps({"completion": mock_completion(prompt, route_id)}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self, completion: str):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for i, chunk in enumerate(mock_chunks(completion)):
+                    if i and chunk_latency > 0:
+                        time.sleep(chunk_latency)
+                    data = chunk.encode("utf-8")
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.write(b"0\r\n\r\n")
+            except ConnectionError:
+                # Client cancelled the generation
+                self.close_connection = True
+                with self.server.lock:
+                    self.server.streams_cancelled += 1
+
+        def log_message(self, *args):
+            pass
+
+    server = StubServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="oear-stub-llm").start()
+    return server
+
+def stub_url(server) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
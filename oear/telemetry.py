@@ -0,0 +1,119 @@
+from .segments import iter_records
+
+# Single-pass telemetry aggregation over metrics + journal streams.
+# Aggregates are plain counters and running sums, so partial aggregates built
+# over different files or shards can be merged before computing the stats.
+
+FAMILY_PREFIXES = {
+    "A": "SAFE",
+    "B": "MEDIUM",
+    "C": "HIGH",
+    "F": "FREEZE",
+    "INV": "INVARIANT",
+    "X": "BORDER"
+}
+
+def family_of(case_id) -> str:
+    if not case_id: return "UNKNOWN"
+    return FAMILY_PREFIXES.get(case_id.split("_")[0], "OTHER")
+
+def mentions_freeze(value) -> bool:
+    """True if any key or string value (nested) contains "freeze", case-insensitively."""
+    if isinstance(value, str):
+        return "freeze" in value.lower()
+    if isinstance(value, dict):
+        return any(mentions_freeze(k) or mentions_freeze(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return any(mentions_freeze(v) for v in value)
+    return False
+
+def _payload(record: dict) -> dict:
+    return record.get("payload", {}) if "payload" in record else record
+
+class TelemetryAggregate:
+    """
+    Streaming aggregate of one run's logs. Feed metrics records before journal
+    records so per-family drift sums add up in the same order as the legacy
+    list-based analysis (float results are then identical).
+    """
+    def __init__(self):
+        self.run_ids = set()
+        self.drift_sums = {} # family -> [sum, count], first-seen order
+        self.gate_blocks = 0
+        self.hard_fails = 0
+        self.soft_fails = 0
+        self.freezes = 0
+
+    def _add_drift(self, case_id, drift):
+        acc = self.drift_sums.setdefault(family_of(case_id), [0, 0])
+        acc[0] += drift
+        acc[1] += 1
+
+    def add_metric(self, m: dict):
+        rid = m.get("run_id")
+        if rid not in self.run_ids:
+            # Drift is taken from the first record of each run
+            self.run_ids.add(rid)
+            if m.get("drift") is not None:
+                self._add_drift(m.get("case_id"), m["drift"])
+        verdict = m.get("verdict")
+        if verdict == "HARD_FAIL":
+            self.hard_fails += 1
+        elif verdict == "SOFT_FAIL":
+            self.soft_fails += 1
+
+    def add_journal(self, r: dict):
+        p = _payload(r)
+        if p.get("phase") == "gate_block":
+            self.gate_blocks += 1
+            if p.get("drift") is not None:
+                self._add_drift(p.get("case_id"), p["drift"])
+        if mentions_freeze(r):
+            self.freezes += 1
+
+    def consume(self, metrics_path=None, journal_path=None):
+        """Streams whole logs (all segments) into the aggregate."""
+        if metrics_path is not None:
+            for m in iter_records(metrics_path):
+                self.add_metric(m)
+        if journal_path is not None:
+            for r in iter_records(journal_path):
+                self.add_journal(r)
+        return self
+
+    def merge(self, other: "TelemetryAggregate"):
+        """Folds another partial aggregate (another file or shard) into this one."""
+        overlap = self.run_ids & other.run_ids
+        if overlap:
+            raise ValueError(f"Cannot merge aggregates sharing {len(overlap)} run ids")
+        self.run_ids |= other.run_ids
+        for family, (total, count) in other.drift_sums.items():
+            acc = self.drift_sums.setdefault(family, [0, 0])
+            acc[0] += total
+            acc[1] += count
+        self.gate_blocks += other.gate_blocks
+        self.hard_fails += other.hard_fails
+        self.soft_fails += other.soft_fails
+        self.freezes += other.freezes
+        return self
+
+    def stats(self) -> dict:
+        """Rates, drift averages and raw counts (without timestamp/commit)."""
+        total_interactions = len(self.run_ids) + self.gate_blocks
+        hard_blocks = self.hard_fails + self.gate_blocks
+
+        def rate(n):
+            return round(n / total_interactions, 4) if total_interactions > 0 else 0
+
+        return {
+            "total_interactions": total_interactions,
+            "hard_block_rate": rate(hard_blocks),
+            "soft_fail_rate": rate(self.soft_fails),
+            "freeze_rate": rate(self.freezes),
+            "drift_by_family": {fam: round(total / count, 4) for fam, (total, count) in self.drift_sums.items()},
+            "raw": {
+                "blocks": hard_blocks,
+                "retries": self.soft_fails,
+                "freezes": self.freezes
+            }
+        }
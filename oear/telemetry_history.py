@@ -0,0 +1,244 @@
+import json
+import math
+import mmap
+import os
+from array import array
+from datetime import datetime
+
+from .telemetry import FAMILY_PREFIXES
+
+# Columnar telemetry history (one row per dashboard run, keyed by commit).
+# Layout of <history>.cols/:
+#   <column>.col     raw little-endian array of one typecode per column
+#   commit.col       fixed-width ASCII commit ids
+#   meta.json        rows + byte offset of the JSONL history already imported
+# Columns are read through read-only mmaps, so loading is O(1) and analytics
+# only touch the rows they need. Missing values are stored as NaN.
+
+FAMILIES = tuple(FAMILY_PREFIXES.values()) + ("OTHER", "UNKNOWN")
+COMMIT_WIDTH = 40
+NUMERIC_COLUMNS = (
+    ("timestamp", "d"),
+    ("total_interactions", "d"),
+    ("hard_block_rate", "d"),
+    ("soft_fail_rate", "d"),
+    ("freeze_rate", "d"),
+    ("blocks", "d"),
+    ("retries", "d"),
+    ("freezes", "d")
+) + tuple((f"drift.{family}", "d") for family in FAMILIES)
+NAN = float("nan")
+
+def _row_values(stats: dict) -> dict:
+    raw = stats.get("raw", {})
+    drift = stats.get("drift_by_family", {})
+    try:
+        ts = datetime.fromisoformat(stats["timestamp"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        ts = NAN
+    values = {
+        "timestamp": ts,
+        "total_interactions": stats.get("total_interactions", NAN),
+        "hard_block_rate": stats.get("hard_block_rate", NAN),
+        "soft_fail_rate": stats.get("soft_fail_rate", NAN),
+        "freeze_rate": stats.get("freeze_rate", NAN),
+        "blocks": raw.get("blocks", NAN),
+        "retries": raw.get("retries", NAN),
+        "freezes": raw.get("freezes", NAN)
+    }
+    for family in FAMILIES:
+        values[f"drift.{family}"] = drift.get(family, NAN)
+    return values
+
+def percentile(sorted_values, q: float) -> float:
+    """Linear-interpolated percentile (q in 0..100) of an already sorted sequence."""
+    if not sorted_values:
+        return NAN
+    rank = (len(sorted_values) - 1) * q / 100.0
+    lo = math.floor(rank)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (rank - lo)
+
+class HistoryStore:
+    """Append-only columnar store mirroring oear_telemetry_history.jsonl"""
+    def __init__(self, history_path: str):
+        self.history_path = str(history_path)
+        self.dir = self.history_path + ".cols"
+        self.meta = {"rows": 0, "source_offset": 0}
+        self._maps = {}
+        meta_path = os.path.join(self.dir, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def _col_path(self, name: str) -> str:
+        return os.path.join(self.dir, f"{name}.col")
+
+    def _save_meta(self):
+        path = os.path.join(self.dir, "meta.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(path + ".tmp", path)
+
+    def _truncate_columns(self, rows: int):
+        # Drops any torn row left by an interrupted append
+        widths = [(name, array(code).itemsize) for name, code in NUMERIC_COLUMNS] + [("commit", COMMIT_WIDTH)]
+        for name, width in widths:
+            path = self._col_path(name)
+            if os.path.exists(path) and os.path.getsize(path) != rows * width:
+                with open(path, "r+b") as f:
+                    f.truncate(rows * width)
+
+    def append_rows(self, rows: list, source_offset: int = None):
+        """Appends stats dicts (as written to the JSONL history) as new rows."""
+        if not rows:
+            return
+        os.makedirs(self.dir, exist_ok=True)
+        self._truncate_columns(self.meta["rows"])
+        values = [_row_values(stats) for stats in rows]
+        for name, code in NUMERIC_COLUMNS:
+            with open(self._col_path(name), "ab") as f:
+                array(code, [float(v[name]) for v in values]).tofile(f)
+        with open(self._col_path("commit"), "ab") as f:
+            for stats in rows:
+                commit = str(stats.get("commit", "")).encode("ascii", "replace")[:COMMIT_WIDTH]
+                f.write(commit.ljust(COMMIT_WIDTH, b"\0"))
+        self.meta["rows"] += len(rows)
+        if source_offset is not None:
+            self.meta["source_offset"] = source_offset
+        self._save_meta()
+        self._maps.clear()
+
+    def sync(self):
+        """Imports JSONL history lines appended since the last sync."""
+        if not os.path.exists(self.history_path):
+            return self
+        size = os.path.getsize(self.history_path)
+        if size < self.meta["source_offset"]:
+            # History was rewritten: rebuild from scratch
+            self.meta = {"rows": 0, "source_offset": 0}
+            self._truncate_columns(0)
+            self._maps.clear()
+        if size == self.meta["source_offset"]:
+            return self
+        rows = []
+        with open(self.history_path, "rb") as f:
+            f.seek(self.meta["source_offset"])
+            data = f.read()
+        end = data.rfind(b"\n") + 1 # complete lines only
+        for line in data[:end].splitlines():
+            if line.strip():
+                rows.append(json.loads(line))
+        self.append_rows(rows, self.meta["source_offset"] + end)
+        return self
+
+    def _map(self, name: str, code: str):
+        if name not in self._maps:
+            path = self._col_path(name)
+            if not os.path.exists(path) or os.path.getsize(path) == 0:
+                self._maps[name] = memoryview(array(code))
+            else:
+                with open(path, "rb") as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[name] = memoryview(mm).cast(code)
+        return self._maps[name]
+
+    def column(self, name: str):
+        """Read-only memoryview over a numeric column (zero-copy)."""
+        code = dict(NUMERIC_COLUMNS)[name]
+        return self._map(name, code)[:len(self)]
+
+    def commits(self, start: int = 0, stop: int = None) -> list:
+        raw = self._map("commit", "B")
+        stop = len(self) if stop is None else stop
+        return [bytes(raw[i * COMMIT_WIDTH:(i + 1) * COMMIT_WIDTH]).rstrip(b"\0").decode("ascii")
+                for i in range(max(0, start), stop)]
+
+    def row(self, index: int) -> dict:
+        index = index % len(self)
+        values = {name: self.column(name)[index] for name, _ in NUMERIC_COLUMNS}
+        values["commit"] = self.commits(index, index + 1)[0]
+        return values
+
+    def tail(self, n: int) -> list:
+        return [self.row(i) for i in range(max(0, len(self) - n), len(self))]
+
+    # --- Analytics ---
+
+    def rolling_mean(self, name: str, window: int) -> array:
+        """Trailing mean over `window` rows (NaN rows skipped) via running sums."""
+        col = self.column(name)
+        out = array("d")
+        total, count = 0.0, 0
+        for i, v in enumerate(col):
+            if v == v:
+                total += v
+                count += 1
+            if i >= window:
+                old = col[i - window]
+                if old == old:
+                    total -= old
+                    count -= 1
+            out.append(total / count if count else NAN)
+        return out
+
+    def percentiles(self, name: str, window: int = None, qs=(50, 95, 99)) -> dict:
+        col = self.column(name)
+        start = len(col) - window if window else 0
+        values = sorted(v for v in col[max(0, start):] if v == v)
+        return {f"p{q}": percentile(values, q) for q in qs}
+
+    def drift_percentiles(self, window: int = None, qs=(50, 95, 99)) -> dict:
+        """Per-family drift percentiles over the whole history or the last `window` rows."""
+        result = {}
+        for family in FAMILIES:
+            pcts = self.percentiles(f"drift.{family}", window, qs)
+            if not math.isnan(pcts[f"p{qs[0]}"]):
+                result[family] = pcts
+        return result
+
+    def change_points(self, name: str, window: int = 10, threshold: float = 6.0) -> list:
+        """
+        Mean-shift detection: at each commit, compares the `window` rows before
+        and after it with a Welch t statistic (prefix sums keep it O(n)).
+        Returns the local maxima above `threshold` as dicts with index, commit,
+        score, before and after means.
+        """
+        col = self.column(name)
+        n = len(col)
+        s, sq, cnt = [0.0], [0.0], [0]
+        for v in col:
+            ok = v == v
+            s.append(s[-1] + (v if ok else 0.0))
+            sq.append(sq[-1] + (v * v if ok else 0.0))
+            cnt.append(cnt[-1] + ok)
+
+        def stats(lo, hi):
+            c = cnt[hi] - cnt[lo]
+            if c < 2:
+                return None
+            mean = (s[hi] - s[lo]) / c
+            return mean, max((sq[hi] - sq[lo]) / c - mean * mean, 0.0) * c / (c - 1), c
+
+        scores = [0.0] * n
+        means = {}
+        for i in range(window, n - window + 1):
+            before, after = stats(i - window, i), stats(i, i + window)
+            if not before or not after:
+                continue
+            se = math.sqrt(before[1] / before[2] + after[1] / after[2])
+            shift = abs(after[0] - before[0])
+            # Flat windows: any shift at all is a change point
+            scores[i] = shift / se if se > 1e-12 else (math.inf if shift > 1e-12 else 0.0)
+            means[i] = (before[0], after[0])
+
+        points = []
+        for i in range(n):
+            if scores[i] > threshold and scores[i] > max(scores[max(0, i - window):i], default=0.0) \
+                    and scores[i] >= max(scores[i:i + window]):
+                points.append({"index": i, "commit": self.commits(i, i + 1)[0], "score": scores[i],
+                               "before": means[i][0], "after": means[i][1]})
+        return points
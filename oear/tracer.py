@@ -0,0 +1,76 @@
+import itertools
+import json
+import time
+from array import array
+
+from .types import SystemState
+
+# Structured state tracer. Every transition is recorded as (run_id, from_state,
+# to_state, monotonic ns) into a preallocated ring buffer holding the last
+# `capacity` transitions; console output is governed by a verbosity level:
+#   TRACE_QUIET      no console output
+#   TRACE_LIFECYCLE  boot/policy messages only (default: no I/O per interaction)
+#   TRACE_RUNS       + one [METRICS] line per recorded run
+#   TRACE_STATES     + one [STATE] line per transition (the legacy output)
+
+TRACE_QUIET = 0
+TRACE_LIFECYCLE = 1
+TRACE_RUNS = 2
+TRACE_STATES = 3
+
+# The one clock transition timestamps come from; recorders passing `ns`
+# must read it too, so records from different callers stay comparable
+TRACE_CLOCK = time.monotonic_ns
+
+STATES = tuple(SystemState)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+class StateTracer:
+    def __init__(self, capacity: int = 65536, verbosity: int = TRACE_LIFECYCLE):
+        self.capacity = capacity
+        self.verbosity = verbosity
+        self.run_ids = [None] * capacity
+        self.seqs = array("q", bytes(8 * capacity)) # 1-based record number, 0 = empty slot
+        self.from_codes = array("B", bytes(capacity))
+        self.to_codes = array("B", bytes(capacity))
+        self.timestamps = array("q", bytes(8 * capacity))
+        # next() on itertools.count is atomic under the GIL: concurrent
+        # recorders each get their own slot without a lock
+        self._counter = itertools.count()
+
+    def enabled(self, level: int) -> bool:
+        return self.verbosity >= level
+
+    def log(self, level: int, message: str):
+        if self.verbosity >= level:
+            print(message)
+
+    def record(self, run_id, from_state: SystemState, to_state: SystemState, ns: int = None):
+        n = next(self._counter)
+        slot = n % self.capacity
+        self.seqs[slot] = n + 1
+        self.run_ids[slot] = run_id
+        self.from_codes[slot] = STATE_CODES[from_state]
+        self.to_codes[slot] = STATE_CODES[to_state]
+        self.timestamps[slot] = TRACE_CLOCK() if ns is None else ns
+        if self.verbosity >= TRACE_STATES:
+            print(f"[STATE] {from_state.name} -> {to_state.name}")
+
+    def records(self, run_id=None) -> list:
+        """Buffered transitions, oldest first, optionally for one run only."""
+        slots = sorted((seq, slot) for slot, seq in enumerate(self.seqs) if seq)
+        return [{
+            "seq": seq,
+            "run_id": self.run_ids[slot],
+            "from": STATES[self.from_codes[slot]].name,
+            "to": STATES[self.to_codes[slot]].name,
+            "ns": self.timestamps[slot]
+        } for seq, slot in slots if run_id is None or self.run_ids[slot] == run_id]
+
+    def dump(self, path: str, run_id=None) -> int:
+        """Writes the buffered transitions as JSONL for post-mortems; returns the count."""
+        records = self.records(run_id)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        return len(records)
@@ -8,6 +8,19 @@ class RiskResult:
     level: str  # "A", "B", "C"
     score: float = 0.0
 
+@dataclass
+class RotationPolicy:
+    """Size/time-based sealing of JSONL logs into (compressed) segments"""
+    max_bytes: Optional[int] = None
+    max_age_seconds: Optional[float] = None
+    compression: Optional[str] = None # None | "gzip" | "lzma"
+
+@dataclass(frozen=True)
+class RouteLimits:
+    """Per-route backend bounds: concurrent calls (= pooled connections) and call timeout"""
+    max_concurrency: int = 8
+    timeout: float = 30.0
+
 class RiskLevel(Enum):
     LOW = "low"
     MEDIUM = "medium"
@@ -48,6 +61,8 @@ class PolicyConfig:
     invariants: List[str]
     change_control: Dict[str, Any]
     compatibility: Dict[str, Any]
+    term_rules: Dict[str, List[str]] = field(default_factory=dict) # rule name -> terms (see oear.matcher)
+    semantic_weights: Dict[str, float] = field(default_factory=dict) # see processes.SemanticScorer
 
 @dataclass
 class VaultItem:
@@ -89,3 +104,23 @@ class SystemState(Enum):
     RETRY_SOFT = "RETRY_SOFT"
     HARD_BLOCK = "HARD_BLOCK"
     DONE = "DONE"
+
+@dataclass
+class InteractionRun:
+    """Per-interaction state machine, so concurrent interactions never share state"""
+    run_id: str
+    user_input: str
+    synthetic_data: Optional[Dict[str, Any]] = None
+    retries: int = 0
+    current_state: SystemState = SystemState.BOOT
+    state_entered: float = 0.0
+    analysis: Any = None # AnalyzedText of user_input, set at SCORE_PS2
+    policy: Any = None # CompiledPolicy the run is pinned to, set at SCORE_PS2
+
+    @property
+    def case_id(self):
+        return self.synthetic_data.get("case_id") if self.synthetic_data else None
+
+    @property
+    def drift(self):
+        return self.synthetic_data.get("drift") if self.synthetic_data else None
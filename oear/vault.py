@@ -1,4 +1,5 @@
 from .types import VaultItem
+from .journal import JournalWriter
 import json
 import datetime
 import uuid
@@ -6,20 +7,47 @@ import uuid
 class DeferredVault:
     def __init__(self, storage_path: str):
         self.storage_path = storage_path
+        # Persistent handle; shares the control plane's log queue when one is attached
+        self.writer = JournalWriter(storage_path)
         
     def triage(self, content: str, contradiction_score: float, affect_intensity: float) -> str:
         """
         Decision engine: if ambigous or risky, store for later.
         Returns 'STORED' or 'IMMEDIATE'
         """
-        # Example naive threshold
-        if contradiction_score > 0.7 or (contradiction_score > 0.4 and affect_intensity > 0.8):
+        if self.defers(contradiction_score, affect_intensity):
             self._store_item(content, contradiction_score, affect_intensity)
             return "STORED"
         
         return "IMMEDIATE"
 
+    def triage_batch(self, contents: list, contradiction_scores, affect_intensities) -> list:
+        """
+        triage() over parallel columns (e.g. SemanticScorer.score_batch output);
+        stored items go out in one bulk write, in input order.
+        """
+        decisions = []
+        stored = []
+        for content, c_score, a_score in zip(contents, contradiction_scores, affect_intensities):
+            if self.defers(c_score, a_score):
+                stored.append((json.dumps(self._item(content, c_score, a_score)), None))
+                decisions.append("STORED")
+            else:
+                decisions.append("IMMEDIATE")
+        if stored:
+            self.writer.write_many(stored)
+        return decisions
+
+    @staticmethod
+    def defers(contradiction_score: float, affect_intensity: float) -> bool:
+        """Whether triage() would store these scores for later review."""
+        # Example naive threshold
+        return contradiction_score > 0.7 or (contradiction_score > 0.4 and affect_intensity > 0.8)
+
     def _store_item(self, content, c_score, a_score):
+        self.writer.write(json.dumps(self._item(content, c_score, a_score)), None)
+
+    def _item(self, content, c_score, a_score) -> dict:
         pk = str(uuid.uuid4())
         item = {
             "id": pk,
@@ -32,11 +60,10 @@ class DeferredVault:
         
         # In a real system, full content would be blob-stored. Here inline.
         item["full_content"] = content
-        
-        with open(self.storage_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(item) + '\n')
+        return item
             
     def get_pending(self):
+        self.writer.flush()
         items = []
         try:
             with open(self.storage_path, 'r', encoding='utf-8') as f:
@@ -0,0 +1,54 @@
+import os
+import sys
+import argparse
+
+# Ensure we can import from local directory
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from oear.binlog import jsonl_to_binary, binary_to_jsonl, scan
+
+def main():
+    parser = argparse.ArgumentParser(description="OEAR binary log converter")
+    sub = parser.add_subparsers(dest="action", required=True)
+
+    enc = sub.add_parser("encode", help="JSONL log (all segments) -> binary log")
+    enc.add_argument("src")
+    enc.add_argument("dst")
+
+    dec = sub.add_parser("decode", help="Binary log -> JSONL")
+    dec.add_argument("src")
+    dec.add_argument("dst")
+
+    flt = sub.add_parser("scan", help="Header-only filtering scan of a binary log")
+    flt.add_argument("src")
+    flt.add_argument("--event-type")
+    flt.add_argument("--phase")
+    flt.add_argument("--run-id")
+    flt.add_argument("--since")
+    flt.add_argument("--until")
+    flt.add_argument("--count", action="store_true", help="Only print the number of matches")
+
+    args = parser.parse_args()
+
+    if args.action == "encode":
+        if os.path.exists(args.dst):
+            print(f"ERROR: {args.dst} already exists")
+            sys.exit(1)
+        n = jsonl_to_binary(args.src, args.dst)
+        print(f"[OK] Encoded {n} records into {args.dst}")
+    elif args.action == "decode":
+        n = binary_to_jsonl(args.src, args.dst)
+        print(f"[OK] Decoded {n} records into {args.dst}")
+    else:
+        import json
+        matches = scan(args.src, event_type=args.event_type, phase=args.phase, run_id=args.run_id,
+                       since=args.since, until=args.until)
+        if args.count:
+            print(sum(1 for _ in matches))
+        else:
+            for record in matches:
+                print(json.dumps(record.decode()))
+
+if __name__ == "__main__":
+    main()
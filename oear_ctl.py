@@ -3,6 +3,8 @@ import sys
 import subprocess
 import argparse
 
+from oear.segments import remove_log
+
 def run_command(cmd, description):
     print(f"\n>>> {description}...")
     try:
@@ -15,7 +17,7 @@ def run_command(cmd, description):
 
 def main():
     parser = argparse.ArgumentParser(description="OEAR Sovereign Control Center")
-    parser.add_argument("action", choices=["certify", "dashboard", "shadow", "demo", "install"], 
+    parser.add_argument("action", choices=["certify", "matrix", "sharded", "dashboard", "shadow", "demo", "install"], 
                         help="Action to perform")
     
     args = parser.parse_args()
@@ -23,13 +25,20 @@ def main():
     if args.action == "certify":
         # Cleanup existing logs for fresh certification
         for log in ["oear_journal.jsonl", "oear_metrics.jsonl", "oear_shadow_journal.jsonl"]:
-            if os.path.exists(log):
-                os.remove(log)
+            remove_log(log)
         
         # Run harness + validator
         if run_command("python run_synthetic_harness.py", "Executing Synthetic Harness"):
             run_command("python oear_validator.py --harness", "OEAR Mechanical Certification")
     
+    elif args.action == "matrix":
+        # All historical vector sets, one isolated control plane per set
+        run_command("python run_certification_matrix.py", "Certifying All Vector Sets (Parallel)")
+
+    elif args.action == "sharded":
+        # One control plane per process, k-way merged into a single certified log set
+        run_command("python run_sharded.py", "Sharded Run + Log Merge Certification")
+
     elif args.action == "dashboard":
         run_command("python telemetry_dashboard.py", "Generating Longitudinal Dashboard")
     
@@ -0,0 +1,42 @@
+import os
+import sys
+import argparse
+
+# Ensure we can import from local directory
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from oear.sharding import merge_shards, JOURNAL_FILE
+from oear_validator import validate_results
+
+def main():
+    parser = argparse.ArgumentParser(description="K-way merge of OEAR shard log directories into one time-ordered log set")
+    parser.add_argument("shards", nargs="+", help="Shard log directories (merge order breaks timestamp ties)")
+    parser.add_argument("--out", default="merged", help="Output log directory (existing logs are replaced)")
+    parser.add_argument("--certify", action="store_true", help="Run the OEAR validator over the merged logs")
+    args = parser.parse_args()
+
+    for shard in args.shards:
+        if not os.path.exists(os.path.join(shard, JOURNAL_FILE)):
+            print(f"ERROR: No journal found in {shard}")
+            sys.exit(1)
+
+    try:
+        counts = merge_shards(args.shards, args.out)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"=== Merged {len(args.shards)} shards into {args.out} ===")
+    for name, count in counts.items():
+        print(f"{name:<28} | {count:>8} records")
+
+    if args.certify:
+        ok = validate_results(os.path.join(args.out, JOURNAL_FILE), os.path.join(args.out, "oear_metrics.jsonl"),
+                              None, full_chain=True)
+        if not ok:
+            print("\n[RESULT] CERTIFICATION FAILED")
+            sys.exit(1)
+        print("\n[RESULT] CERTIFICATION PASSED")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+import argparse
+
+# Ensure we can import from local directory
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from oear.stub_server import serve_stub, stub_url
+
+def parse_route_latency(values):
+    route_latency = {}
+    for value in values:
+        route_id, _, seconds = value.partition("=")
+        if not seconds:
+            raise argparse.ArgumentTypeError(f"Expected ROUTE_ID=SECONDS, got {value}")
+        route_latency[route_id] = float(seconds)
+    return route_latency
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stub LLM server for offline OEAR load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8088)
+    parser.add_argument("--latency", type=float, default=0.0, help="Response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random delay, up to this many seconds")
+    parser.add_argument("--route-latency", action="append", default=[], metavar="ROUTE_ID=SECONDS",
+                        help="Per-route delay override (repeatable)")
+    parser.add_argument("--chunk-latency", type=float, default=0.0, help="Delay between streamed chunks in seconds")
+    args = parser.parse_args()
+
+    server = serve_stub(args.host, args.port, args.latency, args.jitter, parse_route_latency(args.route_latency),
+                        chunk_latency=args.chunk_latency)
+    print(f"[OK] Stub LLM serving {stub_url(server)}/v1/complete (latency {args.latency * 1000:.0f} ms)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
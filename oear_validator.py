@@ -8,19 +8,14 @@ from pathlib import Path
 # Paths
 current_dir = os.path.dirname(os.path.abspath(__file__)) # oear_ref
 src_dir = os.path.dirname(current_dir) # src
+sys.path.insert(0, current_dir)
+
+from oear.merkle import verify_chain, has_chain
+from oear.segments import iter_records, iter_log_from
 
 def load_jsonl(path):
-    rows = []
-    if not Path(path).exists():
-        return []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                try:
-                    rows.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-    return rows
+    # Live segment plus any rotated/compressed archives, in log order
+    return list(iter_records(path))
 
 def assert_sequence(name, observed, expected):
     if observed != expected:
@@ -31,54 +26,190 @@ def assert_sequence(name, observed, expected):
     print(f"[OK] {name}")
     return True
 
-def validate_invariants(journal, metrics):
+def _payload(r):
+    return r.get("payload", {}) if "payload" in r else r
+
+class MonotonicCheck:
+    """Streaming ts[i] <= ts[i+1] check; remembers only the first violation"""
+    def __init__(self, name, prev=None, index=-1):
+        self.name = name
+        self.prev = prev
+        self.index = index
+        self.violation = None
+
+    def feed(self, record):
+        if "timestamp" not in record:
+            return
+        ts = record.get("timestamp")
+        self.index += 1
+        if self.violation is None and self.index > 0 and self.prev > ts:
+            self.violation = self.index - 1
+        self.prev = ts
+
+    def report(self):
+        if self.violation is not None:
+            print(f"[FAIL] Invariant: {self.name} temporal monotonicity violation at index {self.violation}")
+            return False
+        return True
+
+class LogCursor:
+    """Streams records of a log from a byte offset, remembering how far it got"""
+    def __init__(self, path, offset=0, entry_offset=None):
+        self.path = str(path)
+        self.offset = offset
+        self.entry_offset = entry_offset
+        self.records = 0
+
+    def __iter__(self):
+        for line, start, end in iter_log_from(self.path, self.offset):
+            self.offset = end
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self.entry_offset = start
+            self.records += 1
+            yield record
+
+    def position(self):
+        """Offsets plus a digest of the last record, used to detect rewrites."""
+        return {"offset": self.offset, "entry_offset": self.entry_offset, "digest": _line_digest(self.path, self.entry_offset)}
+
+def _line_digest(path, entry_offset):
+    if entry_offset is None:
+        return None
+    for line, _, _ in iter_log_from(path, entry_offset):
+        return hashlib.sha256(line).hexdigest()
+    return None
+
+def certify_streams(journal, metrics, count_runs=False, resume=None):
+    """
+    Single streaming pass over each log with hash indexes instead of nested scans.
+    The journal is consumed first (error reasons, commit_ok run ids), then metrics
+    are checked against those indexes. Failure output and its order are unchanged.
+    Returns (all_ok, counts, state) where counts feed the harness checks; distinct
+    metrics run ids are only tracked when `count_runs` is set. `state` is the
+    running state a certification checkpoint persists; pass it back as `resume`
+    to certify only records appended since.
+    """
+    resume = resume or {}
     all_ok = True
-    
-    # 1. Presencia de input_hash en gate_block
+    journal_ts = MonotonicCheck("Journal", *resume.get("journal_ts", (None, -1)))
+    metrics_ts = MonotonicCheck("Metrics", *resume.get("metrics_ts", (None, -1)))
+
+    # --- Journal pass ---
+    error_reasons = set(resume.get("error_reasons", []))
+    commit_run_ids = [] # journal order, for reporting
+    gate_blocks = resume.get("gate_blocks", 0)
     for r in journal:
-        p = r.get("payload", {}) if "payload" in r else r
-        if p.get("phase") == "gate_block":
+        p = _payload(r)
+        phase = p.get("phase")
+
+        # 1. Presencia de input_hash en gate_block
+        if phase == "gate_block":
+            gate_blocks += 1
             if "input_hash" not in p:
                 print("[FAIL] Invariant: gate_block missing input_hash")
                 all_ok = False
-    
-    # 2. Correspondencia HARD_FAIL Metrics -> Journal
-    journal_errors = [ (r.get("payload", {}) if "payload" in r else r).get("reason") for r in journal if r.get("event_type") == "error"]
+        elif phase == "commit_ok":
+            commit_run_ids.append(p.get("run_id"))
+
+        if r.get("event_type") == "error":
+            error_reasons.add(p.get("reason"))
+        journal_ts.feed(r)
+
+    # --- Metrics pass ---
+    committed = set(commit_run_ids)
+    ok_runs = set()
+    # OK verdicts whose commit_ok is not in the journal read so far. A live
+    # journal may still hold that commit in its writer's buffer, so they are
+    # carried across checkpoints until it arrives, as a full pass over the same
+    # prefix would accept them
+    carried_ok = set(resume.get("unmatched_ok", []))
+    unmatched_ok = set(carried_ok)
+    run_ids = set()
     for m in metrics:
-        if m.get("verdict") == "HARD_FAIL":
+        verdict = m.get("verdict")
+        if count_runs:
+            run_ids.add(m["run_id"])
+
+        # 2. Correspondencia HARD_FAIL Metrics -> Journal
+        if verdict == "HARD_FAIL":
             reason = m.get("notes")
-            found = any(reason == r_err for r_err in journal_errors)
-            if not found:
-                 if reason not in ["SYNTHETIC_HARD", "SYNTHETIC_BLOCK"]:
-                    print(f"[FAIL] Invariant: HARD_FAIL in metrics ({m['run_id']}) has no corresponding Journal error")
-                    all_ok = False
+            if reason not in error_reasons and reason not in ["SYNTHETIC_HARD", "SYNTHETIC_BLOCK"]:
+                print(f"[FAIL] Invariant: HARD_FAIL in metrics ({m['run_id']}) has no corresponding Journal error")
+                all_ok = False
+        elif verdict == "OK":
+            if m["run_id"] in committed:
+                ok_runs.add(m["run_id"])
+            else:
+                unmatched_ok.add(m["run_id"])
+        metrics_ts.feed(m)
 
     # 3. Correspondencia commit_ok -> Metrics OK
-    commit_run_ids = [ (r.get("payload", {}) if "payload" in r else r).get("run_id") for r in journal if (r.get("payload", {}) if "payload" in r else r).get("phase") == "commit_ok"]
     for run_id in commit_run_ids:
-        metrics_for_run = [m for m in metrics if m["run_id"] == run_id]
-        if not any(m["verdict"] == "OK" for m in metrics_for_run):
+        if run_id not in ok_runs and run_id not in carried_ok:
             print(f"[FAIL] Invariant: commit_ok for {run_id} has no OK verdict in metrics")
             all_ok = False
+    unmatched_ok -= committed
 
     # 4. Monotonicidad temporal
-    timestamps = [r.get("timestamp") for r in journal if "timestamp" in r]
-    m_timestamps = [m.get("timestamp") for m in metrics if "timestamp" in m]
-    
-    def check_ts(name, ts_list):
-        if not ts_list: return True
-        for i in range(len(ts_list) - 1):
-            if ts_list[i] > ts_list[i+1]:
-                print(f"[FAIL] Invariant: {name} temporal monotonicity violation at index {i}")
-                return False
-        return True
-
-    if not check_ts("Journal", timestamps): all_ok = False
-    if not check_ts("Metrics", m_timestamps): all_ok = False
+    if not journal_ts.report(): all_ok = False
+    if not metrics_ts.report(): all_ok = False
 
     if all_ok:
         print("[OK] Invariants certified.")
-    return all_ok
+    state = {
+        "error_reasons": sorted(error_reasons, key=str),
+        "unmatched_ok": sorted(unmatched_ok, key=str),
+        "gate_blocks": gate_blocks,
+        "journal_ts": [journal_ts.prev, journal_ts.index],
+        "metrics_ts": [metrics_ts.prev, metrics_ts.index]
+    }
+    return all_ok, {"gate_blocks": gate_blocks, "unique_runs": len(run_ids)}, state
+
+def validate_invariants(journal, metrics):
+    return certify_streams(journal, metrics)[0]
+
+def checkpoint_path(journal_path):
+    return str(journal_path) + ".cert.json"
+
+def load_checkpoint(journal_path, metrics_path):
+    """Returns the last certification checkpoint if both logs still extend it unchanged."""
+    path = checkpoint_path(journal_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+    for name, log_path in (("journal", journal_path), ("metrics", metrics_path)):
+        pos = checkpoint[name]
+        if _line_digest(str(log_path), pos["entry_offset"]) != pos["digest"]:
+            print(f"[WARN] Certification checkpoint does not match {name}; running full certification.")
+            return None
+    return checkpoint
+
+def save_checkpoint(journal_path, journal_cursor, metrics_cursor, state):
+    checkpoint = {"journal": journal_cursor.position(), "metrics": metrics_cursor.position(), "state": state}
+    path = checkpoint_path(journal_path)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(path + ".tmp", path)
+
+def validate_chain(journal_path, full=False):
+    # Hash chain + Merkle root: only the tail since the last certified anchor is rehashed
+    if not os.path.exists(str(journal_path) + ".mmr") and not has_chain(str(journal_path)):
+        return True # legacy journal without hashes
+    ok, message, _ = verify_chain(str(journal_path), full=full)
+    if not ok:
+        print(f"[FAIL] Journal hash chain: {message}")
+        return False
+    print(f"[OK] Journal hash chain certified: {message}")
+    return True
 
 EXPECTED_V1_HASH = "12949cc71ce56a23138bd8d530433252c52e0d867552b2996648360226e23665"
 
@@ -94,12 +225,25 @@ def verify_baseline_integrity(vector_path):
     print("[OK] Baseline v1 integrity verified via SHA-256.")
     return True
 
-def validate_results(journal_path, metrics_path, vector_path, use_harness=False):
-    journal = load_jsonl(journal_path)
-    metrics = load_jsonl(metrics_path)
-    
+def validate_results(journal_path, metrics_path, vector_path, use_harness=False, full_chain=False, incremental=False):
     print("--- Starting OEAR Equivalence Validation ---")
-    inv_ok = validate_invariants(journal, metrics)
+    # Incremental mode resumes from the last certified prefix (invariant checks only)
+    checkpoint = load_checkpoint(journal_path, metrics_path) if incremental and not use_harness else None
+    if checkpoint:
+        journal = LogCursor(journal_path, checkpoint["journal"]["offset"], checkpoint["journal"]["entry_offset"])
+        metrics = LogCursor(metrics_path, checkpoint["metrics"]["offset"], checkpoint["metrics"]["entry_offset"])
+        print(f"[OK] Resuming from certification checkpoint (journal @{journal.offset}, metrics @{metrics.offset})")
+    else:
+        journal = LogCursor(journal_path)
+        metrics = LogCursor(metrics_path)
+
+    # Streamed: neither log is materialized in memory
+    inv_ok, counts, state = certify_streams(journal, metrics, count_runs=use_harness,
+                                            resume=checkpoint["state"] if checkpoint else None)
+    inv_ok = validate_chain(journal_path, full=full_chain) and inv_ok
+
+    if incremental and inv_ok and not use_harness:
+        save_checkpoint(journal_path, journal, metrics, state)
     
     if not use_harness:
         return inv_ok
@@ -116,17 +260,16 @@ def validate_results(journal_path, metrics_path, vector_path, use_harness=False)
     blocks_expected = len([v for v in vectors if v["expected_gate"] == "C"])
     metrics_run_expected = len([v for v in vectors if v["expected_gate"] != "C"])
     
-    journal_blocks = len([r for r in journal if (r.get("payload", {}) if "payload" in r else r).get("phase") == "gate_block"])
-    unique_runs = len(set(m["run_id"] for m in metrics))
-    
-    c1 = assert_sequence("Gate C Block Count", journal_blocks, blocks_expected)
-    c2 = assert_sequence("Metrics Run Count", unique_runs, metrics_run_expected)
+    c1 = assert_sequence("Gate C Block Count", counts["gate_blocks"], blocks_expected)
+    c2 = assert_sequence("Metrics Run Count", counts["unique_runs"], metrics_run_expected)
 
     return inv_ok and c1 and c2
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--harness", action="store_true", help="Run in harness certification mode")
+    parser.add_argument("--full-chain", action="store_true", help="Rehash the whole journal instead of resuming from the last anchor")
+    parser.add_argument("--incremental", action="store_true", help="Certify only records appended since the last certified checkpoint")
     args = parser.parse_args()
 
     # Look for logs in CWD first, then fallback to src_dir
@@ -140,7 +283,8 @@ if __name__ == "__main__":
         
     v_path = os.path.join(current_dir, "oear_gate_cert_vectors_v1.json")
     
-    ok = validate_results(j_path, m_path, v_path, use_harness=args.harness)
+    ok = validate_results(j_path, m_path, v_path, use_harness=args.harness, full_chain=args.full_chain,
+                          incremental=args.incremental)
 
     if not ok:
         print("\n[RESULT] CERTIFICATION FAILED")
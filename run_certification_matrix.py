@@ -0,0 +1,96 @@
+import io
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+# Ensure we can import from local directory
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from run_synthetic_harness import run_harness
+from oear_validator import validate_results
+
+VECTOR_PATTERN = "oear_gate_cert_vectors_v*.json"
+
+def discover_vector_sets(search_dir):
+    """Returns {version: path} for every historical vector set, oldest first."""
+    sets = {}
+    for path in glob.glob(os.path.join(search_dir, VECTOR_PATTERN)):
+        match = re.search(r"_(v\d+)\.json$", path)
+        if match:
+            sets[match.group(1)] = path
+    return dict(sorted(sets.items(), key=lambda kv: int(kv[0][1:])))
+
+def certify_vector_set(version, vector_path, logs_root):
+    """
+    Worker: runs one vector set against its own control plane and log
+    directory, then certifies those logs. Output is captured per set.
+    """
+    log_dir = os.path.join(logs_root, version)
+    buf = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(buf):
+        try:
+            run_harness(vector_path, log_dir=log_dir)
+            ok = validate_results(
+                os.path.join(log_dir, "oear_journal.jsonl"),
+                os.path.join(log_dir, "oear_metrics.jsonl"),
+                vector_path,
+                use_harness=True
+            )
+        except SystemExit:
+            ok = False
+        except Exception as e:
+            print(f"[FAIL] {version} | Error: {e}")
+            ok = False
+    return {"version": version, "ok": ok, "seconds": time.perf_counter() - start, "output": buf.getvalue()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Certify every historical OEAR vector set in parallel")
+    parser.add_argument("vectors", nargs="*", help="Vector set files (default: discover oear_gate_cert_vectors_v*.json)")
+    parser.add_argument("--logs-root", default="cert_runs", help="Per-version log directories are created here")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--verbose", action="store_true", help="Print each set's full harness/validator output")
+    args = parser.parse_args()
+
+    if args.vectors:
+        sets = {}
+        for path in args.vectors:
+            match = re.search(r"_(v\d+)\.json$", path)
+            sets[match.group(1) if match else os.path.basename(path)] = os.path.abspath(path)
+    else:
+        sets = discover_vector_sets(current_dir)
+
+    if not sets:
+        print(f"ERROR: No vector sets matching {VECTOR_PATTERN} found")
+        sys.exit(1)
+
+    print(f"=== OEAR Certification Matrix ({len(sets)} vector sets) ===")
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(certify_vector_set, version, path, args.logs_root) for version, path in sets.items()]
+        results = [f.result() for f in futures]
+
+    # Merged report, in version order
+    all_ok = True
+    for r in results:
+        status = "PASS" if r["ok"] else "FAIL"
+        print(f"  [{status}] {r['version']:<6} ({r['seconds']:.2f}s) logs: {os.path.join(args.logs_root, r['version'])}")
+        if args.verbose or not r["ok"]:
+            for line in r["output"].splitlines():
+                print(f"      {line}")
+        all_ok = all_ok and r["ok"]
+
+    print(f"\nWall time: {time.perf_counter() - start:.2f}s")
+    if not all_ok:
+        print("\n[RESULT] CERTIFICATION FAILED")
+        sys.exit(1)
+    print("\n[RESULT] CERTIFICATION PASSED")
+
+if __name__ == "__main__":
+    main()
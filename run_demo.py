@@ -6,13 +6,15 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
 from oear.control_plane import OEARControlPlane
+from oear.tracer import StateTracer, TRACE_STATES
 
 def main():
     print("=== OEAR Sovereign Control Plane State Machine Demo ===\n")
     
     config_dir = os.path.join(current_dir, "configs")
     
-    cp = OEARControlPlane(config_dir)
+    # The demo narrates every state transition and run
+    cp = OEARControlPlane(config_dir, tracer=StateTracer(verbosity=TRACE_STATES))
     cp.initialize()
 
     scenarios = [
@@ -0,0 +1,102 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import contextlib
+
+# Ensure we can import from local directory
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from oear.control_plane import OEARControlPlane
+from oear.segments import remove_log
+from oear.telemetry import TelemetryAggregate
+from oear_validator import validate_results
+
+LOG_NAMES = ("oear_journal.jsonl", "oear_metrics.jsonl", "oear_shadow_journal.jsonl", "oear_vault.jsonl")
+
+def run_stress(vectors, threads, rounds, log_dir, queue_size):
+    """
+    Drives one shared control plane from `threads` threads, each running every
+    vector `rounds` times, with all log writes going through the background
+    writer. Returns the (closed) control plane, the elapsed seconds and
+    whether every interaction ran without raising.
+    """
+    for name in LOG_NAMES:
+        remove_log(os.path.join(log_dir, name))
+    errors = []
+
+    def worker(index):
+        # Threads start at different offsets so gate A/B/C inputs interleave
+        shift = index % len(vectors)
+        work = (vectors[shift:] + vectors[:shift]) * rounds
+        for v in work:
+            try:
+                cp.process_interaction(f"Synthetic input for {v['case_id']}", synthetic_data=v)
+            except Exception as e:
+                errors.append(f"{v['case_id']}: {e}")
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        cp = OEARControlPlane(os.path.join(current_dir, "configs"), log_dir=log_dir, log_queue_size=queue_size)
+        cp.initialize()
+        start = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        cp.close()
+    elapsed = time.perf_counter() - start
+    for error in errors:
+        print(f"  [FAIL] {error}")
+    return cp, elapsed, not errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent OEAR control-plane stress test")
+    parser.add_argument("vectors", nargs="?", default=os.path.join(current_dir, "oear_gate_cert_vectors_v1.json"))
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=10, help="Passes over the vector set per thread")
+    parser.add_argument("--queue-size", type=int, default=256, help="Background writer queue bound")
+    parser.add_argument("--log-dir", default="stress_run")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.vectors):
+        print(f"ERROR: Vector file not found at {args.vectors}")
+        sys.exit(1)
+    with open(args.vectors, 'r', encoding='utf-8') as f:
+        vectors = json.load(f)
+
+    total = len(vectors) * args.threads * args.rounds
+    print(f"=== OEAR Stress Test ({args.threads} threads x {args.rounds} rounds x {len(vectors)} vectors) ===")
+    cp, elapsed, ran_ok = run_stress(vectors, args.threads, args.rounds, args.log_dir, args.queue_size)
+    print(f"{total} interactions in {elapsed:.2f}s ({total / elapsed:.0f}/s)")
+
+    journal_path = os.path.join(args.log_dir, "oear_journal.jsonl")
+    metrics_path = os.path.join(args.log_dir, "oear_metrics.jsonl")
+    ok = validate_results(journal_path, metrics_path, None, full_chain=True) and ran_ok
+
+    # Nothing lost or duplicated under contention
+    runs_per_pass = args.threads * args.rounds
+    aggregate = TelemetryAggregate().consume(metrics_path, journal_path)
+    checks = [
+        ("Gate C Block Count", aggregate.gate_blocks, runs_per_pass * sum(v["expected_gate"] == "C" for v in vectors)),
+        ("Metrics Run Count", len(aggregate.run_ids), runs_per_pass * sum(v["expected_gate"] != "C" for v in vectors)),
+        ("Reducer Event Count", cp.reducer.state["event_count"], cp.journal.seq)
+    ]
+    for name, observed, expected in checks:
+        if observed != expected:
+            print(f"[FAIL] {name}: Expected {expected}, Got {observed}")
+            ok = False
+        else:
+            print(f"[OK] {name}: {observed}")
+
+    if not ok:
+        print("\n[RESULT] STRESS CERTIFICATION FAILED")
+        sys.exit(1)
+    print("\n[RESULT] STRESS CERTIFICATION PASSED")
+
+if __name__ == "__main__":
+    main()
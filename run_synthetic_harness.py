@@ -10,8 +10,9 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from oear.control_plane import OEARControlPlane
+from oear.segments import remove_log
 
-def run_harness(vector_file):
+def run_harness(vector_file, log_dir="."):
     print(f"=== OEAR Synthetic Harness Evaluation ===")
     print(f"Loading vectors from: {vector_file}")
     
@@ -22,16 +23,17 @@ def run_harness(vector_file):
     with open(vector_file, 'r', encoding='utf-8') as f:
         vectors = json.load(f)
         
-    config_dir = os.path.join(current_dir, "configs")
-    cp = OEARControlPlane(config_dir)
-    cp.initialize()
-    
-    journal_path = os.path.join(parent_dir, "oear_journal.jsonl")
-    metrics_path = os.path.join(parent_dir, "oear_metrics.jsonl")
+    # Logs go where the control plane writes them (CWD by default, where the validator looks first)
+    journal_path = os.path.join(log_dir, "oear_journal.jsonl")
+    metrics_path = os.path.join(log_dir, "oear_metrics.jsonl")
     
+    # Clear logs before the control plane opens its persistent journal handle
     for p_str in [journal_path, metrics_path]:
-        p = Path(p_str)
-        if p.exists(): p.unlink()
+        remove_log(p_str)
+
+    config_dir = os.path.join(current_dir, "configs")
+    cp = OEARControlPlane(config_dir, log_dir=log_dir)
+    cp.initialize()
 
     print(f"Running {len(vectors)} test vectors...")
     
@@ -45,6 +47,8 @@ def run_harness(vector_file):
         except Exception as e:
             print(f"  [FAIL] {case_id} | Error: {e}")
 
+    cp.close()
+
     print("\n=== Harness Execution Complete ===")
 
 if __name__ == "__main__":
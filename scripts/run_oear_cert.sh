@@ -7,6 +7,6 @@ echo "=== OEAR Mechanical Certification ==="
 # Usually src/ for this demo
 cd src/
 python -u oear_ref/run_demo.py > /dev/null
-python -u oear_ref/oear_validator.py
+python -u oear_ref/oear_validator.py --incremental
 
 echo "=== CERT OK — commit allowed ==="
@@ -3,13 +3,16 @@ set -e
 
 echo "=== OEAR Synthetic Harness Certification (Pre-Push) ==="
 
-# 1. Run Harness
-python -u src/oear_ref/run_synthetic_harness.py
+# 1+2. Run every historical vector set (v1, v2, ...) in parallel and certify each
+python -u src/oear_ref/run_certification_matrix.py --logs-root cert_runs
 
-# 2. Run Validator in Harness mode
-python -u src/oear_ref/oear_validator.py --harness
-
-# 3. Update and Display Longitudinal Telemetry
-python -u src/oear_ref/telemetry_dashboard.py
+# 3. Update and Display Longitudinal Telemetry, one history per vector set
+for run_dir in cert_runs/*/; do
+    version=$(basename "$run_dir")
+    python -u src/oear_ref/telemetry_dashboard.py \
+        --metrics "${run_dir}oear_metrics.jsonl" \
+        --journal "${run_dir}oear_journal.jsonl" \
+        --history "oear_telemetry_history_${version}.jsonl"
+done
 
 echo "=== CERT OK — push allowed ==="
@@ -1,44 +1,89 @@
+import sys
 import json
+import time
+import argparse
 from pathlib import Path
 
-def analyze_shadow_delta(main_journal="oear_journal.jsonl", shadow_journal="oear_shadow_journal.jsonl"):
-    shadow_path = Path(shadow_journal)
-    if not shadow_path.exists():
-        print("Shadow journal not found. Run harness first.")
-        return
+from oear.segments import log_exists, iter_records, LogFollower
 
-    shadow_entries = []
-    with open(shadow_path, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                shadow_entries.append(json.loads(line))
+class ShadowDelta:
+    """Running shadow-audit totals; only mismatching records are kept"""
+    def __init__(self):
+        self.total = 0
+        self.mismatches = []
 
-    total = len(shadow_entries)
-    mismatches = [e for e in shadow_entries if e.get("is_mismatch")]
-    mismatch_count = len(mismatches)
-    mismatch_rate = (mismatch_count / total * 100) if total > 0 else 0
+    def add(self, e):
+        self.total += 1
+        if e.get("is_mismatch"):
+            self.mismatches.append(e)
+
+def render_shadow_report(delta, max_listed=None):
+    mismatch_count = len(delta.mismatches)
+    mismatch_rate = (mismatch_count / delta.total * 100) if delta.total > 0 else 0
 
     print("\n" + "="*60)
     print(" OEAR SHADOW AUDIT: DIFFERENTIAL DRIFT REPORT")
     print("="*60)
-    print(f"Total Interactions Audited : {total}")
+    print(f"Total Interactions Audited : {delta.total}")
     print(f"Governance Mismatches      : {mismatch_count}")
     print(f"Projected Block Rate Delta : {mismatch_rate:.1f}%")
     print("-" * 60)
     
     if mismatch_count > 0:
         print("Mismatched Interactions (OK in v1 -> BLOCK in Shadow):")
-        for e in mismatches:
+        listed = delta.mismatches[-max_listed:] if max_listed else delta.mismatches
+        for e in listed:
             print(f"  - Input Trace: {e['input']}")
             print(f"    V1 Verdict: {e['main_verdict']} | Drift Score: {e['drift']:.3f} (Threshold 0.4)")
     else:
         print("No mismatches found. Shadow policy is currently transparent.")
     
-    print("="*60 + "\n")
+    print("="*60 + "\n", flush=True)
+
+def analyze_shadow_delta(main_journal="oear_journal.jsonl", shadow_journal="oear_shadow_journal.jsonl"):
+    shadow_path = Path(shadow_journal)
+    if not log_exists(shadow_path):
+        print("Shadow journal not found. Run harness first.")
+        return
+
+    # Streamed across live and archived segments; only mismatches are kept
+    delta = ShadowDelta()
+    for e in iter_records(shadow_path):
+        delta.add(e)
+    render_shadow_report(delta)
+
+def follow_shadow_delta(shadow_journal="oear_shadow_journal.jsonl", interval=2.0, refreshes=None, max_listed=10):
+    """Live mode: folds only newly appended shadow records into the report each refresh."""
+    follower = LogFollower(shadow_journal)
+    delta = ShadowDelta()
+    count = 0
+    while refreshes is None or count < refreshes:
+        records, reset = follower.poll()
+        if reset:
+            delta = ShadowDelta()
+        for e in records:
+            delta.add(e)
+        if sys.stdout.isatty():
+            print("\033[2J\033[H", end="")
+        render_shadow_report(delta, max_listed=max_listed)
+        count += 1
+        if refreshes is None or count < refreshes:
+            time.sleep(interval)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OEAR Shadow Audit Report")
+    parser.add_argument("--follow", action="store_true", help="Tail the shadow journal and refresh the report")
+    parser.add_argument("--interval", type=float, default=2.0, help="Refresh interval in seconds (follow mode)")
+    args = parser.parse_args()
+
     # Ensure active context is src/
     import os
     if os.path.exists("src"):
         os.chdir("src")
-    analyze_shadow_delta(main_journal="oear_journal.jsonl", shadow_journal="oear_shadow_journal.jsonl")
+    if args.follow:
+        try:
+            follow_shadow_delta(shadow_journal="oear_shadow_journal.jsonl", interval=args.interval)
+        except KeyboardInterrupt:
+            pass
+    else:
+        analyze_shadow_delta(main_journal="oear_journal.jsonl", shadow_journal="oear_shadow_journal.jsonl")
@@ -1,9 +1,20 @@
 import json
+import math
 import os
+import sys
+import time
+import argparse
 import subprocess
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+
+from oear.segments import log_exists, LogFollower
+from oear.telemetry import TelemetryAggregate, family_of
+from oear.telemetry_history import HistoryStore
+
+ROLLING_WINDOW = 5
+CHANGE_POINT_WINDOW = 10
+CHANGE_POINTS_SHOWN = 3
 
 class OEARLongitudinalTelemetry:
     def __init__(self, metrics_path="oear_metrics.jsonl", journal_path="oear_journal.jsonl", history_path="oear_telemetry_history.jsonl"):
@@ -18,85 +29,65 @@ class OEARLongitudinalTelemetry:
             return "no_git"
 
     def get_family(self, case_id):
-        if not case_id: return "UNKNOWN"
-        prefix = case_id.split("_")[0]
-        mapping = {
-            "A": "SAFE",
-            "B": "MEDIUM",
-            "C": "HIGH",
-            "F": "FREEZE",
-            "INV": "INVARIANT",
-            "X": "BORDER"
-        }
-        return mapping.get(prefix, "OTHER")
-
-    def analyze_current_run(self):
-        if not self.metrics_path.exists() and not self.journal_path.exists():
-            return None
-
-        metrics = []
-        if self.metrics_path.exists():
-            with open(self.metrics_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    if line.strip():
-                        metrics.append(json.loads(line))
-
-        journal = []
-        if self.journal_path.exists():
-            with open(self.journal_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    if line.strip():
-                        journal.append(json.loads(line))
-
-        # Differential Diagnosis: Drift per family
-        family_drifts = defaultdict(list)
-        
-        # Collect drift from metrics (unique runs)
-        run_seen = set()
-        for m in metrics:
-            rid = m.get("run_id")
-            if rid not in run_seen:
-                run_seen.add(rid)
-                drift = m.get("drift")
-                if drift is not None:
-                    family = self.get_family(m.get("case_id"))
-                    family_drifts[family].append(drift)
-
-        # Collect drift from Gate C blocks in journal
-        for r in journal:
-            p = r.get("payload", {}) if "payload" in r else r
-            if p.get("phase") == "gate_block":
-                drift = p.get("drift")
-                if drift is not None:
-                    family = self.get_family(p.get("case_id"))
-                    family_drifts[family].append(drift)
-
-        avg_drifts = {fam: round(sum(vals)/len(vals), 4) for fam, vals in family_drifts.items() if vals}
-
-        total_runs = len(run_seen)
-        gate_c_blocks = [r for r in journal if (r.get("payload", {}) if "payload" in r else r).get("phase") == "gate_block"]
-        total_interactions = total_runs + len(gate_c_blocks)
-
-        hard_blocks = len([m for m in metrics if m["verdict"] == "HARD_FAIL"]) + len(gate_c_blocks)
-        soft_fails = len([m for m in metrics if m["verdict"] == "SOFT_FAIL"])
-        freezes = len([r for r in journal if "freeze" in str(r).lower()])
+        return family_of(case_id)
+
+    def aggregate(self, metrics_path=None, journal_path=None):
+        """Single streaming pass over one metrics/journal pair (all segments)."""
+        metrics_path = self.metrics_path if metrics_path is None else metrics_path
+        journal_path = self.journal_path if journal_path is None else journal_path
+        return TelemetryAggregate().consume(metrics_path, journal_path)
+
+    def analyze_current_run(self, aggregate=None):
+        if aggregate is None:
+            if not log_exists(self.metrics_path) and not log_exists(self.journal_path):
+                return None
+            aggregate = self.aggregate()
 
         stats = {
             "timestamp": datetime.now().isoformat(),
-            "commit": self.get_current_commit(),
-            "total_interactions": total_interactions,
-            "hard_block_rate": round(hard_blocks / total_interactions, 4) if total_interactions > 0 else 0,
-            "soft_fail_rate": round(soft_fails / total_interactions, 4) if total_interactions > 0 else 0,
-            "freeze_rate": round(freezes / total_interactions, 4) if total_interactions > 0 else 0,
-            "drift_by_family": avg_drifts,
-            "raw": {
-                "blocks": hard_blocks,
-                "retries": soft_fails,
-                "freezes": freezes
-            }
+            "commit": self.get_current_commit()
         }
+        stats.update(aggregate.stats())
         return stats
 
+    def follow(self, interval=2.0, refreshes=None):
+        """
+        Live mode: tails metrics and journal from the offsets reached by the
+        previous refresh and folds only the new records into the aggregate.
+        A truncated or replaced log restarts the aggregate from scratch.
+        """
+        metrics, journal = LogFollower(self.metrics_path), LogFollower(self.journal_path)
+        aggregate = TelemetryAggregate()
+        count = 0
+        while refreshes is None or count < refreshes:
+            new_metrics, metrics_reset = metrics.poll()
+            new_journal, journal_reset = journal.poll()
+            if metrics_reset or journal_reset:
+                metrics, journal = LogFollower(self.metrics_path), LogFollower(self.journal_path)
+                aggregate = TelemetryAggregate()
+                new_metrics, _ = metrics.poll()
+                new_journal, _ = journal.poll()
+            for m in new_metrics:
+                aggregate.add_metric(m)
+            for r in new_journal:
+                aggregate.add_journal(r)
+            self.render_live(aggregate.stats(), len(new_metrics) + len(new_journal))
+            count += 1
+            if refreshes is None or count < refreshes:
+                time.sleep(interval)
+
+    def render_live(self, stats, new_records):
+        if sys.stdout.isatty():
+            print("\033[2J\033[H", end="")
+        print("="*70)
+        print(f" OEAR LIVE TELEMETRY  {datetime.now().strftime('%H:%M:%S')}  (+{new_records} records)")
+        print("="*70)
+        print(f"Interactions: {stats['total_interactions']} | Block: {stats['hard_block_rate']*100:.1f}% | "
+              f"Soft: {stats['soft_fail_rate']*100:.1f}% | Freeze: {stats['freeze_rate']*100:.1f}%")
+        for family, drift in stats["drift_by_family"].items():
+            print(f"  Drift {family:<10} {drift:.3f}")
+        print("="*70, flush=True)
+
     def save_to_history(self, stats):
         with open(self.history_path, "a", encoding="utf-8") as f:
             f.write(json.dumps(stats) + "\n")
@@ -106,11 +97,13 @@ class OEARLongitudinalTelemetry:
             print("No telemetry history found.")
             return
 
-        history = []
-        with open(self.history_path, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    history.append(json.loads(line))
+        # Columnar mirror of the JSONL history; only new lines are imported
+        store = HistoryStore(self.history_path).sync()
+        history = store.tail(10)
+
+        def drift(entry, family):
+            value = entry[f"drift.{family}"]
+            return 0 if math.isnan(value) else value
 
         print("\n" + "="*70)
         print(" OEAR LONGITUDINAL TELEMETRY & DIFFERENTIAL DIAGNOSIS")
@@ -118,34 +111,59 @@ class OEARLongitudinalTelemetry:
         print(f"{'Commit':<10} | {'Block%':<7} | {'Soft%':<7} | {'Drift SAFE':<10} | {'Drift INV':<9} | {'Drift BORDER'}")
         print("-" * 75)
 
-        for entry in history[-10:]:
-            df = entry.get("drift_by_family", {})
-            safe_d = f"{df.get('SAFE', 0):.3f}"
-            inv_d = f"{df.get('INVARIANT', 0):.3f}"
-            bord_d = f"{df.get('BORDER', 0):.3f}"
+        for entry in history:
+            safe_d = f"{drift(entry, 'SAFE'):.3f}"
+            inv_d = f"{drift(entry, 'INVARIANT'):.3f}"
+            bord_d = f"{drift(entry, 'BORDER'):.3f}"
             
             print(f"{entry['commit']:<10} | {entry['hard_block_rate']*100:>6.1f}% | {entry['soft_fail_rate']*100:>6.1f}% | {safe_d:<10} | {inv_d:<9} | {bord_d}")
+
+        # Drift distribution across the whole history
+        pcts = store.drift_percentiles()
+        if pcts:
+            print("-" * 75)
+            print(f"{'Family':<10} | {'p50':<7} | {'p95':<7} | {'p99':<7} | {'Rolling(' + str(ROLLING_WINDOW) + ')'}")
+            for family, p in pcts.items():
+                rolling = store.rolling_mean(f"drift.{family}", ROLLING_WINDOW)[-1]
+                print(f"{family:<10} | {p['p50']:<7.3f} | {p['p95']:<7.3f} | {p['p99']:<7.3f} | {rolling:.3f}")
+
+        for column in ("hard_block_rate",) + tuple(f"drift.{family}" for family in pcts):
+            for cp in store.change_points(column, window=CHANGE_POINT_WINDOW)[-CHANGE_POINTS_SHOWN:]:
+                print(f"\n📈 [CHANGE-POINT] {column} shifted {cp['before']:.3f} -> {cp['after']:.3f} at commit {cp['commit']}")
         
         # Grip analysis
         if history:
             last = history[-1]
-            df = last.get("drift_by_family", {})
-            if df.get("BORDER", 0) > 0.5:
+            if drift(last, "BORDER") > 0.5:
                  print("\n🔎 [DIAGNOSIS] Governance GRIP weakening in BORDER family (Drift > 0.5 detected).")
-            if df.get("INVARIANT", 0) > 0.0:
+            if drift(last, "INVARIANT") > 0.0:
                  print("\n🔴 [CRITICAL] Invariant EROSION! Zero-tolerance drift violated in INVARIANT family.")
-            if df.get("SAFE", 0) > 0.25:
+            if drift(last, "SAFE") > 0.25:
                  print("\n🔎 [DIAGNOSIS] Baseline DRIFT increasing in SAFE family (Erosion suspected).")
 
         print("="*70 + "\n")
 
 if __name__ == "__main__":
-    # Ensure current working directory is src
+    parser = argparse.ArgumentParser(description="OEAR Longitudinal Telemetry")
+    parser.add_argument("--follow", action="store_true", help="Tail the logs and refresh live stats")
+    parser.add_argument("--interval", type=float, default=2.0, help="Refresh interval in seconds (follow mode)")
+    parser.add_argument("--metrics", default="oear_metrics.jsonl", help="Metrics log to analyze")
+    parser.add_argument("--journal", default="oear_journal.jsonl", help="Journal to analyze")
+    parser.add_argument("--history", default="oear_telemetry_history.jsonl", help="Longitudinal history store")
+    args = parser.parse_args()
+
     tel = OEARLongitudinalTelemetry(
-        metrics_path=Path("oear_metrics.jsonl"),
-        journal_path=Path("oear_journal.jsonl"),
-        history_path=Path("oear_telemetry_history.jsonl")
+        metrics_path=Path(args.metrics),
+        journal_path=Path(args.journal),
+        history_path=Path(args.history)
     )
+
+    if args.follow:
+        try:
+            tel.follow(interval=args.interval)
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
     
     current_stats = tel.analyze_current_run()
     if current_stats: